@@ -0,0 +1,73 @@
+"""
+Micro-benchmark: per-frame cost of brightness/contrast adjustment at 1080p.
+
+Two cases, each compared with what the stream did before:
+  - a real adjustment (--alpha/--beta): convertScaleAbs into a new array
+    (previous), into a reused buffer (BrightnessContrastLUT.apply with dst),
+    and cv2.LUT with a precomputed table for reference,
+  - the default slider position (alpha=1, beta=0): convertScaleAbs, which
+    the stream used to run on every frame anyway, against the skipped step.
+
+Usage:
+    python benchmarks/bench_brightness_lut.py [--frames 300] [--alpha 1.5] [--beta 10]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from widgets.frame_lut import BrightnessContrastLUT
+
+
+def measure(title, cases, frames):
+    print(title)
+    baseline = None
+    for name, func in cases.items():
+        func() # warm up
+        seconds = min(timeit.repeat(func, number=frames, repeat=3)) / frames
+        baseline = baseline or seconds
+        print(f"  {name:<28} {seconds * 1000:8.3f} ms/frame  ({baseline / seconds:5.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Brightness/contrast adjustment micro-benchmark.")
+    parser.add_argument("--frames", type=int, default=300, help="Frames per measurement.")
+    parser.add_argument("--alpha", type=float, default=1.5, help="Contrast factor.")
+    parser.add_argument("--beta", type=int, default=10, help="Brightness offset.")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=(args.height, args.width, 3), dtype=np.uint8)
+    work = np.empty_like(frame)
+
+    adjust = BrightnessContrastLUT(args.alpha, args.beta)
+    identity = BrightnessContrastLUT(1.0, 0)
+    table = np.clip(np.rint(np.abs(np.arange(256) * args.alpha + args.beta)), 0, 255).astype(np.uint8)
+
+    # Same output as the previous implementation
+    expected = cv2.convertScaleAbs(frame, alpha=args.alpha, beta=args.beta)
+    if not np.array_equal(expected, adjust.apply(frame, dst=work)):
+        print("Warning: apply() output differs from convertScaleAbs.")
+
+    print(f"{args.width}x{args.height}, {args.frames} frames")
+    measure(f"alpha={args.alpha}, beta={args.beta}", {
+        "convertScaleAbs (previous)": lambda: cv2.convertScaleAbs(frame, alpha=args.alpha, beta=args.beta),
+        "apply (reused buffer)": lambda: adjust.apply(frame, dst=work),
+        "cv2.LUT (reference)": lambda: cv2.LUT(frame, table, dst=work),
+    }, args.frames)
+    measure("alpha=1, beta=0", {
+        "convertScaleAbs (previous)": lambda: cv2.convertScaleAbs(frame, alpha=1.0, beta=0),
+        "apply (skipped)": lambda: identity.apply(frame, dst=work),
+    }, args.frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark: converting a detection project's labels to YOLO format.
+
+Compares the per-file, per-line loop of YoloLabelConverter (used by the
+dataset dialog) with the vectorized LabelTable on a generated project of
+label files. Reading and writing text dominates both, so the processing
+(center conversion, clipping, filtering, per-class counts) is also timed
+on boxes already in memory: a per-box Python loop against LabelTable.
+
+Usage:
+    python benchmarks/bench_label_table.py [--boxes 1000000] [--per-image 50] [--classes 20]
+"""
+
+import argparse
+import filecmp
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from widgets.label_table import LabelTable
+from widgets.yolo_labels import YoloLabelConverter
+
+
+def make_project(data_dir, boxes, per_image, classes, rng):
+    """Writes label files with `per_image` random boxes each; returns the class names."""
+    names = [f"class{i}" for i in range(classes)]
+    with open(os.path.join(data_dir, "classes.lst"), 'w', encoding='utf-8') as f:
+        f.write("\n".join(names) + "\n")
+
+    images = (boxes + per_image - 1) // per_image
+    class_ids = rng.integers(0, classes, size=boxes)
+    w = rng.uniform(0.01, 0.5, size=boxes)
+    h = rng.uniform(0.01, 0.5, size=boxes)
+    x = rng.uniform(0, 1, size=boxes) * (1 - w)
+    y = rng.uniform(0, 1, size=boxes) * (1 - h)
+    for i in range(images):
+        rows = range(i * per_image, min((i + 1) * per_image, boxes))
+        with open(os.path.join(data_dir, f"img{i:07d}.txt"), 'w', encoding='utf-8') as f:
+            f.write("\n".join(f"{names[class_ids[j]]} {x[j]} {y[j]} {w[j]} {h[j]}" for j in rows))
+    return names
+
+
+def loop_process(boxes, class_map, min_size):
+    """The per-box equivalent of to_center(), clip(), filter(valid_mask()) and the class counts."""
+    result = []
+    counts = {}
+    for class_name, left, top, w, h in boxes:
+        class_id = class_map.get(class_name)
+        if class_id is None:
+            continue
+        x1, y1 = min(max(left, 0.0), 1.0), min(max(top, 0.0), 1.0)
+        x2, y2 = min(max(left + w, 0.0), 1.0), min(max(top + h, 0.0), 1.0)
+        w, h = x2 - x1, y2 - y1
+        if w <= min_size or h <= min_size:
+            continue
+        result.append((class_id, (x1 + x2) / 2, (y1 + y2) / 2, w, h))
+        counts[class_id] = counts.get(class_id, 0) + 1
+    return result, counts
+
+
+def table_process(table, min_size):
+    table = table.copy().to_center().clip()
+    table = table.filter(table.valid_mask(min_size))
+    return table, table.stats()["boxes_per_class"]
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="YOLO label conversion benchmark.")
+    parser.add_argument("--boxes", type=int, default=1_000_000, help="Total number of boxes.")
+    parser.add_argument("--per-image", type=int, default=50, help="Boxes per label file.")
+    parser.add_argument("--classes", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as root:
+        data_dir = os.path.join(root, "data")
+        loop_dir = os.path.join(root, "loop")
+        table_dir = os.path.join(root, "table")
+        os.makedirs(data_dir)
+        os.makedirs(loop_dir)
+
+        classes = make_project(data_dir, args.boxes, args.per_image, args.classes, rng)
+        files = sorted(f for f in os.listdir(data_dir) if f.endswith('.txt'))
+        print(f"{args.boxes} boxes in {len(files)} label files, {args.classes} classes")
+
+        def loop():
+            converter = YoloLabelConverter(classes)
+            for file_name in files:
+                converter.convert_file(os.path.join(data_dir, file_name), os.path.join(loop_dir, file_name))
+        _, loop_seconds = timed(loop)
+
+        table, load_seconds = timed(lambda: LabelTable.load(data_dir, classes))
+        _, write_seconds = timed(lambda: table.write_yolo(table_dir))
+        table_seconds = load_seconds + write_seconds
+
+        # Same output as the loop
+        _, mismatch, errors = filecmp.cmpfiles(loop_dir, table_dir, files, shallow=False)
+        if mismatch or errors:
+            print(f"Warning: {len(mismatch) + len(errors)} label files differ from the loop output.")
+
+        # Processing only, on boxes in memory
+        min_size = 0.02
+        class_map = {class_name: i for i, class_name in enumerate(classes)}
+        boxes = [(classes[c], x, y, w, h) for c, x, y, w, h in
+                 zip(table.boxes["class"].tolist(), table.boxes["x"].tolist(), table.boxes["y"].tolist(),
+                     table.boxes["w"].tolist(), table.boxes["h"].tolist())]
+        (loop_boxes, _), loop_process_seconds = timed(lambda: loop_process(boxes, class_map, min_size))
+        (processed, _), table_process_seconds = timed(lambda: table_process(table, min_size))
+        if len(loop_boxes) != len(processed):
+            print(f"Warning: the loop kept {len(loop_boxes)} boxes, LabelTable {len(processed)}.")
+
+        _, center_seconds = timed(lambda: table.copy().to_center())
+        _, clip_seconds = timed(lambda: table.copy().clip())
+        _, filter_seconds = timed(lambda: table.filter(table.valid_mask(min_size)))
+        _, stats_seconds = timed(table.stats)
+
+        print("files -> YOLO files")
+        print(f"  {'loop (YoloLabelConverter)':<28} {loop_seconds * 1000:9.1f} ms")
+        print(f"  {'LabelTable load + write':<28} {table_seconds * 1000:9.1f} ms  ({loop_seconds / table_seconds:5.1f}x)")
+        print("center + clip + filter + class counts, in memory")
+        print(f"  {'per-box loop':<28} {loop_process_seconds * 1000:9.1f} ms")
+        print(f"  {'LabelTable':<28} {table_process_seconds * 1000:9.1f} ms  ({loop_process_seconds / table_process_seconds:5.1f}x)")
+        print("LabelTable stages")
+        for name, seconds in (("  load", load_seconds), ("  write_yolo", write_seconds),
+                              ("  to_center", center_seconds), ("  clip", clip_seconds),
+                              ("  filter", filter_seconds), ("  stats", stats_seconds)):
+            print(f"  {name:<28} {seconds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ import json
 import subprocess
 import sys
 import os
-from PySide6.QtWidgets import QWidget, QFileDialog, QTableWidgetItem, QTableWidget, QMessageBox
+from PySide6.QtWidgets import QWidget, QFileDialog, QTableWidgetItem, QTableWidget, QTableView, QMessageBox
 from PySide6.QtCore import QThread, Signal, QTimer
 from PySide6.QtGui import QPixmap
 import time
@@ -16,8 +16,16 @@ from widgets.project_manager_ui import Ui_FormProjectManager
 from widgets.annotation_manager import AnnotationWidget
 from widgets.annotate_dialog import AnnotateDialog
 from widgets.video_stream_manager import VideoStreamer
-
-class image_classifier():
+from widgets.image_writer import ImageWriterPool
+from widgets.shot_taker import ShotTakerMixin
+from widgets.file_table_model import scan_project_files
+from widgets.project_index import ProjectIndex
+from widgets.annotation_repository import AnnotationRepository, open_annotation_repository
+from widgets.file_materializer import FileMaterializer
+from widgets.dataset_manifest import DatasetManifest, sync_dataset_folder
+from widgets.dataset_builder import DatasetBuilder, start_dataset_build, run_tasks_inline
+
+class image_classifier(ShotTakerMixin):
     
     def __init__(
             self, 
@@ -25,6 +33,9 @@ class image_classifier():
             projec_data, 
             my_annotator: AnnotationWidget,
             my_video: VideoStreamer,
+            image_writer: ImageWriterPool=None,
+            project_index: ProjectIndex=None,
+            annotation_repo: AnnotationRepository=None,
             parent=None
         ):
 
@@ -32,38 +43,53 @@ class image_classifier():
         self.my_annotator = my_annotator
         self.my_video = my_video
         self.my_parent = parent
+        self.image_writer = image_writer if image_writer is not None else ImageWriterPool(parent=self.my_parent)
+        # Listings of the project folder come from the index, which follows the disk through a file watcher
+        self.project_index = project_index
+        self.dataset_builder = None
+        # Labels are read and written through the project's repository (label files or database)
+        if annotation_repo is None:
+            annotation_repo = open_annotation_repository(self.project_data, project_index, parent=self.my_parent)
+        self.annotation_repo = annotation_repo
 
-        self.capture_timer = QTimer(self.my_parent)
-        self.capture_timer.setInterval(200)  # 0.2 seconds
-        self.capture_timer.timeout.connect(self.take_shot)
+        self.init_shot_taking()
 
         self.detection_result_timer = QTimer(self.my_parent)
         self.detection_result_timer.setInterval(200)
         self.detection_result_timer.timeout.connect(self.handle_inference_results)
 
         self.ui = parentui
-        self.ui.pushButtonTakeShots.pressed.connect(self.start_taking_shots)
-        self.ui.pushButtonTakeShots.released.connect(self.stop_taking_shots)
-        self.ui.pushButtonTakeShots.clicked.connect(self.take_shot)
-        self.ui.pushButtonAnnotate.clicked.connect(self.start_annotation)
-        self.ui.pushButtonMakeDataset.clicked.connect(self.make_dataset)
-
-        self.ui.pushButtonDeleteFiles.clicked.connect(self.delete_files)
-
-        self.ui.pushButtonUpdateDatasets.clicked.connect(self.update_datasets)
-        self.ui.pushButtonStartTrain.clicked.connect(self.start_train)
-
-        self.ui.pushButtonRefreshTrainedModels.clicked.connect(self.update_trained_models)
-        self.ui.pushButtonToggleInference.clicked.connect(self.toggle_inference)
-
+        self.file_model = self.ui.tableViewFilesIC.model().sourceModel()
+        # The buttons outlive this object; close() disconnects them when another project is opened
+        self.ui_connections = [
+            (self.ui.pushButtonTakeShots.pressed, self.start_taking_shots),
+            (self.ui.pushButtonTakeShots.released, self.stop_taking_shots),
+            (self.ui.pushButtonAnnotate.clicked, self.start_annotation),
+            (self.ui.pushButtonMakeDataset.clicked, self.make_dataset),
+            (self.ui.pushButtonDeleteFiles.clicked, self.delete_files),
+            (self.ui.pushButtonUpdateDatasets.clicked, self.update_datasets),
+            (self.ui.pushButtonStartTrain.clicked, self.start_train),
+            (self.ui.pushButtonRefreshTrainedModels.clicked, self.update_trained_models),
+            (self.ui.pushButtonToggleInference.clicked, self.toggle_inference),
+        ]
+        for signal, slot in self.ui_connections:
+            signal.connect(slot)
+
+    def close(self):
+        """Detaches from the project page before the project's repository is closed."""
+        for signal, slot in self.ui_connections:
+            signal.disconnect(slot)
+        self.ui_connections = []
+        self.file_model.follow_index(None)
+        self.detection_result_timer.stop()
+        self.detection_result_timer.deleteLater()
 
     def handle_inference_results(self):
         results = self.my_annotator.current_results
-        if results:
+        if results and results.top1 is not None:
             self.ui.plainTextEditInferenceResults.clear()
-            txt = f"Names:{results[0].names}\n"
-            top1_ndx = results[0].probs.top1
-            txt += f"Top1:{results[0].names[top1_ndx]} (conf:{results[0].probs.top1conf.tolist()*100:.1f} %)\n"
+            txt = f"Names:{results.names}\n"
+            txt += f"Top1:{results.top1_name} (conf:{results.top1conf*100:.1f} %)\n"
             self.ui.plainTextEditInferenceResults.appendPlainText(txt)
 
     def toggle_inference(self):
@@ -74,12 +100,15 @@ class image_classifier():
             sel_model = self.ui.comboBoxTrainedModels.currentText()
             if sel_model:
                 model_path = f"{self.project_data.get('directory')}/trained_models/{sel_model}/weights/best.pt"
-                self.my_video.set_model(model_path)
-                self.my_video.is_detecting = True
+                # Loads in the background; detection starts once the model is swapped in
+                self.my_video.set_model(model_path, enable_detection=True)
                 self.detection_result_timer.start()
 
     def update_trained_models(self):
-        trained_model_list = self.get_subfolders_scandir(f"{self.project_data.get('directory')}/trained_models")
+        if self.project_index:
+            trained_model_list = self.project_index.subfolders("trained_models")
+        else:
+            trained_model_list = self.get_subfolders_scandir(f"{self.project_data.get('directory')}/trained_models")
         self.ui.comboBoxTrainedModels.clear()
         self.ui.comboBoxTrainedModels.addItems(trained_model_list)
 
@@ -92,144 +121,73 @@ class image_classifier():
                 QMessageBox.information(self.my_parent, "No dataset folder", "Dataset folder is not prepared.")
                 return
             
-            if os.path.exists(f"{dataset_folder}/train_dataset"):
-                shutil.rmtree(f"{dataset_folder}/train_dataset")
-            
-            # copy files to train_dataset
-            with open(f"{dataset_folder}/train.json", 'r') as f:
-                dict_train = json.load(f)
-                self.organize_files_by_annotation(
-                    dict_train, 
-                    f"{self.project_data.get('directory')}/dataset", 
-                    f"{dataset_folder}/train_dataset/train"
-                )
-            with open(f"{dataset_folder}/test.json", 'r') as f:
-                dict_test = json.load(f)
-                self.organize_files_by_annotation(
-                    dict_test, 
-                    f"{self.project_data.get('directory')}/dataset", 
-                    f"{dataset_folder}/train_dataset/test"
-                )
-            with open(f"{dataset_folder}/val.json", 'r') as f:
-                dict_val = json.load(f)
-                self.organize_files_by_annotation(
-                    dict_val, 
-                    f"{self.project_data.get('directory')}/dataset", 
-                    f"{dataset_folder}/train_dataset/val"
-                )
-
-            # run yolo train
-            pretrained_model = self.ui.comboBoxPreTrainedModel.currentText()
-            # model = YOLO(pretrained_model)
-            # results = model.train(
-            #     data=f"{dataset_folder}/train_dataset",
-            #     epochs = int(self.ui.lineEditEpochs.text()),
-            #     imgsz = int(self.ui.comboBoxImageSize.currentText()),
-            #     project = f"{self.project_data.get('directory')}/trained_models",
-            #     name = self.ui.lineEditTrainTitle.text()
-            # )
-
-            python_executable = sys.executable
-            script_path = os.path.join(os.path.dirname(__file__), 'trainer_gui.py')
-            command = [
-                python_executable, 
-                script_path,
-                "--data", f"{dataset_folder}/train_dataset",
-                "--epochs", self.ui.lineEditEpochs.text(),
-                "--model", pretrained_model,
-                "--imgsz", self.ui.comboBoxImageSize.currentText(),
-                "--project", f"{self.project_data.get('directory')}/trained_models",
-                "--name", self.ui.lineEditTrainTitle.text()
-            ]
-            result = subprocess.run(command, text=True, check=True)
-
-    def organize_files_by_annotation(
-        self,
-        annotation_dict: dict,
-        source_base_folder: str,
-        destination_base_folder: str
-    ) -> tuple[list[str], list[str]]:
-        """
-        Copies image files to subfolders named after their annotated class.
-
-        Args:
-            annotation_dict (dict): A dictionary where keys are filenames (e.g., "image.jpg")
-                                    and values are their corresponding class names (e.g., "cat").
-            source_base_folder (str): The path to the folder containing the original image files.
-            destination_base_folder (str): The path to the base folder where class subfolders
-                                        (e.g., 'destination_base_folder/cat/',
-                                        'destination_base_folder/dog/') will be created.
-
-        Returns:
-            tuple[list[str], list[str]]: A tuple containing two lists:
-                                        - The first list contains paths of successfully copied files.
-                                        - The second list contains paths of files that failed to copy,
-                                            along with the error message.
-        """
-        successfully_copied = []
-        failed_copies = []
-
-        # 1. Validate source base folder existence
-        if not os.path.isdir(source_base_folder):
-            error_msg = f"Error: Source base folder '{source_base_folder}' does not exist or is not a directory."
-            print(error_msg)
-            return [], [error_msg]
-
-        # 2. Ensure destination base folder exists (create if not)
-        if not os.path.exists(destination_base_folder):
-            try:
-                os.makedirs(destination_base_folder)
-                print(f"Created destination base folder: '{destination_base_folder}'")
-            except OSError as e:
-                error_msg = f"Failed to create destination base folder '{destination_base_folder}': {e}"
-                print(f"Error: {error_msg}")
-                return [], [error_msg]
-        else:
-            print(f"Destination base folder '{destination_base_folder}' already exists.")
-
-        if not annotation_dict:
-            print("Annotation dictionary is empty. No files to organize.")
-            return [], []
-
-        print(f"\nStarting file organization from '{source_base_folder}' to '{destination_base_folder}':")
-
-        # 3. Iterate through each item in the annotation dictionary
-        for filename, class_name in annotation_dict.items():
-            source_file_path = os.path.join(source_base_folder, filename)
-            
-            # 4. Construct the path for the class-specific subfolder
-            target_class_folder = os.path.join(destination_base_folder, class_name)
-            
-            # 5. Create the class-specific subfolder if it doesn't exist
-            if not os.path.exists(target_class_folder):
-                try:
-                    os.makedirs(target_class_folder)
-                    print(f"  Created class folder: '{target_class_folder}'")
-                except OSError as e:
-                    failed_copies.append(f"'{filename}': Failed to create class folder '{target_class_folder}': {e}")
-                    print(f"  Error creating folder for '{filename}': {e}")
-                    continue # Skip copying this file if folder creation failed
-
-            destination_file_path = os.path.join(target_class_folder, filename)
+            if self.dataset_builder is not None:
+                return
 
-            # 6. Copy the file
-            if os.path.exists(source_file_path):
-                try:
-                    # shutil.copy2 preserves metadata (timestamps, permissions)
-                    shutil.copy2(source_file_path, destination_file_path)
-                    successfully_copied.append(destination_file_path)
-                    print(f"  Copied '{filename}' to '{class_name}/'")
-                except Exception as e:
-                    failed_copies.append(f"'{filename}': Failed to copy to '{class_name}': {e}")
-                    print(f"  Error copying '{filename}': {e}")
-            else:
-                failed_copies.append(f"'{filename}': Source file not found at '{source_file_path}'")
-                print(f"  Warning: Source file not found: '{filename}' at '{source_file_path}'")
+            # bring train_dataset in line with the splits; only files that differ from the last build are touched
+            splits = {}
+            for split in ("train", "test", "val"):
+                with open(f"{dataset_folder}/{split}.json", 'r') as f:
+                    splits[split] = json.load(f)
+            materializer = self.new_materializer()
+            manifest_path = f"{dataset_folder}/{DatasetManifest.FILE_NAME}"
+
+            def plan(builder):
+                sync_dataset_folder(
+                    f"{dataset_folder}/train_dataset",
+                    f"{self.project_data.get('directory')}/dataset",
+                    splits,
+                    manifest_path,
+                    materializer,
+                    builder
+                )
 
-        return successfully_copied, failed_copies
+            def cleanup():
+                # Without its manifest the half-synced folder is rebuilt from scratch next time
+                if os.path.exists(manifest_path):
+                    os.remove(manifest_path)
+
+            def finished(status):
+                if status == "done":
+                    self.run_trainer(dataset_folder)
+
+            self.run_dataset_builder(DatasetBuilder(plan, cleanup, parent=self.my_parent), "Preparing train dataset", finished)
+
+    def run_trainer(self, dataset_folder: str):
+        # run yolo train
+        pretrained_model = self.ui.comboBoxPreTrainedModel.currentText()
+        # model = YOLO(pretrained_model)
+        # results = model.train(
+        #     data=f"{dataset_folder}/train_dataset",
+        #     epochs = int(self.ui.lineEditEpochs.text()),
+        #     imgsz = int(self.ui.comboBoxImageSize.currentText()),
+        #     project = f"{self.project_data.get('directory')}/trained_models",
+        #     name = self.ui.lineEditTrainTitle.text()
+        # )
+
+        python_executable = sys.executable
+        script_path = os.path.join(os.path.dirname(__file__), 'trainer_gui.py')
+        command = [
+            python_executable, 
+            script_path,
+            "--data", f"{dataset_folder}/train_dataset",
+            "--epochs", self.ui.lineEditEpochs.text(),
+            "--model", pretrained_model,
+            "--imgsz", self.ui.comboBoxImageSize.currentText(),
+            "--project", f"{self.project_data.get('directory')}/trained_models",
+            "--name", self.ui.lineEditTrainTitle.text()
+        ]
+        result = subprocess.run(command, text=True, check=True)
+
+    def new_materializer(self) -> FileMaterializer:
+        """Links or copies dataset files as the project's "dataset_link_strategy" says (default: auto)."""
+        return FileMaterializer(self.project_data.get("dataset_link_strategy", "auto"))
 
     def update_datasets(self):
-        dataset_list = self.get_subfolders_scandir(f"{self.project_data.get('directory')}/dataset")
+        if self.project_index:
+            dataset_list = self.project_index.subfolders("dataset")
+        else:
+            dataset_list = self.get_subfolders_scandir(f"{self.project_data.get('directory')}/dataset")
         self.ui.comboBoxSelectedDataset.clear()
         self.ui.comboBoxSelectedDataset.addItems(dataset_list)
 
@@ -263,53 +221,81 @@ class image_classifier():
 
     def make_dataset(self):
         # get the annotation inforamtion
-        annotation_info_path = self.project_data.get("directory") + "/data/annotation_info.json"
-        if not os.path.exists(annotation_info_path):
+        annotation_info = self.annotation_repo.class_labels()
+        if not annotation_info:
             QMessageBox.information(self.my_parent, "No annotation file", "No annotation file, check your annotation.")
             return
-        
-        with open(annotation_info_path, 'r') as f:
-            annotation_info = json.load(f)
-            print("Annotation info file opens successfully.")
+
+        if self.dataset_builder is not None:
+            return
 
         # split data into train, test, and val
         train_dict, test_dict, val_dict = self.split_dict_randomly(annotation_info)
 
-        # copy files to the destination folder
-        self.copy_files_from_dict_keys(
-            annotation_info, 
-            self.project_data.get("directory") + "/data", 
-            self.project_data.get("directory") + "/dataset")
-
-        # save the dataset inforamtion
-        if self.project_data:
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            dataset_dir = f"{self.project_data.get('directory')}/dataset/{timestamp}"
-            try:
-                os.makedirs(dataset_dir, exist_ok=True)
-                print(f"Folder '{dataset_dir}' ensured to exist.")
-
-                self.save_dict_as_json(train_dict, f"{dataset_dir}/train.json")
-                self.save_dict_as_json(test_dict, f"{dataset_dir}/test.json")
-                self.save_dict_as_json(val_dict, f"{dataset_dir}/val.json")
-
-                self.update_datasets()
-            except OSError as e:
-                print(f"Error creating folder '{dataset_dir}': {e}")
+        project_dir = self.project_data.get("directory")
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        dataset_dir = f"{project_dir}/dataset/{timestamp}"
+        materializer = self.new_materializer()
+
+        def plan(builder):
+            # link (or copy) files to the destination folder
+            _, failed = self.copy_files_from_dict_keys(
+                annotation_info,
+                f"{project_dir}/data",
+                f"{project_dir}/dataset",
+                materializer,
+                builder)
+            builder.log(f"Dataset images materialized: {materializer.summary()}")
+            if failed:
+                builder.log(f"{len(failed)} annotated images were not found.")
+            builder.check_cancelled()
+
+            # save the dataset inforamtion
+            os.makedirs(dataset_dir, exist_ok=True)
+            for split, split_dict in (("train", train_dict), ("test", test_dict), ("val", val_dict)):
+                if not self.save_dict_as_json(split_dict, f"{dataset_dir}/{split}.json"):
+                    raise OSError(f"Cannot write {split}.json")
+            builder.log(f"Dataset '{timestamp}' is prepared.")
+
+        def cleanup():
+            # The images in dataset/ are shared by all versions and stay
+            if os.path.exists(dataset_dir):
+                shutil.rmtree(dataset_dir)
+
+        self.run_dataset_builder(DatasetBuilder(plan, cleanup, parent=self.my_parent), "Making dataset",
+                                 lambda status: self.update_datasets())
+
+    def run_dataset_builder(self, builder: DatasetBuilder, title: str, on_finished=None):
+        """Runs a dataset build with a progress dialog; `on_finished(status)` is called on the GUI thread."""
+        self.dataset_builder = builder
+
+        def finished(status, summary):
+            self.dataset_builder = None
+            if status == "failed":
+                QMessageBox.warning(self.my_parent, title, summary)
+            if on_finished:
+                on_finished(status)
+
+        builder.build_finished.connect(finished)
+        self.build_progress_dialog = start_dataset_build(builder, title, self.my_parent)
 
     def copy_files_from_dict_keys(
         self,
         annotation_dict: dict,
         source_folder: str,
-        destination_folder: str
+        destination_folder: str,
+        materializer: FileMaterializer = None,
+        builder: DatasetBuilder = None
     ) -> tuple[list[str], list[str]]:
         """
-        Copies files specified by keys in a dictionary from a source folder to a destination folder.
+        Links (or copies) files specified by keys in a dictionary from a source folder to a destination folder.
 
         Args:
             annotation_dict (dict): A dictionary where keys are the filenames of the images.
             source_folder (str): The path to the directory where the original image files are located.
             destination_folder (str): The path to the directory where the files should be copied.
+            materializer (FileMaterializer, optional): How files are placed. Defaults to new_materializer().
+            builder (DatasetBuilder, optional): Runs the copies on its thread pool and collects the errors.
 
         Returns:
             tuple[list[str], list[str]]: A tuple containing two lists:
@@ -319,6 +305,7 @@ class image_classifier():
         """
         successfully_copied = []
         failed_copies = []
+        materializer = materializer or self.new_materializer()
 
         # 1. Validate source folder existence
         if not os.path.isdir(source_folder):
@@ -342,26 +329,21 @@ class image_classifier():
             print("Annotation dictionary is empty. No files to copy.")
             return [], []
 
-        print(f"\nAttempting to copy files from '{source_folder}' to '{destination_folder}':")
-
-        # 3. Iterate through the filenames (keys) and copy each file
+        # 3. Link or copy each file; errors are collected (by the builder) instead of printed per file
+        present = []
         for filename_key in annotation_dict.keys():
-            source_path = os.path.join(source_folder, filename_key)
-            destination_path = os.path.join(destination_folder, filename_key)
-
-            if os.path.exists(source_path):
-                try:
-                    # shutil.copy2 preserves metadata (timestamps, permissions)
-                    shutil.copy2(source_path, destination_path)
-                    successfully_copied.append(destination_path)
-                    print(f"  Copied: '{filename_key}'")
-                except Exception as e:
-                    failed_copies.append(f"'{filename_key}': {e}")
-                    print(f"  Error copying '{filename_key}': {e}")
+            if os.path.exists(os.path.join(source_folder, filename_key)):
+                present.append(filename_key)
             else:
-                failed_copies.append(f"'{filename_key}': Source file not found at '{source_path}'")
-                print(f"  Warning: Source file not found: '{filename_key}' at '{source_path}'")
+                failed_copies.append(f"'{filename_key}': Source file not found at '{source_folder}'")
+
+        def place(filename_key):
+            destination_path = os.path.join(destination_folder, filename_key)
+            materializer.materialize(os.path.join(source_folder, filename_key), destination_path)
+            return destination_path
 
+        run_tasks = builder.run_tasks if builder else run_tasks_inline
+        successfully_copied = run_tasks("Copying images", present, place)
         return successfully_copied, failed_copies
 
 
@@ -458,7 +440,7 @@ class image_classifier():
 
     def delete_files(self):
         # get the list of files from the tablewidget
-        file_list = self.get_selected_first_column_texts(self.ui.tableWidgetFilesIC)
+        file_list = self.get_selected_first_column_texts(self.ui.tableViewFilesIC)
         if not file_list:
             QMessageBox.information(self.my_parent, "No Selection", "Please select at least one row to delete.")
             return
@@ -478,74 +460,13 @@ class image_classifier():
         
         # delete a list of files
         if reply == QMessageBox.StandardButton.Yes:
-            self.delete_files_from_folder(f"{self.project_data.get('directory')}/data", file_list)
+            deleted, _ = self.delete_files_from_folder(f"{self.project_data.get('directory')}/data", file_list)
 
-            # update annotation_info.json
-            self.remove_items_from_json_by_keys(self.project_data.get("directory") + "/data/annotation_info.json", file_list)
+            # drop the labels of the deleted files
+            self.annotation_repo.delete_labels(os.path.basename(path) for path in deleted)
 
             # update file list
-            self.update_file_list()
-
-    def remove_items_from_json_by_keys(self, file_path: str, keys_to_remove: list[str]) -> bool:
-        """
-        Removes items from a JSON file whose keys are present in the given list.
-
-        Args:
-            file_path (str): The path to the JSON file.
-            keys_to_remove (list[str]): A list of keys to be removed from the JSON data.
-
-        Returns:
-            bool: True if the operation was successful, False otherwise.
-                Returns True even if none of the keys were found in the file,
-                as the desired state (keys absent) is maintained.
-        """
-        data = {}
-        changes_made = False
-
-        # 1. Read the JSON file (or handle its absence/invalidity)
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                print(f"Successfully loaded JSON from '{file_path}'.")
-            except json.JSONDecodeError:
-                print(f"Error: '{file_path}' contains invalid JSON. Cannot process file.")
-                return False
-            except Exception as e:
-                print(f"Error reading '{file_path}': {e}.")
-                return False
-        else:
-            print(f"File '{file_path}' does not exist. No items to remove.")
-            return True # Considered successful as there's nothing to remove
-
-        # Ensure the loaded data is a dictionary
-        if not isinstance(data, dict):
-            print(f"Error: JSON content of '{file_path}' is not a dictionary. Cannot remove items.")
-            return False
-
-        # 2. Iterate through the keys_to_remove and delete matching items
-        print(f"Attempting to remove keys: {keys_to_remove}")
-        for key in keys_to_remove:
-            if key in data:
-                del data[key]
-                print(f"  Removed key: '{key}'")
-                changes_made = True
-            else:
-                print(f"  Key '{key}' not found in file. Skipping.")
-
-        # 3. Write the modified dictionary back to the JSON file (only if changes were made or file was empty)
-        if changes_made or not data: # Write back if something was deleted or if data became empty
-            try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=4) # Use indent for pretty-printing
-                print(f"Successfully wrote updated JSON to '{file_path}'.")
-                return True
-            except Exception as e:
-                print(f"Error writing to '{file_path}': {e}")
-                return False
-        else:
-            print("No matching keys found and no changes made to the file.")
-            return True # Considered successful as no action was needed
+            self.file_model.remove_files(os.path.basename(path) for path in deleted)
 
     def delete_files_from_folder(self, folder_path: str, files_to_delete: list[str]) -> tuple[list[str], list[str]]:
         """
@@ -592,7 +513,7 @@ class image_classifier():
 
         return successfully_deleted, failed_to_delete
 
-    def get_selected_first_column_texts(self, this_table_widget:QTableWidget):
+    def get_selected_first_column_texts(self, this_table_view:QTableView):
         """
         Retrieves the text from the first column (index 0)
         of all currently selected rows.
@@ -602,7 +523,7 @@ class image_classifier():
         # Get unique row indices from all selected cells
         # We use a set to ensure unique row numbers, then convert to list for iteration
         # No need to sort if we just iterate and get items.
-        unique_selected_rows = {index.row() for index in this_table_widget.selectedIndexes()}
+        unique_selected_rows = {index.row() for index in this_table_view.selectedIndexes()}
         if not unique_selected_rows:
             QMessageBox.information(self.my_parent, "No Selection", "Please select at least one row to delete.")
             return
@@ -612,14 +533,10 @@ class image_classifier():
             print("No rows selected.")
             return None
 
+        model = this_table_view.model()
         for row_index in sorted(list(unique_selected_rows)): # Sort for consistent order in output
-            # Get the QTableWidgetItem from the first column (index 0) of the current row
-            item = this_table_widget.item(row_index, 0)
-            if item is not None:
-                selected_names.append(item.text())
-            else:
-                # This case typically indicates an empty cell or an issue, but defensively handle it
-                print(f"Warning: No item found at row {row_index}, column 0.")
+            # The file name is the first column (index 0) of the current row
+            selected_names.append(model.file_name(row_index))
 
         print(f"Selected names from first column: {selected_names}")
         return selected_names
@@ -627,51 +544,15 @@ class image_classifier():
     def start_annotation(self):
         my_annotate_dialog = AnnotateDialog(
             project_data=self.project_data,
+            file_model=self.file_model,
+            annotation_repo=self.annotation_repo,
             parent=self.my_parent
         )
         my_annotate_dialog.exec()
 
-    def start_taking_shots(self):
-        self.capture_timer.start()
-
-    def stop_taking_shots(self):
-        self.capture_timer.stop()
-
-    def take_shot(self):
-        if self.project_data and self.my_annotator:
-            data_dir = f"{self.project_data.get('directory')}/data"
-            try:
-                os.makedirs(data_dir, exist_ok=True)
-                print(f"Folder '{data_dir}' ensured to exist.")
-            except OSError as e:
-                print(f"Error creating folder '{data_dir}': {e}")
-
-            if data_dir and os.path.exists(data_dir):
-                pixmap = self.my_annotator.current_pixmap
-                # timestamp = int(time.time() * 1000)
-                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-                file_path = os.path.join(data_dir, f"shot_{timestamp}.jpg")
-                pixmap.save(file_path, "JPG")
-                print(f"Image saved to {file_path}")
-                self.update_file_list()
-
     def update_file_list(self):
-        if self.project_data:
-            data_dir = f"{self.project_data.get('directory')}/data"
-            try:
-                os.makedirs(data_dir, exist_ok=True)
-                print(f"Folder '{data_dir}' ensured to exist.")
-            except OSError as e:
-                print(f"Error creating folder '{data_dir}': {e}")
-
-            if data_dir and os.path.exists(data_dir):
-                files = sorted([f for f in os.listdir(data_dir) if f.endswith(('.png', '.jpg', '.jpeg'))])
-                self.ui.tableWidgetFilesIC.setRowCount(len(files))
-                self.ui.tableWidgetFilesIC.setColumnCount(2)
-                self.ui.tableWidgetFilesIC.setHorizontalHeaderLabels(["File Name", "Class"])
-                self.ui.tableWidgetFilesIC.setColumnWidth(0, 250)
-                self.ui.tableWidgetFilesIC.setColumnWidth(1, 60)
-                for row, file_name in enumerate(files):
-                    self.ui.tableWidgetFilesIC.setItem(row, 0, QTableWidgetItem(file_name))
-                    self.ui.tableWidgetFilesIC.setItem(row, 1, QTableWidgetItem(""))
-
+        """Rescans the project's data folder into the file list."""
+        data_dir = self.get_data_dir()
+        if data_dir:
+            self.file_model.set_files(*scan_project_files(data_dir, self.project_index, self.annotation_repo))
+            self.file_model.follow_index(self.project_index)
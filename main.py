@@ -1,9 +1,11 @@
 import sys
+import argparse
 from PySide6.QtWidgets import QApplication, QMainWindow
 from PySide6.QtCore import QSettings, Slot, QSize, QRect, QPoint, Qt
-from PySide6.QtGui import QPixmap, QImage
+from PySide6.QtGui import QPixmap, QImage, QShortcut, QKeySequence
 
 from widgets.video_stream_manager import VideoControlWidget, VideoStreamer
+from widgets.frame_sources import create_frame_source, PACING_REALTIME, PACING_FAST
 from widgets.annotation_manager import AnnotationWidget
 from widgets.project_manager import projectManagerWidget
 
@@ -11,7 +13,7 @@ from main_ui import Ui_MainWindow
 import qdarkstyle
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, source_spec:str=None, pacing:str=PACING_REALTIME, max_display_fps:float=None):
         super().__init__()
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
@@ -20,35 +22,67 @@ class MainWindow(QMainWindow):
         self.camera_index = 0
         self.frame_width = 1920
         self.frame_height = 1080
+        self.profiling_enabled = False
+        # Offline replay instead of a camera (video file, image folder/glob or 'synthetic')
+        self.source_spec = source_spec
+        self.source_pacing = pacing
+        # Preview refresh cap, independent of the capture rate (None: as fast as the GUI keeps up)
+        self.max_display_fps = max_display_fps
 
         self._init_annotation_widget()
         self._init_video_control_widget()  # Initialize controls first
-        # Get the first camera and start the stream
+        # Start with the first camera known from the last launch; the list is refreshed in the background
         initial_camera_index = self.video_control_widget.get_first_camera_index()
-        if initial_camera_index is not None:
+        if self.source_spec:
+            self._init_video_streamer_widget()
+        elif initial_camera_index is not None:
             self.camera_index = initial_camera_index
             self._init_video_streamer_widget()
         else:
-            self.handle_camera_error("No cameras found.")
+            self.my_annotator.setText("Searching for cameras...")
 
         self._init_project_manager_widget()
 
+        # F3: toggle per-stage latency measurement and its on-screen HUD
+        self.profiling_shortcut = QShortcut(QKeySequence("F3"), self)
+        self.profiling_shortcut.activated.connect(self.toggle_profiling)
+        # F4: toggle the inference overlay without re-running inference
+        self.overlay_shortcut = QShortcut(QKeySequence("F4"), self)
+        self.overlay_shortcut.activated.connect(
+            lambda: self.my_annotator.set_inference_overlay_visible(not self.my_annotator.show_inference_overlay)
+        )
 
     def _init_video_streamer_widget(self):
         if self.my_video and self.my_video.isRunning():
             self.my_video.stop()
             self.my_video.wait()
 
+        source = None
+        if self.source_spec:
+            source = create_frame_source(self.source_spec, self.frame_width, self.frame_height, self.source_pacing)
+
         self.my_video = VideoStreamer(
             camera_index=self.camera_index,
             width=self.frame_width,
             height=self.frame_height,
+            display_size=(self.my_annotator.width(), self.my_annotator.height()),
+            source=source,
             parent=self 
         )
         self.my_video.is_detecting = False
+        current_settings = self.video_control_widget._get_current_input_selections()
+        self.my_video.set_alpha_beta(current_settings["Camera_alpha"], current_settings["Camera_beta"])
         self.my_video.frame_ready.connect(self.my_annotator.update_image)
+        self.my_annotator.display_size_changed.connect(self.my_video.set_display_size)
         self.my_video.error_occurred.connect(self.handle_camera_error)
+        self.my_video.set_profiling(self.profiling_enabled)
+        self.my_video.set_max_display_fps(self.max_display_fps)
         self.my_video.start()
+        if source is None:
+            self.video_control_widget.set_active_camera_index(self.camera_index)
+
+        if hasattr(self, "my_project_manager"):
+            self.my_project_manager.set_video_streamer(self.my_video)
 
     def _init_video_control_widget(self):
         self.video_control_widget = VideoControlWidget()
@@ -56,6 +90,7 @@ class MainWindow(QMainWindow):
         self.video_control_widget.alpha_beta_changed.connect(self.update_alpha_beta_on_video)
         self.video_control_widget.switch_camera_button_clicked.connect(self.switch_camera)
         self.video_control_widget.resolution_changed.connect(self.change_resolution)
+        self.video_control_widget.camera_list_updated.connect(self.handle_camera_list_updated)
         self.ui.verticalLayoutCameraControl.addWidget(self.video_control_widget)
         self.video_control_widget.update_alpha_beta_lineEdit()
 
@@ -87,19 +122,40 @@ class MainWindow(QMainWindow):
             self.my_video.wait()
 
         self.camera_index = camera_index
+        self.source_spec = None # Back to the live camera
         self._init_video_streamer_widget()
 
+    @Slot(object)
+    def handle_camera_list_updated(self, available_cameras:dict):
+        """Starts streaming once the background probe found a camera, if nothing is streaming yet."""
+        if self.source_spec or (self.my_video and self.my_video.isRunning()):
+            return
+
+        initial_camera_index = self.video_control_widget.get_first_camera_index()
+        if initial_camera_index is not None:
+            self.camera_index = initial_camera_index
+            self._init_video_streamer_widget()
+        else:
+            self.handle_camera_error("No cameras found.")
+
+    @Slot()
+    def toggle_profiling(self):
+        self.profiling_enabled = not self.profiling_enabled
+        if self.my_video:
+            self.my_video.set_profiling(self.profiling_enabled)
+        self.my_annotator.set_hud_visible(self.profiling_enabled)
+
     @Slot(float, int)
     def update_alpha_beta_on_video(self, alpha:float, beta:int):
         if self.my_video:
-            self.my_video.this_alph = alpha
-            self.my_video.this_beta = beta
+            self.my_video.set_alpha_beta(alpha, beta)
         
     @Slot(str)
     def handle_camera_error(self, error_message: str):
         print(f"Camera Error: {error_message}")
         self.my_annotator.setText(f"Camera Error: {error_message}\nCheck camera connection or index.")
         self.my_annotator.clear()
+        self.video_control_widget.set_active_camera_index(None)
         if self.my_video:
             self.my_video.stop()
 
@@ -108,14 +164,24 @@ class MainWindow(QMainWindow):
             print(f"Stopping VideoStreamer thread for camera {self.camera_index}...")
             self.my_video.stop()
             self.my_video.wait()
+        self.video_control_widget.stop_camera_probe()
+        # Finish writing queued shots before exiting
+        self.my_project_manager.image_writer.close()
+        self.my_project_manager.close_project_index()
         event.accept()
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv) # Create the QApplication instance
+    parser = argparse.ArgumentParser(description="Ohmy ImClass")
+    parser.add_argument("--source", help="Replay a video file, an image folder/glob (e.g. 'projects/*/data/*.jpg') or 'synthetic:1280x720@30' instead of the camera.")
+    parser.add_argument("--fast", action="store_true", help="Replay as fast as possible instead of in real time.")
+    parser.add_argument("--max-display-fps", type=float, help="Cap the preview refresh rate (frames per second).")
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args) # Create the QApplication instance
 
     stylesheet = qdarkstyle.load_stylesheet(qt_api='pyside6')
     app.setStyleSheet(stylesheet)
         
-    window = MainWindow()      # Create an instance of your main window
+    window = MainWindow(args.source, PACING_FAST if args.fast else PACING_REALTIME, args.max_display_fps)      # Create an instance of your main window
     window.show()                # Show the window
     sys.exit(app.exec())         # Start the event loop
\ No newline at end of file
@@ -11,10 +11,15 @@ from widgets.project_manager_ui import Ui_FormProjectManager
 from widgets.annotation_manager import AnnotationWidget
 from widgets.annotate_dialog import AnnotateDialog
 from widgets.video_stream_manager import VideoStreamer
+from widgets.image_writer import ImageWriterPool
+from widgets.shot_taker import ShotTakerMixin
+from widgets.file_table_model import scan_project_files
+from widgets.project_index import ProjectIndex
+from widgets.annotation_repository import AnnotationRepository, open_annotation_repository
 
 from widgets.make_dataset_dialog import make_dataset_dialog
 
-class object_detector():
+class object_detector(ShotTakerMixin):
     
     def __init__(
             self, 
@@ -22,6 +27,9 @@ class object_detector():
             projec_data, 
             my_annotator: AnnotationWidget,
             my_video: VideoStreamer,
+            image_writer: ImageWriterPool=None,
+            project_index: ProjectIndex=None,
+            annotation_repo: AnnotationRepository=None,
             parent=None
         ):
 
@@ -29,23 +37,40 @@ class object_detector():
         self.my_annotator = my_annotator
         self.my_video = my_video
         self.my_parent = parent
+        self.image_writer = image_writer if image_writer is not None else ImageWriterPool(parent=self.my_parent)
+        # Listings of the project folder come from the index, which follows the disk through a file watcher
+        self.project_index = project_index
+        # Labels are read and written through the project's repository (label files or database)
+        if annotation_repo is None:
+            annotation_repo = open_annotation_repository(self.project_data, project_index, parent=self.my_parent)
+        self.annotation_repo = annotation_repo
 
-        self.capture_timer = QTimer(self.my_parent)
-        self.capture_timer.setInterval(200)  # 0.2 seconds
-        self.capture_timer.timeout.connect(self.take_shot)
+        self.init_shot_taking()
 
         self.ui = parentui
-        self.ui.pushButtonTakeShotsOD.pressed.connect(self.start_taking_shots)
-        self.ui.pushButtonTakeShotsOD.released.connect(self.stop_taking_shots)
-        self.ui.pushButtonTakeShotsOD.clicked.connect(self.take_shot)
-
-        self.ui.pushButtonImpotrOD.clicked.connect(self.import_images)
-
-        self.ui.pushButtonAnnotateOD.clicked.connect(self.start_annotation)
-        self.ui.pushButtonMakeDatasetOD.clicked.connect(self.make_object_detection_dataset)
+        self.file_model = self.ui.tableViewFilesOD.model().sourceModel()
+        # The buttons outlive this object; close() disconnects them when another project is opened
+        self.ui_connections = [
+            (self.ui.pushButtonTakeShotsOD.pressed, self.start_taking_shots),
+            (self.ui.pushButtonTakeShotsOD.released, self.stop_taking_shots),
+            (self.ui.pushButtonImpotrOD.clicked, self.import_images),
+            (self.ui.pushButtonAnnotateOD.clicked, self.start_annotation),
+            (self.ui.pushButtonMakeDatasetOD.clicked, self.make_object_detection_dataset),
+        ]
+        for signal, slot in self.ui_connections:
+            signal.connect(slot)
+
+    def close(self):
+        """Detaches from the project page before the project's repository is closed."""
+        for signal, slot in self.ui_connections:
+            signal.disconnect(slot)
+        self.ui_connections = []
+        self.file_model.follow_index(None)
 
     def make_object_detection_dataset(self):
         dataset_dialog = make_dataset_dialog(project_data=self.project_data,
+                                             project_index=self.project_index,
+                                             annotation_repo=self.annotation_repo,
                                              parent=self.my_parent)
         dataset_dialog.exec()        
 
@@ -54,6 +79,8 @@ class object_detector():
             project_data=self.project_data,
             detection_type="OD",
             annotation_type=AnnotationWidget.DRAW_RECTANGLE,
+            file_model=self.file_model,
+            annotation_repo=self.annotation_repo,
             parent=self.my_parent
         )
         my_annotate_dialog.exec()
@@ -75,54 +102,19 @@ class object_detector():
             )
 
             if file_paths:
+                imported = []
                 for file_path in file_paths:
                     try:
                         shutil.copy(file_path, data_dir)
+                        imported.append(os.path.basename(file_path))
                     except shutil.Error as e:
                         print(f"Error copying file: {e}")
                 
-                self.update_file_list()
-
-    def start_taking_shots(self):
-        self.capture_timer.start()
-
-    def stop_taking_shots(self):
-        self.capture_timer.stop()
-
-    def take_shot(self):
-        if self.project_data and self.my_annotator:
-            data_dir = f"{self.project_data.get('directory')}/data"
-            try:
-                os.makedirs(data_dir, exist_ok=True)
-                print(f"Folder '{data_dir}' ensured to exist.")
-            except OSError as e:
-                print(f"Error creating folder '{data_dir}': {e}")
-
-            if data_dir and os.path.exists(data_dir):
-                pixmap = self.my_annotator.current_pixmap
-                # timestamp = int(time.time() * 1000)
-                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-                file_path = os.path.join(data_dir, f"shot_{timestamp}.jpg")
-                pixmap.save(file_path, "JPG")
-                print(f"Image saved to {file_path}")
-                self.update_file_list()
+                self.file_model.add_files(imported)
 
     def update_file_list(self):
-        if self.project_data:
-            data_dir = f"{self.project_data.get('directory')}/data"
-            try:
-                os.makedirs(data_dir, exist_ok=True)
-                print(f"Folder '{data_dir}' ensured to exist.")
-            except OSError as e:
-                print(f"Error creating folder '{data_dir}': {e}")
-
-            if data_dir and os.path.exists(data_dir):
-                files = sorted([f for f in os.listdir(data_dir) if f.endswith(('.png', '.jpg', '.jpeg'))])
-                self.ui.tableWidgetFilesOD.setRowCount(len(files))
-                self.ui.tableWidgetFilesOD.setColumnCount(2)
-                self.ui.tableWidgetFilesOD.setHorizontalHeaderLabels(["File Name", "Class"])
-                self.ui.tableWidgetFilesOD.setColumnWidth(0, 250)
-                self.ui.tableWidgetFilesOD.setColumnWidth(1, 60)
-                for row, file_name in enumerate(files):
-                    self.ui.tableWidgetFilesOD.setItem(row, 0, QTableWidgetItem(file_name))
-                    self.ui.tableWidgetFilesOD.setItem(row, 1, QTableWidgetItem(""))
+        """Rescans the project's data folder into the file list."""
+        data_dir = self.get_data_dir()
+        if data_dir:
+            self.file_model.set_files(*scan_project_files(data_dir, self.project_index, self.annotation_repo))
+            self.file_model.follow_index(self.project_index)
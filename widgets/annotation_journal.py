@@ -0,0 +1,102 @@
+# widgets/annotation_journal.py
+
+import json
+import os
+import threading
+
+
+class AnnotationJournal():
+    """
+    Append-only log of annotation edits, one JSON record per line.
+
+    An edit costs one small append instead of rewriting annotation_info.json or
+    a label file, which matters on slow, network-synced project folders. Lines
+    are flushed to the OS at once, so an application crash loses nothing; a
+    line cut short by a crash is skipped on replay.
+
+    Compaction folds the journal into the label files:
+      1. rotate() renames the journal to <journal>.compacting and starts a new
+         one, so edits can go on while the files are written,
+      2. the owner writes the label files,
+      3. discard() removes the rotated journal.
+    If the application stops between 1 and 3, the next rotate() keeps the
+    older records, and replay covers both files, oldest first.
+    """
+
+    def __init__(self, path:str):
+        self.path = path
+        self.compacting_path = path + ".compacting"
+        self.records = 0   # records appended since the last rotate()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def append(self, record:dict):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.records += 1
+
+    def read_records(self) -> list:
+        """The records of the rotated and the current journal, oldest first."""
+        records = []
+        with self._lock:
+            self._file.flush()
+            for path in (self.compacting_path, self.path):
+                if os.path.exists(path):
+                    records.extend(self._read_file(path))
+        return records
+
+    def rotate(self):
+        """
+        Moves the records written so far aside and starts an empty journal.
+
+        Returns:
+            str | None: Path of the rotated journal, None if there was nothing to rotate.
+        """
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            try:
+                if os.path.getsize(self.path) == 0 and not os.path.exists(self.compacting_path):
+                    return None
+                if os.path.exists(self.compacting_path):
+                    # A previous compaction did not finish; keep its records in front of the new ones
+                    with open(self.path, 'r', encoding='utf-8') as src, open(self.compacting_path, 'a', encoding='utf-8') as dst:
+                        dst.write(src.read())
+                    os.remove(self.path)
+                else:
+                    os.replace(self.path, self.compacting_path)
+                return self.compacting_path
+            finally:
+                self._file = open(self.path, 'a', encoding='utf-8')
+                self.records = 0
+
+    def discard(self, rotated_path:str):
+        """Removes a rotated journal once its records are in the label files."""
+        try:
+            os.remove(rotated_path)
+        except OSError as e:
+            print(f"Error removing journal '{rotated_path}': {e}")
+
+    def close(self):
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    @staticmethod
+    def _read_file(path:str) -> list:
+        records = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    print(f"Warning: Skipping damaged journal line in '{path}'.")
+        return records
@@ -1,6 +1,7 @@
 # functionLib/annotation_manager.py
 
 import sys
+import time
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame
 from PySide6.QtGui import QPixmap, QImage, QPainter, QPen, QMouseEvent, QColor, QCursor, QFont
 from PySide6.QtCore import Qt, Signal, Slot, QPoint, QPointF, QRect, QSize, QLineF, QRectF
@@ -20,6 +21,7 @@ class AnnotationWidget(QLabel):
     annotation_added = Signal(object, str) # Emits dict {'type': '...', 'rect': QRect, 'class': '...'}
     annotation_cleared = Signal(str)
     annotation_selected = Signal(int, str) # 새 시그널: 어노테이션 선택 시 해당 인덱스 방출
+    display_size_changed = Signal(int, int) # 위젯 크기 변경 시 (width, height) 방출
     # annotation_removed = Signal(object) # 제거된 어노테이션 데이터를 전달할 수 있음
 
     def __init__(self, parent=None, get_current_selected_class_text_func=None):
@@ -75,25 +77,42 @@ class AnnotationWidget(QLabel):
         self.selected_annotation_index = -1 # 선택된 어노테이션의 인덱스 (없으면 -1)
         # ------------------------------------
 
-    @Slot(QImage)
-    def update_image(self, q_image:QImage=None, q_dimage:QImage=None, results:object=None, is_still_image=False):
+        # --- 지연 시간 측정 / HUD ---
+        self.show_hud = False
+        self._pipeline_timer = None   # 마지막 프레임과 함께 전달된 PipelineTimer
+        self._pending_capture_time = None
+        self._hud_text = ""
+        self._hud_updated_at = 0.0
+        # ---------------------------
+
+        # --- 추론 결과 오버레이 (CompactResults) ---
+        self.current_results = None
+        self.show_inference_overlay = True
+        # ------------------------------------------
+
+    @Slot(QImage, QImage, object, bool, object)
+    def update_image(self, q_image:QImage=None, q_dimage:QImage=None, results:object=None, is_still_image=False, frame_info:dict=None):
         if self.is_video_mode or is_still_image:
             """
             Updates the QLabel with a new QImage frame.
             Stores the original QImage as QPixmap for drawing consistency.
+            frame_info (set by VideoStreamer while profiling) carries the capture/emit
+            timestamps used to measure the signal hop and the capture-to-paint latency.
             """
+            if frame_info:
+                timer = frame_info["timer"]
+                timer.record("signal_hop", (time.perf_counter() - frame_info["t_emit"]) * 1000.0)
+                self._pipeline_timer = timer
+                self._pending_capture_time = frame_info["t_capture"]
+
             self.current_pixmap = QPixmap.fromImage(q_image)
             self.current_d_pixmap = None
 
             if q_dimage:
                 self.current_d_pixmap = QPixmap.fromImage(q_dimage)
-                self.setPixmap(self.current_d_pixmap.scaled(
-                    self.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
-                ))
+                self.setPixmap(self._fit_pixmap(self.current_d_pixmap, is_still_image))
             else:
-                self.setPixmap(self.current_pixmap.scaled(
-                    self.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
-                ))
+                self.setPixmap(self._fit_pixmap(self.current_pixmap, is_still_image))
 
             self.current_results = results
             self.update_image_properties()
@@ -103,6 +122,102 @@ class AnnotationWidget(QLabel):
             self.is_video_mode = not is_still_image
 
 
+    def _fit_pixmap(self, pixmap:QPixmap, smooth:bool=True) -> QPixmap:
+        """
+        Returns `pixmap` scaled to fit the widget. Video frames arrive already scaled to
+        the widget size by the VideoStreamer and are returned as they are; a frame that
+        was planned before a resize is scaled with the fast filter until the next one arrives.
+        """
+        size = pixmap.size()
+        fits = size.width() <= self.width() and size.height() <= self.height()
+        if fits and (size.width() == self.width() or size.height() == self.height()):
+            return pixmap
+        mode = Qt.TransformationMode.SmoothTransformation if smooth else Qt.TransformationMode.FastTransformation
+        return pixmap.scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio, mode)
+
+    def _get_class_color(self, class_name:str) -> QColor:
+        """클래스 이름별로 팔레트 색상을 하나씩 할당하여 반환합니다."""
+        if class_name not in self._generated_class_colors:
+            self._generated_class_colors[class_name] = self._color_palette[self._color_index]
+            self._color_index = (self._color_index + 1) % len(self._color_palette)
+        return self._generated_class_colors[class_name]
+
+    def set_inference_overlay_visible(self, visible:bool):
+        """Shows or hides the inference overlay; the results themselves are kept."""
+        self.show_inference_overlay = visible
+        self.update()
+
+    def _draw_inference_overlay(self, painter:QPainter):
+        """
+        Draws CompactResults over the displayed image: boxes with class/confidence labels
+        for detection, and the top-1 class for classification. Box coordinates are
+        normalized, so they map directly onto _image_draw_rect.
+        """
+        results = self.current_results
+        rect = self._image_draw_rect
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        font = QFont("Arial", 11)
+        font.setBold(True)
+        painter.setFont(font)
+        metrics = painter.fontMetrics()
+
+        for x1, y1, x2, y2, class_id, conf in results.boxes:
+            class_name = results.class_name(class_id)
+            color = self._get_class_color(class_name)
+            box = QRectF(rect.x() + x1 * rect.width(), rect.y() + y1 * rect.height(),
+                         (x2 - x1) * rect.width(), (y2 - y1) * rect.height())
+            painter.setPen(QPen(color, 2))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawRect(box)
+
+            label = f"{class_name} {conf:.2f}"
+            label_rect = QRectF(box.x(), box.y() - metrics.height(), metrics.horizontalAdvance(label) + 6, metrics.height())
+            if label_rect.top() < rect.top(): # 이미지 위쪽을 벗어나면 박스 안쪽에 표시
+                label_rect.moveTop(box.y())
+            painter.fillRect(label_rect, color)
+            painter.setPen(QColor(255, 255, 255))
+            painter.drawText(label_rect, Qt.AlignmentFlag.AlignCenter, label)
+
+        if results.top1 is not None:
+            label = f"{results.top1_name} {results.top1conf * 100:.1f} %"
+            label_rect = QRectF(rect.x() + 8, rect.y() + 8, metrics.horizontalAdvance(label) + 12, metrics.height() + 6)
+            painter.fillRect(label_rect, QColor(0, 0, 0, 160))
+            painter.setPen(QColor(255, 255, 255))
+            painter.drawText(label_rect, Qt.AlignmentFlag.AlignCenter, label)
+
+        painter.restore()
+
+    def set_hud_visible(self, visible:bool):
+        """Shows or hides the latency HUD drawn over the live image."""
+        self.show_hud = visible
+        self._hud_text = ""
+        self.update()
+
+    def _draw_hud(self, painter:QPainter):
+        if self._pipeline_timer is None:
+            return
+
+        # 퍼센타일 계산은 0.5초마다 한 번만
+        now = time.perf_counter()
+        if now - self._hud_updated_at > 0.5 or not self._hud_text:
+            self._hud_text = self._pipeline_timer.format_stats()
+            self._hud_updated_at = now
+
+        painter.save()
+        font = QFont("Courier New", 9)
+        painter.setFont(font)
+        lines = self._hud_text.split("\n")
+        line_height = painter.fontMetrics().height()
+        text_width = max(painter.fontMetrics().horizontalAdvance(line) for line in lines)
+        hud_rect = QRect(8, 8, text_width + 12, line_height * len(lines) + 8)
+        painter.fillRect(hud_rect, QColor(0, 0, 0, 160))
+        painter.setPen(QColor(0, 255, 0))
+        for i, line in enumerate(lines):
+            painter.drawText(hud_rect.x() + 6, hud_rect.y() + 4 + line_height * (i + 1) - painter.fontMetrics().descent(), line)
+        painter.restore()
+
     def update_image_properties(self):
         """
         Calculates the actual scaled size and offset of the displayed image
@@ -302,6 +417,7 @@ class AnnotationWidget(QLabel):
     def resizeEvent(self, event):
         """리사이즈 이벤트를 처리하여 픽스맵을 다시 스케일링하고 속성을 재계산합니다."""
         super().resizeEvent(event)
+        self.display_size_changed.emit(self.width(), self.height())
         if not self.current_pixmap.isNull():
             self.setPixmap(self.current_pixmap.scaled(
                 self.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
@@ -312,10 +428,23 @@ class AnnotationWidget(QLabel):
     def paintEvent(self, event):
         super().paintEvent(event)
 
+        if self._pending_capture_time is not None:
+            self._pipeline_timer.record("end_to_end", (time.perf_counter() - self._pending_capture_time) * 1000.0)
+            self._pending_capture_time = None
+
         if self.current_pixmap.isNull():
             return
 
         painter = QPainter(self)
+        if self.is_video_mode:
+            if self.show_inference_overlay and self.current_results is not None:
+                started = time.perf_counter()
+                self._draw_inference_overlay(painter)
+                if self._pipeline_timer is not None and self._pipeline_timer.enabled:
+                    self._pipeline_timer.record("overlay", (time.perf_counter() - started) * 1000.0)
+            if self.show_hud:
+                self._draw_hud(painter)
+
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
         displayed_pixmap = self.pixmap()
@@ -338,11 +467,7 @@ class AnnotationWidget(QLabel):
             # 어노테이션의 클래스에 따라 펜 색상 설정
             annotation_class = annotation.get('class', 'default_class')
 
-            if annotation_class not in self._generated_class_colors:
-                self._generated_class_colors[annotation_class] = self._color_palette[self._color_index]
-                self._color_index = (self._color_index + 1) % len(self._color_palette)
-
-            pen_color = self._generated_class_colors[annotation_class]
+            pen_color = self._get_class_color(annotation_class)
             
             # --- 선택된 어노테이션 하이라이트 ---
             if i == self.selected_annotation_index:
@@ -0,0 +1,607 @@
+# widgets/annotation_repository.py
+
+import json
+import os
+import sqlite3
+import threading
+
+from PySide6.QtCore import QTimer
+
+from widgets.annotation_store import AnnotationStore
+from widgets.annotation_journal import AnnotationJournal
+from widgets.project_index import ProjectIndex, IMAGE_EXTENSIONS
+
+
+# A detection box is (class name, left, top, width, height), coordinates relative to the image size.
+# In the data folder the boxes of <stem>.<ext> are kept in <stem>.txt, one "class left top width height" per line.
+
+def read_box_file(file_path:str) -> list:
+    """Reads the boxes of a detection label file. Malformed lines are skipped."""
+    boxes = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            if len(parts) != 5:
+                print(f"Warning: Malformed line in {file_path}: '{line.strip()}'")
+                continue
+            try:
+                boxes.append((parts[0], *map(float, parts[1:])))
+            except ValueError:
+                print(f"Warning: Malformed line in {file_path}: '{line.strip()}'")
+    return boxes
+
+
+def write_box_file(file_path:str, boxes:list):
+    """Writes boxes as a detection label file."""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(f"{cls} {x} {y} {w} {h}" for cls, x, y, w, h in boxes))
+
+
+def label_file_name(image_name:str) -> str:
+    return os.path.splitext(image_name)[0] + ".txt"
+
+
+def read_class_list(file_path:str) -> list:
+    """Reads a class list file (classes.lst), one class name per line."""
+    if not os.path.exists(file_path):
+        return []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def write_class_list(file_path:str, classes:list):
+    with open(file_path, 'w', encoding='utf-8') as f:
+        for class_name in classes:
+            f.write(class_name + '\n')
+
+
+class AnnotationRepository():
+    """
+    Common interface to the labels of a project, whatever stores them.
+
+    Classification: one class per image (get_class/set_class/class_labels).
+    Detection: a list of boxes per image (get_boxes/set_boxes/box_labels). An image
+    with an empty box list counts as annotated, like an empty label file.
+
+    Images are identified by their file name in the data folder. The ordered
+    list of class names (data/classes.lst) is shared by every backend, since the
+    dataset builders derive class ids from it.
+    """
+    backend = None
+    data_dir = None
+
+    # --- Classification ---
+
+    def get_class(self, name:str):
+        raise NotImplementedError
+
+    def set_class(self, name:str, class_name:str=None):
+        """Sets (or with None, removes) the class of an image."""
+        raise NotImplementedError
+
+    def clear_classes(self):
+        raise NotImplementedError
+
+    def class_labels(self) -> dict:
+        """{image name: class name} of every classified image."""
+        raise NotImplementedError
+
+    def images_of_class(self, class_name:str) -> list:
+        return sorted(name for name, cls in self.class_labels().items() if cls == class_name)
+
+    # --- Detection ---
+
+    def get_boxes(self, name:str) -> list:
+        raise NotImplementedError
+
+    def set_boxes(self, name:str, boxes:list):
+        raise NotImplementedError
+
+    def box_labels(self) -> dict:
+        """{image name: boxes} of every annotated image."""
+        raise NotImplementedError
+
+    def has_boxes(self, name:str) -> bool:
+        return name in self.annotated_images()
+
+    def annotated_images(self) -> set:
+        """Names of the images that have boxes, without reading the boxes where possible."""
+        return set(self.box_labels())
+
+    # --- Both ---
+
+    def delete_labels(self, names) -> int:
+        """Removes the class and the boxes of `names`, e.g. when the images are deleted. Returns how many had a class."""
+        raise NotImplementedError
+
+    def unlabeled_images(self, names) -> list:
+        """The images of `names` that have neither a class nor boxes."""
+        labeled = set(self.class_labels()) | self.annotated_images()
+        return [name for name in names if name not in labeled]
+
+    def get_class_list(self) -> list:
+        return read_class_list(os.path.join(self.data_dir, "classes.lst"))
+
+    def set_class_list(self, classes:list):
+        os.makedirs(self.data_dir, exist_ok=True)
+        write_class_list(os.path.join(self.data_dir, "classes.lst"), classes)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class FileAnnotationRepository(AnnotationRepository):
+    """The project folder files: data/annotation_info.json for classes and data/<stem>.txt for boxes."""
+    backend = "files"
+
+    def __init__(self, data_dir:str, project_index:ProjectIndex=None, parent=None, auto_flush:bool=True):
+        self.data_dir = data_dir
+        self.project_index = project_index
+        self.store = AnnotationStore(os.path.join(data_dir, "annotation_info.json"), auto_flush=auto_flush, parent=parent)
+
+    def get_class(self, name:str):
+        return self.store.get(name)
+
+    def set_class(self, name:str, class_name:str=None):
+        if class_name:
+            self.store.set(name, class_name)
+        else:
+            self.store.delete(name)
+
+    def clear_classes(self):
+        self.store.clear()
+        self.store.flush()
+
+    def class_labels(self) -> dict:
+        return self.store.as_dict()
+
+    def get_boxes(self, name:str) -> list:
+        label_path = os.path.join(self.data_dir, label_file_name(name))
+        if not os.path.exists(label_path):
+            return []
+        return read_box_file(label_path)
+
+    def set_boxes(self, name:str, boxes:list):
+        write_box_file(os.path.join(self.data_dir, label_file_name(name)), boxes)
+
+    def has_boxes(self, name:str) -> bool:
+        return os.path.exists(os.path.join(self.data_dir, label_file_name(name)))
+
+    def annotated_images(self) -> set:
+        if self.project_index is not None:
+            return self.project_index.annotated_images()
+        if not os.path.isdir(self.data_dir):
+            return set()
+        files = os.listdir(self.data_dir)
+        label_stems = {os.path.splitext(f)[0] for f in files if f.endswith(".txt")}
+        return {f for f in files if f.lower().endswith(IMAGE_EXTENSIONS) and os.path.splitext(f)[0] in label_stems}
+
+    def box_labels(self) -> dict:
+        labels = {}
+        for name in sorted(self.annotated_images()):
+            try:
+                labels[name] = read_box_file(os.path.join(self.data_dir, label_file_name(name)))
+            except OSError as e:
+                print(f"Error reading labels of '{name}': {e}")
+        return labels
+
+    def delete_labels(self, names) -> int:
+        names = list(names)
+        for name in names:
+            label_path = os.path.join(self.data_dir, label_file_name(name))
+            if os.path.exists(label_path):
+                try:
+                    os.remove(label_path)
+                except OSError as e:
+                    print(f"Error deleting '{label_path}': {e}")
+        return self.store.delete_many(names)
+
+    def flush(self):
+        self.store.flush()
+
+    def close(self):
+        self.store.close()
+        self.store.deleteLater()
+
+
+class JournaledAnnotationRepository(FileAnnotationRepository):
+    """
+    The label files of FileAnnotationRepository, with edits going to an append-only
+    journal (data/.annotations.journal) instead of rewriting the files on each click.
+
+    Edits are applied in memory and appended to the journal. A compactor folds the
+    journal into the label files (annotation_info.json, <stem>.txt, classes.lst) on
+    a background thread every COMPACT_INTERVAL_MS, after COMPACT_RECORDS edits, and
+    synchronously on flush()/close(). On open, the journal left by a previous run is
+    replayed on top of the label files and compacted.
+
+    Records: {"op": "class", "image", "class"}, {"op": "boxes", "image", "boxes"},
+    {"op": "delete", "images"}, {"op": "clear_classes"}, {"op": "class_list", "classes"}.
+    """
+    backend = "files"
+    JOURNAL_FILE = ".annotations.journal"
+    COMPACT_INTERVAL_MS = 30000
+    COMPACT_RECORDS = 500
+
+    def __init__(self, data_dir:str, project_index:ProjectIndex=None, parent=None):
+        super().__init__(data_dir, project_index, parent=parent, auto_flush=False)
+
+        # Edits not in the label files yet: image name -> boxes (None: label file removed)
+        self._boxes = {}
+        self._class_list = None
+        self._lock = threading.Lock()
+        self._compactor = None
+
+        self.journal = AnnotationJournal(os.path.join(data_dir, self.JOURNAL_FILE))
+        records = self.journal.read_records()
+        for record in records:
+            self._apply(record)
+        if records:
+            print(f"Replayed {len(records)} annotation journal records.")
+            self.compact()
+
+        self._compact_timer = QTimer(parent)
+        self._compact_timer.setInterval(self.COMPACT_INTERVAL_MS)
+        self._compact_timer.timeout.connect(self.compact)
+        self._compact_timer.start()
+
+    # --- Edits ---
+
+    def set_class(self, name:str, class_name:str=None):
+        self._record({"op": "class", "image": name, "class": class_name or None})
+
+    def clear_classes(self):
+        self._record({"op": "clear_classes"})
+
+    def set_boxes(self, name:str, boxes:list):
+        self._record({"op": "boxes", "image": name, "boxes": [list(box) for box in boxes]})
+
+    def delete_labels(self, names) -> int:
+        names = list(names)
+        classified = sum(1 for name in names if name in self.store)
+        self._record({"op": "delete", "images": names})
+        return classified
+
+    def set_class_list(self, classes:list):
+        self._record({"op": "class_list", "classes": list(classes)})
+
+    # --- Queries that see edits not compacted yet ---
+
+    def get_boxes(self, name:str) -> list:
+        with self._lock:
+            if name in self._boxes:
+                return list(self._boxes[name] or [])
+        return super().get_boxes(name)
+
+    def has_boxes(self, name:str) -> bool:
+        with self._lock:
+            if name in self._boxes:
+                return self._boxes[name] is not None
+        return super().has_boxes(name)
+
+    def annotated_images(self) -> set:
+        annotated = super().annotated_images()
+        with self._lock:
+            for name, boxes in self._boxes.items():
+                if boxes is None:
+                    annotated.discard(name)
+                else:
+                    annotated.add(name)
+        return annotated
+
+    def box_labels(self) -> dict:
+        return {name: self.get_boxes(name) for name in sorted(self.annotated_images())}
+
+    def get_class_list(self) -> list:
+        with self._lock:
+            if self._class_list is not None:
+                return list(self._class_list)
+        return super().get_class_list()
+
+    # --- Compaction ---
+
+    def compact(self, wait:bool=False):
+        """Folds the journal into the label files, on a background thread unless `wait`."""
+        if self._compactor is not None:
+            if not wait and self._compactor.is_alive():
+                return
+            self._compactor.join()
+            self._compactor = None
+
+        rotated_path = self.journal.rotate()
+        if rotated_path is None:
+            return
+
+        # Snapshot on this thread; edits made while the files are written go to the new journal
+        with self._lock:
+            labels = self.store.as_dict()
+            boxes = dict(self._boxes)
+            class_list = self._class_list
+
+        if wait:
+            self._write_files(rotated_path, labels, boxes, class_list)
+        else:
+            self._compactor = threading.Thread(target=self._write_files,
+                                               args=(rotated_path, labels, boxes, class_list),
+                                               name="AnnotationCompactor", daemon=True)
+            self._compactor.start()
+
+    def flush(self):
+        self.compact(wait=True)
+
+    def close(self):
+        self._compact_timer.stop()
+        self.compact(wait=True)
+        self.journal.close()
+        self.store.deleteLater()
+
+    def _write_files(self, rotated_path:str, labels:dict, boxes:dict, class_list):
+        try:
+            AnnotationStore.write_labels(self.store.file_path, labels)
+            for name, image_boxes in boxes.items():
+                label_path = os.path.join(self.data_dir, label_file_name(name))
+                if image_boxes is not None:
+                    write_box_file(label_path, image_boxes)
+                elif os.path.exists(label_path):
+                    os.remove(label_path)
+            if class_list is not None:
+                write_class_list(os.path.join(self.data_dir, "classes.lst"), class_list)
+        except OSError as e:
+            # The rotated journal stays and is folded in again by the next compaction
+            print(f"Error compacting annotation journal: {e}")
+            return
+
+        self.journal.discard(rotated_path)
+        with self._lock:
+            # Drop what is in the files now, unless it was edited again meanwhile
+            for name, image_boxes in boxes.items():
+                if name in self._boxes and self._boxes[name] is image_boxes:
+                    del self._boxes[name]
+            if self._class_list is class_list:
+                self._class_list = None
+        print(f"Compacted annotation journal: {len(labels)} class labels, {len(boxes)} label files.")
+
+    # --- Internals ---
+
+    def _record(self, record:dict):
+        self.journal.append(record)
+        self._apply(record)
+        if self.journal.records >= self.COMPACT_RECORDS:
+            self.compact()
+
+    def _apply(self, record:dict):
+        op = record.get("op")
+        with self._lock:
+            if op == "class":
+                if record.get("class"):
+                    self.store.set(record["image"], record["class"])
+                else:
+                    self.store.delete(record["image"])
+            elif op == "boxes":
+                self._boxes[record["image"]] = [tuple(box) for box in record["boxes"]]
+            elif op == "delete":
+                self.store.delete_many(record["images"])
+                for name in record["images"]:
+                    self._boxes[name] = None
+            elif op == "clear_classes":
+                self.store.clear()
+            elif op == "class_list":
+                self._class_list = list(record["classes"])
+            else:
+                print(f"Warning: Unknown annotation journal record {record}.")
+
+
+class SqliteAnnotationRepository(AnnotationRepository):
+    """
+    Labels in an SQLite database (<project>/.annotations.sqlite3).
+
+    Classes, class labels and boxes are indexed, so queries such as "all images
+    of class X" or "unlabeled images" do not read every label. Each change is
+    committed on its own; WAL mode keeps that cheap.
+
+    import_from_files() and export_to_files() convert from and to the files of
+    FileAnnotationRepository.
+    """
+    backend = "sqlite"
+    DB_FILE = ".annotations.sqlite3"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS classes (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS images (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            class_id INTEGER REFERENCES classes(id),
+            has_boxes INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS boxes (
+            id INTEGER PRIMARY KEY,
+            image_id INTEGER NOT NULL REFERENCES images(id) ON DELETE CASCADE,
+            class_id INTEGER NOT NULL REFERENCES classes(id),
+            x REAL NOT NULL, y REAL NOT NULL, w REAL NOT NULL, h REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS images_class ON images(class_id);
+        CREATE INDEX IF NOT EXISTS images_has_boxes ON images(has_boxes);
+        CREATE INDEX IF NOT EXISTS boxes_image ON boxes(image_id);
+        CREATE INDEX IF NOT EXISTS boxes_class ON boxes(class_id);
+    """
+
+    def __init__(self, db_path:str, data_dir:str):
+        self.db_path = db_path
+        self.data_dir = data_dir
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        with self.conn:
+            self.conn.executescript(self.SCHEMA)
+
+    # --- Classification ---
+
+    def get_class(self, name:str):
+        row = self.conn.execute(
+            "SELECT classes.name FROM images JOIN classes ON classes.id = images.class_id WHERE images.name = ?",
+            (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_class(self, name:str, class_name:str=None):
+        with self.conn:
+            image_id = self._image_id(name)
+            class_id = self._class_id(class_name) if class_name else None
+            self.conn.execute("UPDATE images SET class_id = ? WHERE id = ?", (class_id, image_id))
+
+    def clear_classes(self):
+        with self.conn:
+            self.conn.execute("UPDATE images SET class_id = NULL WHERE class_id IS NOT NULL")
+
+    def class_labels(self) -> dict:
+        return dict(self.conn.execute(
+            "SELECT images.name, classes.name FROM images JOIN classes ON classes.id = images.class_id"))
+
+    def images_of_class(self, class_name:str) -> list:
+        return [row[0] for row in self.conn.execute(
+            "SELECT images.name FROM images JOIN classes ON classes.id = images.class_id "
+            "WHERE classes.name = ? ORDER BY images.name", (class_name,))]
+
+    # --- Detection ---
+
+    def get_boxes(self, name:str) -> list:
+        return [tuple(row) for row in self.conn.execute(
+            "SELECT classes.name, x, y, w, h FROM boxes "
+            "JOIN images ON images.id = boxes.image_id JOIN classes ON classes.id = boxes.class_id "
+            "WHERE images.name = ? ORDER BY boxes.id", (name,))]
+
+    def set_boxes(self, name:str, boxes:list):
+        with self.conn:
+            image_id = self._image_id(name)
+            self.conn.execute("DELETE FROM boxes WHERE image_id = ?", (image_id,))
+            self.conn.executemany(
+                "INSERT INTO boxes (image_id, class_id, x, y, w, h) VALUES (?, ?, ?, ?, ?, ?)",
+                [(image_id, self._class_id(cls), x, y, w, h) for cls, x, y, w, h in boxes])
+            self.conn.execute("UPDATE images SET has_boxes = 1 WHERE id = ?", (image_id,))
+
+    def has_boxes(self, name:str) -> bool:
+        row = self.conn.execute("SELECT has_boxes FROM images WHERE name = ?", (name,)).fetchone()
+        return bool(row and row[0])
+
+    def annotated_images(self) -> set:
+        return {row[0] for row in self.conn.execute("SELECT name FROM images WHERE has_boxes = 1")}
+
+    def box_labels(self) -> dict:
+        labels = {row[0]: [] for row in self.conn.execute("SELECT name FROM images WHERE has_boxes = 1")}
+        for name, cls, x, y, w, h in self.conn.execute(
+                "SELECT images.name, classes.name, x, y, w, h FROM boxes "
+                "JOIN images ON images.id = boxes.image_id JOIN classes ON classes.id = boxes.class_id "
+                "ORDER BY boxes.id"):
+            labels[name].append((cls, x, y, w, h))
+        return labels
+
+    # --- Both ---
+
+    def delete_labels(self, names) -> int:
+        names = [(name,) for name in names]
+        with self.conn:
+            classified = sum(self.conn.execute(
+                "SELECT COUNT(*) FROM images WHERE name = ? AND class_id IS NOT NULL", name).fetchone()[0]
+                for name in names)
+            self.conn.executemany("DELETE FROM images WHERE name = ?", names)
+        return classified
+
+    def unlabeled_images(self, names) -> list:
+        labeled = {row[0] for row in self.conn.execute(
+            "SELECT name FROM images WHERE class_id IS NOT NULL OR has_boxes = 1")}
+        return [name for name in names if name not in labeled]
+
+    def close(self):
+        self.conn.close()
+
+    # --- Import / export ---
+
+    def import_from_files(self, data_dir:str, project_index:ProjectIndex=None):
+        """Replaces the content of the database with the labels in the files of `data_dir`, in one transaction."""
+        files = FileAnnotationRepository(data_dir, project_index)
+        class_labels = files.class_labels()
+        box_labels = files.box_labels()
+
+        with self.conn:
+            self.conn.execute("DELETE FROM boxes")
+            self.conn.execute("DELETE FROM images")
+            self.conn.executemany("INSERT OR IGNORE INTO images (name) VALUES (?)",
+                                  [(name,) for name in set(class_labels) | set(box_labels)])
+            self.conn.executemany("INSERT OR IGNORE INTO classes (name) VALUES (?)",
+                                  [(cls,) for cls in set(class_labels.values())])
+            self.conn.executemany(
+                "UPDATE images SET class_id = (SELECT id FROM classes WHERE name = ?) WHERE name = ?",
+                [(cls, name) for name, cls in class_labels.items()])
+            self.conn.executemany("UPDATE images SET has_boxes = 1 WHERE name = ?", [(name,) for name in box_labels])
+            for name, boxes in box_labels.items():
+                image_id = self._image_id(name)
+                self.conn.executemany(
+                    "INSERT INTO boxes (image_id, class_id, x, y, w, h) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(image_id, self._class_id(cls), x, y, w, h) for cls, x, y, w, h in boxes])
+
+        print(f"Imported {len(class_labels)} class labels and {len(box_labels)} label files into '{self.db_path}'.")
+
+    def export_to_files(self, data_dir:str):
+        """Writes the labels as annotation_info.json and <stem>.txt files into `data_dir`."""
+        os.makedirs(data_dir, exist_ok=True)
+        class_labels = self.class_labels()
+        annotation_info_path = os.path.join(data_dir, "annotation_info.json")
+        temp_path = annotation_info_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(class_labels, f, indent=4)
+        os.replace(temp_path, annotation_info_path)
+
+        box_labels = self.box_labels()
+        for name, boxes in box_labels.items():
+            write_box_file(os.path.join(data_dir, label_file_name(name)), boxes)
+
+        print(f"Exported {len(class_labels)} class labels and {len(box_labels)} label files to '{data_dir}'.")
+
+    # --- Internals ---
+
+    def _image_id(self, name:str) -> int:
+        self.conn.execute("INSERT OR IGNORE INTO images (name) VALUES (?)", (name,))
+        return self.conn.execute("SELECT id FROM images WHERE name = ?", (name,)).fetchone()[0]
+
+    def _class_id(self, class_name:str) -> int:
+        self.conn.execute("INSERT OR IGNORE INTO classes (name) VALUES (?)", (class_name,))
+        return self.conn.execute("SELECT id FROM classes WHERE name = ?", (class_name,)).fetchone()[0]
+
+
+def open_annotation_repository(project_data:dict, project_index:ProjectIndex=None, parent=None) -> AnnotationRepository:
+    """
+    Opens the label storage chosen by the project's "annotation_backend" entry:
+    "files" (default) or "sqlite". A new SQLite database is filled from the
+    existing label files. Edits to the label files go through a journal unless
+    the project sets "annotation_journal" to false.
+    """
+    project_dir = project_data.get("directory")
+    data_dir = os.path.join(project_dir, "data")
+    backend = project_data.get("annotation_backend", FileAnnotationRepository.backend)
+
+    if backend == SqliteAnnotationRepository.backend:
+        db_path = os.path.join(project_dir, SqliteAnnotationRepository.DB_FILE)
+        is_new = not os.path.exists(db_path)
+        try:
+            os.makedirs(project_dir, exist_ok=True)
+            repository = SqliteAnnotationRepository(db_path, data_dir)
+        except sqlite3.Error as e:
+            print(f"Error opening annotation database '{db_path}': {e}. Using the label files instead.")
+        else:
+            if is_new:
+                repository.import_from_files(data_dir, project_index)
+            return repository
+    elif backend != FileAnnotationRepository.backend:
+        print(f"Warning: Unknown annotation backend '{backend}'. Using the label files.")
+
+    if project_data.get("annotation_journal", True):
+        return JournaledAnnotationRepository(data_dir, project_index, parent=parent)
+    return FileAnnotationRepository(data_dir, project_index, parent=parent)
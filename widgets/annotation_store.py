@@ -0,0 +1,167 @@
+# widgets/annotation_store.py
+
+import json
+import os
+import time
+
+from PySide6.QtCore import QObject, QTimer
+
+
+class AnnotationStore(QObject):
+    """
+    Classification labels of a project ({image file name: class name}) kept in memory.
+
+    The labels file (data/annotation_info.json) is read once. get() and set()
+    only touch a dict; changes are written back in one go:
+      - FLUSH_DELAY_MS after the last change (debounce),
+      - at the latest CHECKPOINT_SECONDS after the first unsaved change, or
+        after CHECKPOINT_CHANGES changes, so continuous labeling is never more
+        than a checkpoint away from the disk,
+      - when flush() or close() is called, e.g. when the annotation dialog closes.
+
+    Every write goes to a temporary file that is synced and then renamed over
+    the labels file, so a crash mid-write leaves the previous version intact.
+
+    With auto_flush=False nothing is written until flush() is called; the owner
+    then takes care of persistence (see JournaledAnnotationRepository).
+    """
+
+    FLUSH_DELAY_MS = 1000
+    CHECKPOINT_SECONDS = 10.0
+    CHECKPOINT_CHANGES = 100
+
+    def __init__(self, file_path:str, auto_flush:bool=True, parent=None):
+        super().__init__(parent)
+
+        self.file_path = file_path
+        self.auto_flush = auto_flush
+        self._labels = {}
+        self._unsaved_changes = 0
+        self._unsaved_since = None
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_DELAY_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+        self.load()
+
+    # --- Queries ---
+
+    def get(self, name:str, default=None):
+        return self._labels.get(name, default)
+
+    def __contains__(self, name:str) -> bool:
+        return name in self._labels
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def as_dict(self) -> dict:
+        """Returns a copy of all labels."""
+        return dict(self._labels)
+
+    @property
+    def has_unsaved_changes(self) -> bool:
+        return self._unsaved_changes > 0
+
+    # --- Updates ---
+
+    def set(self, name:str, class_name:str):
+        if self._labels.get(name) != class_name:
+            self._labels[name] = class_name
+            self._changed()
+
+    def delete(self, name:str) -> bool:
+        """Removes the label of `name`. Returns False if it had none."""
+        if self._labels.pop(name, None) is None:
+            return False
+        self._changed()
+        return True
+
+    def delete_many(self, names) -> int:
+        """Removes the labels of `names`. Returns how many were removed."""
+        removed = sum(1 for name in names if self._labels.pop(name, None) is not None)
+        if removed:
+            self._changed(removed)
+        return removed
+
+    def clear(self):
+        if self._labels:
+            self._labels.clear()
+            self._changed()
+
+    # --- Persistence ---
+
+    def load(self):
+        """(Re)reads the labels file, dropping unsaved changes."""
+        self._flush_timer.stop()
+        self._labels = {}
+        self._unsaved_changes = 0
+        self._unsaved_since = None
+        if not os.path.exists(self.file_path):
+            return
+
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f) if os.path.getsize(self.file_path) else {}
+        except (OSError, json.JSONDecodeError) as e:
+            # Keep the damaged file for inspection instead of overwriting it on the next flush
+            backup_path = f"{self.file_path}.corrupt-{time.strftime('%Y%m%d_%H%M%S')}"
+            print(f"Warning: Cannot read '{self.file_path}' ({e}), moved to '{backup_path}'.")
+            try:
+                os.replace(self.file_path, backup_path)
+            except OSError:
+                pass
+            return
+
+        if isinstance(data, dict):
+            self._labels = data
+        else:
+            print(f"Warning: JSON content of '{self.file_path}' is not a dictionary. Starting with no labels.")
+
+    def flush(self) -> bool:
+        """Writes unsaved changes now. Returns False if writing failed (the changes stay unsaved)."""
+        self._flush_timer.stop()
+        if not self._unsaved_changes:
+            return True
+
+        try:
+            self.write_labels(self.file_path, self._labels)
+        except OSError as e:
+            print(f"Error writing '{self.file_path}': {e}")
+            self._flush_timer.start() # try again later
+            return False
+
+        print(f"Saved {len(self._labels)} labels ({self._unsaved_changes} changes) to '{self.file_path}'.")
+        self._unsaved_changes = 0
+        self._unsaved_since = None
+        return True
+
+    def close(self):
+        self.flush()
+
+    @staticmethod
+    def write_labels(file_path:str, labels:dict):
+        """Writes `labels` to a synced temporary file and renames it over `file_path`."""
+        temp_path = f"{file_path}.tmp"
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(labels, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+
+    def _changed(self, count:int=1):
+        self._unsaved_changes += count
+        now = time.monotonic()
+        if self._unsaved_since is None:
+            self._unsaved_since = now
+        if not self.auto_flush:
+            return
+
+        if (self._unsaved_changes >= self.CHECKPOINT_CHANGES
+                or now - self._unsaved_since >= self.CHECKPOINT_SECONDS):
+            self.flush()
+        else:
+            self._flush_timer.start() # restarts the debounce
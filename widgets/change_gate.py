@@ -0,0 +1,94 @@
+# widgets/change_gate.py
+
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+class ChangeGate():
+    """
+    Cheap scene-change detector used to skip inference on frames that look
+    like the last inferred one.
+
+    Frames are reduced to a small grayscale thumbnail. A pixel counts as
+    changed when it differs from the reference thumbnail by more than
+    `pixel_threshold` gray levels, and the frame counts as changed when more
+    than `area_threshold` (a fraction) of its pixels changed. The reference is
+    only replaced when inference actually runs, so slow drifts still add up
+    and eventually trigger a new inference. `max_skip_seconds` forces one
+    anyway after a long static period.
+    """
+
+    def __init__(
+            self,
+            pixel_threshold:int=12,
+            area_threshold:float=0.01,
+            thumbnail_size:tuple=(64, 36),
+            max_skip_seconds:float=2.0,
+            enabled:bool=True
+        ):
+        self.pixel_threshold = pixel_threshold
+        self.area_threshold = area_threshold
+        self.thumbnail_size = thumbnail_size
+        self.max_skip_seconds = max_skip_seconds
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forgets the reference frame; the next frame is always treated as changed."""
+        with self._lock:
+            self._reference = None
+            self._reference_time = 0.0
+            self.checked_frames = 0
+            self.skipped_frames = 0
+
+    def invalidate(self):
+        """Forces inference on the next frame without clearing the counters (e.g. after a model swap)."""
+        with self._lock:
+            self._reference = None
+
+    def thumbnail(self, frame):
+        small = cv2.resize(frame, self.thumbnail_size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
+
+    def is_unchanged(self, frame) -> bool:
+        """
+        Returns True if `frame` is close enough to the last inferred frame to reuse its results.
+        Call mark_inferred() with the same frame when inference does run.
+        """
+        if not self.enabled:
+            return False
+
+        with self._lock:
+            self.checked_frames += 1
+            if self._reference is None:
+                return False
+            if self.max_skip_seconds and time.perf_counter() - self._reference_time > self.max_skip_seconds:
+                return False
+
+            diff = cv2.absdiff(self.thumbnail(frame), self._reference)
+            changed_ratio = np.count_nonzero(diff > self.pixel_threshold) / diff.size
+            if changed_ratio > self.area_threshold:
+                return False
+
+            self.skipped_frames += 1
+            return True
+
+    def mark_inferred(self, frame):
+        """Makes `frame` the reference the following frames are compared against."""
+        if not self.enabled:
+            return
+        thumbnail = self.thumbnail(frame)
+        with self._lock:
+            self._reference = thumbnail
+            self._reference_time = time.perf_counter()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"checked": self.checked_frames, "skipped": self.skipped_frames}
@@ -0,0 +1,181 @@
+# widgets/dataset_builder.py
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from PySide6.QtCore import QThread, Signal, Qt
+from PySide6.QtWidgets import QProgressDialog
+
+
+class BuildCancelled(Exception):
+    pass
+
+
+def run_tasks_inline(stage:str, items, func) -> list:
+    """Runs `func` on every item on the calling thread. Same contract as DatasetBuilder.run_tasks()."""
+    results = []
+    for item in items:
+        try:
+            results.append(func(item))
+        except Exception as e:
+            print(f"Error in {stage} for '{item}': {e}")
+    return results
+
+
+class DatasetBuilder(QThread):
+    """
+    Runs a dataset build off the GUI thread.
+
+    `plan(builder)` does the work on this thread and hands per-file work to
+    builder.run_tasks(), which spreads it over a thread pool with at most
+    `max_workers` tasks in flight. A failing task is recorded and the build
+    goes on; the errors are reported once in the summary instead of one
+    print per file.
+
+    cancel() stops handing out tasks; the running ones finish, then `cleanup()`
+    removes the partial output. The same happens when the plan raises.
+
+    Signals are delivered to the GUI thread; progress is throttled to
+    PROGRESS_INTERVAL seconds.
+    """
+    progress = Signal(str, int, int)    # stage, done, total
+    build_finished = Signal(str, str)   # "done" / "cancelled" / "failed", summary
+
+    PROGRESS_INTERVAL = 0.05
+    MAX_REPORTED_ERRORS = 10
+
+    def __init__(self, plan, cleanup=None, max_workers:int=None, parent=None):
+        super().__init__(parent)
+
+        self.plan = plan
+        self.cleanup = cleanup
+        # File copies and label conversions wait on disk I/O, so more threads than cores pay off
+        self.max_workers = max_workers or min(16, (os.cpu_count() or 2) * 2)
+        self.errors = []        # (stage, item, message)
+        self.messages = []
+        self.status = None
+        self._cancel_event = threading.Event()
+        self._last_progress = 0.0
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Raises BuildCancelled if cancel() was called; for the plan between steps."""
+        if self._cancel_event.is_set():
+            raise BuildCancelled()
+
+    def log(self, message:str):
+        """Adds a line to the summary."""
+        self.messages.append(message)
+
+    def run_tasks(self, stage:str, items, func) -> list:
+        """
+        Calls `func(item)` for every item on the thread pool.
+
+        Returns:
+            list: The results of the tasks that succeeded, in completion order.
+
+        Raises:
+            BuildCancelled: If the build was cancelled; the tasks already running have finished.
+        """
+        items = list(items)
+        total = len(items)
+        results = []
+        done = 0
+        self._report(stage, 0, total, force=True)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="DatasetBuild") as pool:
+            pending = {}
+            next_item = 0
+            while next_item < total or pending:
+                # Keep the queue short, so a cancel takes effect after the tasks in flight
+                while next_item < total and len(pending) < self.max_workers * 2 and not self.is_cancelled():
+                    item = items[next_item]
+                    pending[pool.submit(func, item)] = item
+                    next_item += 1
+                if not pending:
+                    break
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    item = pending.pop(future)
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        self.errors.append((stage, item, str(e)))
+                    done += 1
+                self._report(stage, done, total)
+
+        self._report(stage, done, total, force=True)
+        self.check_cancelled()
+        return results
+
+    def summary(self) -> str:
+        lines = list(self.messages)
+        if self.errors:
+            lines.append(f"{len(self.errors)} errors:")
+            lines += [f"  {stage}: '{item}': {message}" for stage, item, message in self.errors[:self.MAX_REPORTED_ERRORS]]
+            if len(self.errors) > self.MAX_REPORTED_ERRORS:
+                lines.append(f"  ... and {len(self.errors) - self.MAX_REPORTED_ERRORS} more")
+        return "\n".join(lines)
+
+    def run(self):
+        started = time.perf_counter()
+        try:
+            self.plan(self)
+            self.status = "done"
+        except BuildCancelled:
+            self.status = "cancelled"
+            self.log("Build cancelled, partial output removed.")
+        except Exception as e:
+            self.status = "failed"
+            self.log(f"Build failed: {e}")
+
+        if self.status != "done" and self.cleanup:
+            try:
+                self.cleanup()
+            except Exception as e:
+                self.log(f"Cleanup failed: {e}")
+
+        self.log(f"Finished in {time.perf_counter() - started:.1f} s.")
+        summary = self.summary()
+        print(summary)
+        self.build_finished.emit(self.status, summary)
+
+    def _report(self, stage:str, done:int, total:int, force:bool=False):
+        now = time.monotonic()
+        if force or now - self._last_progress >= self.PROGRESS_INTERVAL:
+            self._last_progress = now
+            self.progress.emit(stage, done, total)
+
+
+def start_dataset_build(builder:DatasetBuilder, title:str, parent=None) -> QProgressDialog:
+    """Starts `builder` with a window-modal progress dialog whose Cancel button cancels the build."""
+    dialog = QProgressDialog(title, "Cancel", 0, 0, parent)
+    dialog.setWindowTitle(title)
+    dialog.setWindowModality(Qt.WindowModality.WindowModal)
+    dialog.setMinimumDuration(300)
+    dialog.setAutoClose(False)
+    dialog.setAutoReset(False)
+
+    def on_progress(stage, done, total):
+        dialog.setLabelText(f"{stage}: {done} / {total}")
+        dialog.setMaximum(max(total, 1))
+        dialog.setValue(done)
+
+    def on_canceled():
+        dialog.setLabelText("Cancelling...")
+        builder.cancel()
+
+    builder.progress.connect(on_progress)
+    dialog.canceled.connect(on_canceled)
+    builder.build_finished.connect(lambda status, summary: dialog.close())
+    builder.finished.connect(builder.deleteLater)
+    builder.start()
+    return dialog
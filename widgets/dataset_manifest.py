@@ -0,0 +1,227 @@
+# widgets/dataset_manifest.py
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from widgets.file_materializer import FileMaterializer
+from widgets.dataset_builder import run_tasks_inline
+
+
+def file_digest(file_path:str) -> str:
+    """Content hash of a file (BLAKE2b, 128 bit)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DatasetManifest():
+    """
+    What a built dataset folder contains: for every image its size, mtime,
+    content hash, class and split.
+
+    Hashes are carried over from a previous manifest while size and mtime are
+    unchanged, so describing an unchanged dataset costs one stat() per file.
+    """
+    FILE_NAME = "manifest.json"
+    VERSION = 1
+
+    def __init__(self, entries:dict=None):
+        self.entries = entries or {} # image name -> {"size", "mtime_ns", "hash", "class", "split"}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def relative_path(name:str, entry:dict) -> str:
+        """Where an image lives in the built folder: <split>/<class>/<name>."""
+        return os.path.join(entry["split"], entry["class"], name)
+
+    @classmethod
+    def load(cls, file_path:str):
+        """Reads a manifest. A missing or unreadable one is empty."""
+        if not os.path.exists(file_path):
+            return cls()
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Ignoring dataset manifest '{file_path}': {e}")
+            return cls()
+        if not isinstance(data, dict) or data.get("version") != cls.VERSION:
+            return cls()
+        return cls(data.get("entries", {}))
+
+    def save(self, file_path:str):
+        temp_path = file_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": self.VERSION, "entries": self.entries}, f, indent=1)
+        os.replace(temp_path, file_path)
+
+    @classmethod
+    def from_splits(cls, splits:dict, source_folder:str, previous=None, run_tasks=run_tasks_inline):
+        """
+        Describes the dataset made of `splits` ({split: {image name: class}}).
+        New or modified files are hashed through `run_tasks` (e.g. DatasetBuilder.run_tasks).
+
+        Returns:
+            tuple: (manifest, missing): the manifest and the names whose source file does not exist.
+        """
+        previous_entries = previous.entries if previous is not None else {}
+        entries = {}
+        missing = []
+        to_hash = []
+        for split, labels in splits.items():
+            for name, class_name in labels.items():
+                try:
+                    stat = os.stat(os.path.join(source_folder, name))
+                except OSError:
+                    missing.append(name)
+                    continue
+
+                old = previous_entries.get(name)
+                unchanged = old and old.get("size") == stat.st_size and old.get("mtime_ns") == stat.st_mtime_ns
+                entries[name] = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "hash": old["hash"] if unchanged else None,
+                    "class": class_name,
+                    "split": split,
+                }
+                if not unchanged:
+                    to_hash.append(name)
+
+        hashes = dict(run_tasks("Hashing", to_hash, lambda name: (name, file_digest(os.path.join(source_folder, name)))))
+        for name in to_hash:
+            if name in hashes:
+                entries[name]["hash"] = hashes[name]
+            else:
+                del entries[name]
+                missing.append(name)
+        return cls(entries), missing
+
+    def diff(self, new):
+        """Compares this (built) manifest with a wanted one."""
+        result = ManifestDiff()
+        for name, entry in new.entries.items():
+            old = self.entries.get(name)
+            if old is None:
+                result.added.append(name)
+            elif self.relative_path(name, old) != self.relative_path(name, entry):
+                result.moved.append(name)
+            elif old.get("hash") != entry["hash"]:
+                result.changed.append(name)
+        result.removed = [name for name in self.entries if name not in new.entries]
+        return result
+
+
+class ManifestDiff():
+    def __init__(self):
+        self.added = []
+        self.removed = []
+        self.moved = []    # class or split changed
+        self.changed = []  # content changed
+        self.restored = [] # unchanged in the manifest but missing on disk
+        self.missing = []  # source file not found
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.moved or self.changed or self.restored)
+
+    def summary(self) -> str:
+        if not self:
+            text = "up to date"
+        else:
+            text = (f"{len(self.added)} added, {len(self.removed)} removed, {len(self.moved)} moved, "
+                    f"{len(self.changed)} changed, {len(self.restored)} restored")
+        if self.missing:
+            text += f", {len(self.missing)} source files missing"
+        return text
+
+
+def sync_dataset_folder(target_folder:str, source_folder:str, splits:dict, manifest_path:str,
+                        materializer:FileMaterializer=None, builder=None) -> ManifestDiff:
+    """
+    Brings `target_folder` (<split>/<class>/<image>) in line with `splits` ({split: {image name: class}}),
+    touching only the files that differ from the manifest of the last build.
+
+    A target folder without a manifest (built before manifests existed) is rebuilt from scratch.
+    With a DatasetBuilder, hashing and placing files run on its thread pool and the
+    result goes to its summary. The manifest is only written once the folder matches it.
+
+    Returns:
+        ManifestDiff: What was changed.
+    """
+    started = time.perf_counter()
+    materializer = materializer or FileMaterializer()
+    run_tasks = builder.run_tasks if builder else run_tasks_inline
+    log = builder.log if builder else print
+
+    built = DatasetManifest.load(manifest_path) if os.path.isdir(target_folder) else DatasetManifest()
+    if not len(built) and os.path.isdir(target_folder):
+        shutil.rmtree(target_folder)
+
+    wanted, missing = DatasetManifest.from_splits(splits, source_folder, previous=built, run_tasks=run_tasks)
+    diff = built.diff(wanted)
+    diff.missing = missing
+
+    # Files deleted from the built folder by hand
+    pending = set(diff.added) | set(diff.moved) | set(diff.changed)
+    for name, entry in wanted.entries.items():
+        if name not in pending and not os.path.lexists(os.path.join(target_folder, DatasetManifest.relative_path(name, entry))):
+            diff.restored.append(name)
+
+    touched_folders = set()
+    for name in diff.removed:
+        path = os.path.join(target_folder, DatasetManifest.relative_path(name, built.entries[name]))
+        if os.path.lexists(path):
+            os.remove(path)
+        touched_folders.add(os.path.dirname(path))
+
+    for name in diff.moved:
+        old_path = os.path.join(target_folder, DatasetManifest.relative_path(name, built.entries[name]))
+        new_path = os.path.join(target_folder, DatasetManifest.relative_path(name, wanted.entries[name]))
+        os.makedirs(os.path.dirname(new_path), exist_ok=True)
+        if os.path.lexists(old_path) and built.entries[name]["hash"] == wanted.entries[name]["hash"]:
+            os.replace(old_path, new_path)
+        else:
+            if os.path.lexists(old_path):
+                os.remove(old_path)
+            materializer.materialize(os.path.join(source_folder, name), new_path)
+        touched_folders.add(os.path.dirname(old_path))
+
+    def place(name):
+        path = os.path.join(target_folder, DatasetManifest.relative_path(name, wanted.entries[name]))
+        materializer.materialize(os.path.join(source_folder, name), path)
+        return name
+
+    to_place = diff.added + diff.changed + diff.restored
+    for folder in {os.path.dirname(DatasetManifest.relative_path(name, wanted.entries[name])) for name in to_place}:
+        os.makedirs(os.path.join(target_folder, folder), exist_ok=True)
+    placed = set(run_tasks("Placing images", to_place, place))
+    failed = [name for name in to_place if name not in placed]
+    for name in failed:
+        # Not in the folder, so not in the manifest either; the next build tries again
+        del wanted.entries[name]
+
+    # An empty class folder would still count as a class for training; split folders stay
+    for folder in sorted(touched_folders, key=len, reverse=True):
+        if os.path.dirname(os.path.abspath(folder)) != os.path.abspath(target_folder):
+            try:
+                os.rmdir(folder)
+            except OSError:
+                pass
+    for split in splits:
+        os.makedirs(os.path.join(target_folder, split), exist_ok=True)
+
+    if diff or not os.path.exists(manifest_path):
+        os.makedirs(target_folder, exist_ok=True)
+        wanted.save(manifest_path)
+
+    log(f"Dataset '{target_folder}': {diff.summary()} in {(time.perf_counter() - started) * 1000:.1f} ms.")
+    if failed:
+        log(f"{len(failed)} images could not be placed.")
+    return diff
@@ -0,0 +1,129 @@
+# widgets/file_materializer.py
+
+import ctypes
+import errno
+import os
+import shutil
+import sys
+import threading
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+
+
+# ioctl that makes a file share the extents of another (Btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+
+
+class FileMaterializer():
+    """
+    Puts files into a dataset folder without copying their content where possible.
+
+    Strategies:
+      - "reflink": copy-on-write clone (Linux FICLONE, macOS clonefile); an
+        independent file that shares blocks until one side changes,
+      - "hardlink": a second name for the same file,
+      - "symlink": a link to the source path,
+      - "copy": a full copy (shutil.copy2).
+    "auto" tries reflink, hardlink, then copy. A chosen strategy that fails
+    falls back along the same order. A strategy that is not supported
+    between two devices is not tried again for them.
+
+    Hardlinks and symlinks share the content with the source, so callers must
+    not rewrite materialized files in place; copy_file() makes a real copy
+    for files that are modified afterwards.
+    """
+    STRATEGIES = ("reflink", "hardlink", "symlink", "copy")
+    AUTO_ORDER = ("reflink", "hardlink", "copy")
+
+    # errors meaning "this strategy does not work here", as opposed to a problem with the file
+    UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL,
+                          errno.ENOTTY, errno.EMLINK, errno.ENOSYS, errno.EACCES}
+
+    def __init__(self, strategy:str="auto"):
+        if strategy != "auto" and strategy not in self.STRATEGIES:
+            print(f"Warning: Unknown dataset link strategy '{strategy}'. Using 'auto'.")
+            strategy = "auto"
+        self.strategy = strategy
+        if strategy == "auto":
+            self.order = self.AUTO_ORDER
+        else:
+            self.order = (strategy,) + tuple(s for s in self.AUTO_ORDER if s != strategy)
+
+        self.counts = {s: 0 for s in self.STRATEGIES}
+        self._unsupported = set() # (strategy, source device, destination device)
+        self._lock = threading.Lock()
+
+    def materialize(self, source_path:str, destination_path:str) -> str:
+        """
+        Makes `destination_path` provide the content of `source_path`, replacing an existing file.
+
+        Returns:
+            str: The strategy that was used.
+
+        Raises:
+            OSError: If the source cannot be read or even copying fails.
+        """
+        if os.path.lexists(destination_path):
+            os.remove(destination_path)
+
+        devices = (os.stat(source_path).st_dev, os.stat(os.path.dirname(os.path.abspath(destination_path))).st_dev)
+        for strategy in self.order:
+            if strategy != "copy" and (strategy, *devices) in self._unsupported:
+                continue
+            try:
+                getattr(self, f"_{strategy}")(source_path, destination_path)
+            except OSError as e:
+                if strategy == "copy" or e.errno not in self.UNSUPPORTED_ERRNOS:
+                    raise
+                with self._lock:
+                    self._unsupported.add((strategy, *devices))
+                if os.path.lexists(destination_path):
+                    os.remove(destination_path)
+                continue
+            with self._lock:
+                self.counts[strategy] += 1
+            return strategy
+
+    def copy_file(self, source_path:str, destination_path:str):
+        """A real copy, for files that are modified after materializing."""
+        shutil.copy2(source_path, destination_path)
+        with self._lock:
+            self.counts["copy"] += 1
+
+    def summary(self) -> str:
+        used = [f"{strategy}: {count}" for strategy, count in self.counts.items() if count]
+        return f"{sum(self.counts.values())} files ({', '.join(used) or 'none'})"
+
+    @staticmethod
+    def _hardlink(source_path:str, destination_path:str):
+        os.link(source_path, destination_path)
+
+    @staticmethod
+    def _symlink(source_path:str, destination_path:str):
+        # Relative, so the dataset keeps working when the project folder moves
+        target = os.path.relpath(os.path.abspath(source_path), os.path.dirname(os.path.abspath(destination_path)))
+        os.symlink(target, destination_path)
+
+    @staticmethod
+    def _copy(source_path:str, destination_path:str):
+        shutil.copy2(source_path, destination_path)
+
+    @staticmethod
+    def _reflink(source_path:str, destination_path:str):
+        if sys.platform == "darwin":
+            libc = ctypes.CDLL(None, use_errno=True)
+            if not hasattr(libc, "clonefile"):
+                raise OSError(errno.ENOTSUP, "clonefile is not available")
+            if libc.clonefile(os.fsencode(source_path), os.fsencode(destination_path), 0) != 0:
+                err = ctypes.get_errno()
+                raise OSError(err, os.strerror(err))
+            return
+
+        if fcntl is None or not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOTSUP, "Reflinks are not supported on this platform")
+        with open(source_path, "rb") as src, open(destination_path, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        shutil.copystat(source_path, destination_path)
@@ -0,0 +1,468 @@
+# widgets/file_table_model.py
+
+import bisect
+import json
+import os
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QComboBox, QTableView, QAbstractItemView, QHeaderView
+
+from widgets.project_index import ProjectIndex, IMAGE_EXTENSIONS
+from widgets.annotation_repository import AnnotationRepository
+
+
+class FileTableModel(QAbstractTableModel):
+    """
+    Table model of the image files of a project: file name, class and
+    annotation state.
+
+    The model only keeps a compact index (a sorted list of the visible file
+    names, a name -> class dict and a set of annotated names); no per-row item
+    objects exist, the view asks data() for the rows it actually paints. Rows
+    are kept sorted in ascending key order, a descending sort just reads the
+    list backwards, so single files can be inserted, removed or moved with a
+    binary search and a one-row notification.
+
+    The same model instance can be shown by several views (the project file
+    table and the annotation dialog), so a label set in one shows up in the
+    other. Each view filters it through its own FileFilterProxyModel; the
+    sort order belongs to the model and is shared.
+    """
+
+    COLUMN_NAME = 0
+    COLUMN_CLASS = 1
+    COLUMN_ANNOTATED = 2
+    HEADERS = ("File Name", "Class", "Annotated")
+
+    # Above this many files an update resets the model instead of inserting row by row
+    BATCH_RESET_THRESHOLD = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self._files = set()
+        self._classes = {}       # file name -> class name (classification labels)
+        self._annotated = set()  # file names with a detection label file
+        self._rows = []          # visible file names, ascending by _sort_key
+
+        self._sort_column = self.COLUMN_NAME
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        self._project_index = None
+
+    # --- Qt model interface ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+
+        name = self.file_name(index.row())
+        column = index.column()
+        if column == self.COLUMN_NAME:
+            return name
+        if column == self.COLUMN_CLASS:
+            return self._classes.get(name, "")
+        if column == self.COLUMN_ANNOTATED:
+            return "yes" if self.is_annotated(name) else ""
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self._sort_column = column
+        self._sort_order = order
+        self._rows.sort(key=self._sort_key)
+        self.layoutChanged.emit()
+
+    # --- Queries ---
+
+    def file_name(self, row:int) -> str:
+        """Returns the file name shown in `row`."""
+        if self._sort_order == Qt.SortOrder.DescendingOrder:
+            row = len(self._rows) - 1 - row
+        return self._rows[row]
+
+    def row_of(self, name:str) -> int:
+        """Returns the row of `name`, or -1 if it is not in the index."""
+        pos = self._find(name)
+        if pos < 0:
+            return -1
+        return self._view_row(pos, len(self._rows))
+
+    def class_of(self, name:str):
+        return self._classes.get(name)
+
+    def is_annotated(self, name:str) -> bool:
+        return name in self._annotated or name in self._classes
+
+    def file_names(self) -> list:
+        """All file names of the project (not only the visible ones), sorted."""
+        return sorted(self._files)
+
+    def class_names(self) -> list:
+        """The classes used by at least one file, sorted."""
+        return sorted(set(self._classes.values()))
+
+    def get_counts(self) -> dict:
+        return {
+            "files": len(self._files),
+            "annotated": sum(1 for name in self._files if self.is_annotated(name)),
+        }
+
+    # --- Updates ---
+
+    def set_files(self, names, classes:dict=None, annotated=None):
+        """Replaces the whole index, e.g. after opening a project."""
+        self.beginResetModel()
+        self._files = set(names)
+        self._classes = {name: cls for name, cls in (classes or {}).items() if name in self._files}
+        self._annotated = set(annotated or ()) & self._files
+        self._rebuild_rows()
+        self.endResetModel()
+
+    def add_files(self, names):
+        """Adds new files; files already in the index are ignored."""
+        names = [name for name in names if name not in self._files]
+        if len(names) > self.BATCH_RESET_THRESHOLD:
+            self.beginResetModel()
+            self._files.update(names)
+            self._rebuild_rows()
+            self.endResetModel()
+            return
+
+        for name in names:
+            self._files.add(name)
+            self._insert_row(name)
+
+    def remove_files(self, names):
+        """Removes files from the index, together with their labels."""
+        names = [name for name in names if name in self._files]
+        if len(names) > self.BATCH_RESET_THRESHOLD:
+            self.beginResetModel()
+            for name in names:
+                self._forget(name)
+            self._rebuild_rows()
+            self.endResetModel()
+            return
+
+        for name in names:
+            self._remove_row(name)
+            self._forget(name)
+
+    def set_class(self, name:str, class_name:str=None):
+        """Sets (or with None, removes) the classification label of a file."""
+        if name not in self._files:
+            return
+
+        def change():
+            if class_name:
+                self._classes[name] = class_name
+            else:
+                self._classes.pop(name, None)
+        self._update(name, change)
+
+    def set_annotated(self, name:str, annotated:bool=True):
+        """Marks whether a file has a detection label file."""
+        if name not in self._files:
+            return
+
+        def change():
+            if annotated:
+                self._annotated.add(name)
+            else:
+                self._annotated.discard(name)
+        self._update(name, change)
+
+    def clear_classes(self):
+        """Removes every classification label."""
+        self.beginResetModel()
+        self._classes.clear()
+        self._rebuild_rows()
+        self.endResetModel()
+
+    def follow_index(self, project_index:ProjectIndex):
+        """
+        Keeps the model in step with a ProjectIndex: images appearing or disappearing in the
+        data folder are added or removed, and label files update the annotated state.
+        Replaces any index followed before.
+        """
+        if self._project_index is not None:
+            self._project_index.files_added.disconnect(self._on_index_files_added)
+            self._project_index.files_removed.disconnect(self._on_index_files_removed)
+        self._project_index = project_index
+        if project_index is not None:
+            project_index.files_added.connect(self._on_index_files_added)
+            project_index.files_removed.connect(self._on_index_files_removed)
+
+    def _on_index_files_added(self, names:list):
+        self.add_files([name for name in names if name.lower().endswith(IMAGE_EXTENSIONS)])
+        self._update_annotated_from_labels(names, True)
+
+    def _on_index_files_removed(self, names:list):
+        self.remove_files([name for name in names if name.lower().endswith(IMAGE_EXTENSIONS)])
+        self._update_annotated_from_labels(names, False)
+
+    def _update_annotated_from_labels(self, names:list, annotated:bool):
+        label_stems = {os.path.splitext(name)[0] for name in names if name.endswith(".txt")}
+        if not label_stems:
+            return
+        for stem in label_stems:
+            for extension in IMAGE_EXTENSIONS:
+                if stem + extension in self._files:
+                    self.set_annotated(stem + extension, annotated)
+
+    # --- Internals ---
+
+    def _sort_key(self, name:str):
+        if self._sort_column == self.COLUMN_CLASS:
+            return self._classes.get(name, ""), name
+        if self._sort_column == self.COLUMN_ANNOTATED:
+            return self.is_annotated(name), name
+        return name
+
+    def _rebuild_rows(self):
+        self._rows = sorted(self._files, key=self._sort_key)
+
+    def _view_row(self, pos:int, count:int) -> int:
+        # Rows are stored ascending; a descending view reads them backwards
+        if self._sort_order == Qt.SortOrder.DescendingOrder:
+            return count - 1 - pos
+        return pos
+
+    def _find(self, name:str) -> int:
+        key = self._sort_key(name)
+        pos = bisect.bisect_left(self._rows, key, key=self._sort_key)
+        if pos < len(self._rows) and self._rows[pos] == name:
+            return pos
+        return -1
+
+    def _insert_row(self, name:str):
+        pos = bisect.bisect_left(self._rows, self._sort_key(name), key=self._sort_key)
+        # In a descending view the new row goes in front of the row currently at `pos`
+        row = pos if self._sort_order != Qt.SortOrder.DescendingOrder else len(self._rows) - pos
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.insert(pos, name)
+        self.endInsertRows()
+
+    def _remove_row(self, name:str):
+        pos = self._find(name)
+        if pos < 0:
+            return
+        row = self._view_row(pos, len(self._rows))
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[pos]
+        self.endRemoveRows()
+
+    def _forget(self, name:str):
+        self._files.discard(name)
+        self._classes.pop(name, None)
+        self._annotated.discard(name)
+
+    def _update(self, name:str, change):
+        # The row has to move if its sort key changed; otherwise it is repainted in place
+        # (the views' filter proxies re-check it on dataChanged)
+        key_before = self._sort_key(name)
+        pos = self._find(name)
+
+        change()
+
+        if self._sort_key(name) == key_before:
+            if pos >= 0:
+                row = self._view_row(pos, len(self._rows))
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+            return
+
+        if pos >= 0:
+            row = self._view_row(pos, len(self._rows))
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[pos]
+            self.endRemoveRows()
+        self._insert_row(name)
+
+
+def scan_project_files(data_dir:str, project_index:ProjectIndex=None, annotation_repo:AnnotationRepository=None):
+    """
+    Reads the image files of a project folder and their labels. The file names come
+    from `project_index` when one is given, otherwise from listing the folder; the
+    labels come from `annotation_repo` when one is given.
+
+    Returns:
+        tuple: (names, classes, annotated): the image file names, the classification labels
+               from annotation_info.json ({name: class}) and the names that have a detection
+               label file (<stem>.txt).
+    """
+    if project_index is not None:
+        names = project_index.image_files()
+        annotated = project_index.annotated_images()
+    elif os.path.isdir(data_dir):
+        entries = os.listdir(data_dir)
+        names = [f for f in entries if f.lower().endswith(IMAGE_EXTENSIONS)]
+        label_stems = {os.path.splitext(f)[0] for f in entries if f.endswith(".txt")}
+        annotated = {name for name in names if os.path.splitext(name)[0] in label_stems}
+    else:
+        return [], {}, set()
+
+    if annotation_repo is not None:
+        return names, annotation_repo.class_labels(), annotation_repo.annotated_images() & set(names)
+
+    classes = {}
+    annotation_info_path = os.path.join(data_dir, "annotation_info.json")
+    if os.path.exists(annotation_info_path):
+        try:
+            with open(annotation_info_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                classes = data
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Warning: Cannot read '{annotation_info_path}': {e}")
+
+    return names, classes, annotated
+
+
+class FileFilterProxyModel(QSortFilterProxyModel):
+    """
+    One view's filter over a shared FileTableModel, so filtering the annotation
+    dialog's list does not filter the project file table.
+
+    Rows keep the order of the source model; sorting is passed on to it.
+    """
+
+    def __init__(self, model:FileTableModel, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(model)
+        self._class_filter = None
+        self._annotated_filter = None
+
+    def set_filter(self, class_name:str=None, annotated:bool=None):
+        """
+        Shows only some of the files.
+
+        Args:
+            class_name (str, optional): Only files labeled with this class.
+            annotated (bool, optional): True for annotated files only, False for files without annotation.
+        """
+        self._class_filter = class_name
+        self._annotated_filter = annotated
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        model = self.sourceModel()
+        name = model.file_name(source_row)
+        if self._class_filter is not None and model.class_of(name) != self._class_filter:
+            return False
+        if self._annotated_filter is not None and model.is_annotated(name) != self._annotated_filter:
+            return False
+        return True
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        # The model sorts with a binary-searchable index; the proxy keeps its order
+        self.sourceModel().sort(column, order)
+
+    def file_name(self, row:int) -> str:
+        """Returns the file name shown in `row`."""
+        return self.sourceModel().file_name(self.mapToSource(self.index(row, 0)).row())
+
+    def row_of(self, name:str) -> int:
+        """Returns the row `name` is shown in, or -1 if it is not shown."""
+        model = self.sourceModel()
+        row = model.row_of(name)
+        if row < 0:
+            return -1
+        return self.mapFromSource(model.index(row, 0)).row()
+
+    def class_names(self) -> list:
+        return self.sourceModel().class_names()
+
+
+class FileFilterComboBox(QComboBox):
+    """Chooses which files a FileFilterProxyModel shows: all, annotated, not annotated, or one class."""
+
+    def __init__(self, model:FileFilterProxyModel, parent=None):
+        super().__init__(parent)
+
+        self.model_to_filter = model
+        self._fill()
+        self.currentIndexChanged.connect(self._apply)
+
+    def showPopup(self):
+        # Classes come and go while labeling; refresh the list each time it opens
+        self._fill()
+        super().showPopup()
+
+    def _fill(self):
+        current = self.currentData()
+        self.blockSignals(True)
+        self.clear()
+        self.addItem("All files", "all")
+        self.addItem("Annotated", "annotated")
+        self.addItem("Not annotated", "not_annotated")
+        for class_name in self.model_to_filter.class_names():
+            self.addItem(f"Class: {class_name}", f"class:{class_name}")
+        index = self.findData(current) if current is not None else 0
+        self.setCurrentIndex(max(index, 0))
+        self.blockSignals(False)
+        if index < 0:
+            self._apply() # the filtered class is gone, show all files again
+
+    def _apply(self):
+        key = self.currentData() or "all"
+        if key == "annotated":
+            self.model_to_filter.set_filter(annotated=True)
+        elif key == "not_annotated":
+            self.model_to_filter.set_filter(annotated=False)
+        elif key.startswith("class:"):
+            self.model_to_filter.set_filter(class_name=key[len("class:"):])
+        else:
+            self.model_to_filter.set_filter()
+
+
+def replace_with_file_view(placeholder, model:FileTableModel, single_selection:bool=False) -> QTableView:
+    """
+    Puts a filter combo box and a QTableView showing `model` in the layout
+    position of `placeholder` (a QTableWidget/QListWidget from a .ui file)
+    and hides the placeholder.
+
+    The view shows `model` through its own FileFilterProxyModel (view.model());
+    the FileTableModel itself is proxy.sourceModel().
+    """
+    container = QWidget(placeholder.parentWidget())
+    proxy = FileFilterProxyModel(model, container)
+    layout = QVBoxLayout(container)
+    layout.setContentsMargins(0, 0, 0, 0)
+
+    view = QTableView(container)
+    view.setObjectName(placeholder.objectName().replace("Widget", "View", 1))
+    view.setModel(proxy)
+    view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    view.setSelectionMode(
+        QAbstractItemView.SelectionMode.SingleSelection if single_selection
+        else QAbstractItemView.SelectionMode.ExtendedSelection
+    )
+    view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    view.setSortingEnabled(True)
+    view.sortByColumn(FileTableModel.COLUMN_NAME, Qt.SortOrder.AscendingOrder)
+    view.setWordWrap(False)
+    # Fixed row heights: the headers never measure rows, which keeps 100k+ rows cheap
+    view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    view.verticalHeader().setVisible(False)
+    view.horizontalHeader().setStretchLastSection(True)
+    view.setColumnWidth(FileTableModel.COLUMN_NAME, 250)
+    view.setColumnWidth(FileTableModel.COLUMN_CLASS, 80)
+
+    layout.addWidget(FileFilterComboBox(proxy, container))
+    layout.addWidget(view)
+
+    parent_layout = placeholder.parentWidget().layout()
+    if parent_layout is not None:
+        parent_layout.replaceWidget(placeholder, container)
+    placeholder.hide()
+    return view
@@ -0,0 +1,148 @@
+# widgets/frame_buffers.py
+
+import sys
+import threading
+from collections import deque
+
+import numpy as np
+
+
+def reuse_buffer(buffer, like):
+    """Returns `buffer` if it has the shape and dtype of `like`, otherwise a new empty array like it."""
+    if buffer is None or buffer.shape != like.shape or buffer.dtype != like.dtype:
+        return np.empty_like(like)
+    return buffer
+
+
+class FrameBufferPool():
+    """
+    A small ring of preallocated numpy frame buffers.
+
+    The capture loop acquire()s a buffer, writes into it with an OpenCV dst=
+    argument and wraps it in a QImage without copying. The buffer stays owned
+    by that frame until release() is called, i.e. until the GUI has copied the
+    image or the frame was dropped, and only then is it handed out again. All
+    buffers share one shape; when the shape changes (the preview was resized)
+    the old buffers are discarded as they come back.
+
+    If every buffer is still in use, acquire() allocates a temporary one and
+    counts it in `overflow_allocations`, so a stuck consumer shows up in the
+    counters instead of blocking the capture loop.
+    """
+
+    def __init__(self, size:int=3):
+        self.size = size
+        self._lock = threading.Lock()
+        self._shape = None
+        self._dtype = None
+        self._free = []
+        self._in_use = {}  # id(buffer) -> buffer
+
+        self.allocations = 0
+        self.overflow_allocations = 0
+
+    def acquire(self, shape:tuple, dtype=np.uint8):
+        """Returns a buffer of `shape` that is not referenced by any undelivered frame."""
+        shape = tuple(shape)
+        dtype = np.dtype(dtype)
+        with self._lock:
+            if (shape, dtype) != (self._shape, self._dtype):
+                self._shape = shape
+                self._dtype = dtype
+                self._free.clear()
+
+            if self._free:
+                buffer = self._free.pop()
+            else:
+                buffer = np.empty(shape, dtype=dtype)
+                self.allocations += 1
+                if len(self._in_use) >= self.size:
+                    self.overflow_allocations += 1
+            self._in_use[id(buffer)] = buffer
+            return buffer
+
+    def release(self, buffer):
+        """Hands a buffer back once nothing reads from it anymore. Unknown buffers are ignored."""
+        if buffer is None:
+            return
+        with self._lock:
+            if self._in_use.pop(id(buffer), None) is None:
+                return
+            if (buffer.shape, buffer.dtype) == (self._shape, self._dtype) and len(self._free) < self.size:
+                self._free.append(buffer)
+
+    @property
+    def in_use(self) -> int:
+        return len(self._in_use)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_use": len(self._in_use),
+                "free": len(self._free),
+                "allocations": self.allocations,
+                "overflow_allocations": self.overflow_allocations,
+            }
+
+
+class FrameRecycler():
+    """
+    Lets a capture source read into a frame it handed out before, once nothing
+    else holds that frame anymore.
+
+    Camera frames are passed on by reference (frame ring, inference mailbox,
+    snapshots waiting for the image writer), so there is no point at which
+    the capture loop knows a frame is free. Instead the source track()s every
+    frame it returns, and take() hands back the oldest one whose only
+    references are the recycler's own, i.e. one the ring has evicted and
+    no consumer still reads. A numpy view keeps its base frame referenced,
+    so a frame is never overwritten while a view of it is alive.
+
+    When every tracked frame is still in use (e.g. during a burst), take()
+    returns None and the source allocates, counted in `allocations`.
+    """
+
+    def __init__(self, max_frames:int=64, scan:int=4):
+        """
+        Args:
+            max_frames (int): Frames tracked at most; older ones are forgotten and left to the garbage collector.
+            scan (int): How many of the oldest frames take() checks.
+        """
+        self.max_frames = max_frames
+        self.scan = scan
+        self._frames = deque()
+        self.reused = 0
+        self.allocations = 0
+
+        # Reference count of a tracked frame that nothing else holds, measured rather than
+        # assumed, since it depends on the interpreter
+        self._frames.append(np.empty(1, dtype=np.uint8))
+        self._free_refs = self._refs(0)
+        self._frames.clear()
+
+    def take(self):
+        """Returns a frame that may be overwritten, or None."""
+        for i in range(min(self.scan, len(self._frames))):
+            if self._refs(i) <= self._free_refs:
+                frame = self._frames[i]
+                del self._frames[i]
+                self.reused += 1
+                return frame
+        self.allocations += 1
+        return None
+
+    def track(self, frame):
+        """Registers a frame handed out by the source."""
+        if len(self._frames) >= self.max_frames:
+            self._frames.popleft()
+        self._frames.append(frame)
+
+    def clear(self):
+        self._frames.clear()
+
+    def get_stats(self) -> dict:
+        return {"tracked": len(self._frames), "reused": self.reused, "allocations": self.allocations}
+
+    def _refs(self, i:int) -> int:
+        frame = self._frames[i]
+        return sys.getrefcount(frame)
@@ -0,0 +1,118 @@
+# widgets/frame_geometry.py
+
+import threading
+
+import cv2
+import numpy as np
+
+
+class ProcessingGeometry():
+    """
+    Plans the frame sizes used by the live pipeline and resizes camera frames
+    to them.
+
+    Two targets are derived from the camera frame size:
+      - display:   the largest size that fits the display bounds (the preview
+                   widget size) while keeping the camera aspect ratio. The GUI
+                   shows these frames as they are, so they are scaled up too
+                   when the widget is larger than the camera frame.
+      - inference: the size whose longest side equals the model imgsz, never
+                   larger than the camera frame.
+
+    Each target is resized directly from the camera frame, at most once per
+    frame, into a preallocated destination buffer that is reused while the
+    target size stays the same. to_display() and to_inference() may be called
+    from different threads; each owns its own buffer.
+    """
+
+    DEFAULT_DISPLAY_SIZE = (1280, 720)
+    DEFAULT_IMGSZ = 640
+
+    def __init__(self, display_size:tuple=None, imgsz:int=None):
+        self._display_bounds = tuple(display_size) if display_size else self.DEFAULT_DISPLAY_SIZE
+        self._imgsz = int(imgsz) if imgsz else self.DEFAULT_IMGSZ
+
+        self._frame_size = None
+        self._display_size = None
+        self._inference_size = None
+        self._buffers = {}
+        self._lock = threading.Lock()
+
+    def set_display_bounds(self, width:int, height:int):
+        """Sets the area the preview is shown in; the plan is recomputed on the next frame."""
+        if width > 0 and height > 0 and (width, height) != self._display_bounds:
+            with self._lock:
+                self._display_bounds = (int(width), int(height))
+                self._frame_size = None
+
+    def set_imgsz(self, imgsz:int):
+        """Sets the model input size; the plan is recomputed on the next frame."""
+        if imgsz and int(imgsz) != self._imgsz:
+            with self._lock:
+                self._imgsz = int(imgsz)
+                self._frame_size = None
+
+    @property
+    def imgsz(self):
+        return self._imgsz
+
+    @property
+    def display_size(self):
+        return self._display_size
+
+    @property
+    def inference_size(self):
+        return self._inference_size
+
+    def plan(self, frame_width:int, frame_height:int):
+        """
+        Computes the display and inference targets for a given camera frame size.
+
+        Returns:
+            tuple: ((display_w, display_h), (inference_w, inference_h))
+        """
+        with self._lock:
+            if self._frame_size != (frame_width, frame_height):
+                self._frame_size = (frame_width, frame_height)
+                self._display_size = self.fit_size(frame_width, frame_height, *self._display_bounds, allow_upscale=True)
+                self._inference_size = self.fit_size(frame_width, frame_height, self._imgsz, self._imgsz)
+            return self._display_size, self._inference_size
+
+    @staticmethod
+    def fit_size(width:int, height:int, max_width:int, max_height:int, allow_upscale:bool=False):
+        """
+        Returns the largest (w, h) with the aspect ratio of (width, height) that
+        fits inside (max_width, max_height), without upscaling unless allow_upscale is set.
+        """
+        scale = min(max_width / width, max_height / height)
+        if not allow_upscale:
+            scale = min(scale, 1.0)
+        return max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+
+    def to_display(self, frame):
+        """Returns `frame` resized to the display target (the frame itself if sizes already match)."""
+        h, w = frame.shape[:2]
+        display_size, _ = self.plan(w, h)
+        return self._resize(frame, display_size, "display")
+
+    def to_inference(self, frame):
+        """Returns `frame` resized to the inference target (the frame itself if sizes already match)."""
+        h, w = frame.shape[:2]
+        _, inference_size = self.plan(w, h)
+        return self._resize(frame, inference_size, "inference")
+
+    def _resize(self, frame, size:tuple, key:str):
+        h, w = frame.shape[:2]
+        if (w, h) == size:
+            return frame
+
+        shape = (size[1], size[0]) + frame.shape[2:]
+        dst = self._buffers.get(key)
+        if dst is None or dst.shape != shape or dst.dtype != frame.dtype:
+            dst = np.empty(shape, dtype=frame.dtype)
+            self._buffers[key] = dst
+
+        # INTER_AREA is the better filter for shrinking, INTER_LINEAR for enlarging
+        interpolation = cv2.INTER_AREA if size[0] < w else cv2.INTER_LINEAR
+        cv2.resize(frame, size, dst=dst, interpolation=interpolation)
+        return dst
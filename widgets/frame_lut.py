@@ -0,0 +1,65 @@
+# widgets/frame_lut.py
+
+import cv2
+
+
+class BrightnessContrastLUT():
+    """
+    Brightness/contrast adjustment, saturate(|alpha * x + beta|), as done by
+    cv2.convertScaleAbs.
+
+    convertScaleAbs is kept for the actual adjustment: at 1080p it is faster
+    than applying a precomputed table with cv2.LUT. What this class adds is
+    that the identity (alpha=1, beta=0), the default slider position, is
+    detected once in set() and skipped, and that the adjustment can write
+    into a reused buffer.
+    """
+
+    def __init__(self, alpha:float=1.0, beta:int=0):
+        self.alpha = 1.0
+        self.beta = 0
+        self._params = None # (alpha, beta), None for the identity
+        self.set(alpha, beta)
+
+    @property
+    def is_identity(self) -> bool:
+        """True when the adjustment would leave every pixel unchanged."""
+        return self._params is None
+
+    def set(self, alpha:float, beta:int):
+        """Selects the adjustment used by apply() from now on."""
+        alpha = float(alpha)
+        beta = int(beta)
+        self.alpha = alpha
+        self.beta = beta
+        # One tuple, so a frame adjusted on another thread never mixes old and new values
+        self._params = None if (alpha == 1.0 and beta == 0) else (alpha, beta)
+
+    def apply(self, frame, dst=None):
+        """
+        Adjusts an 8-bit frame.
+
+        Args:
+            frame (numpy.ndarray): The input frame.
+            dst (numpy.ndarray, optional): Output buffer; pass `frame` itself to adjust in place.
+
+        Returns:
+            numpy.ndarray: The adjusted frame. When the adjustment is the identity,
+                           `frame` is returned untouched.
+        """
+        params = self._params
+        if params is None:
+            return frame
+        alpha, beta = params
+        return cv2.convertScaleAbs(frame, dst=dst, alpha=alpha, beta=beta)
+
+    def frozen(self):
+        """
+        Returns a function that adjusts a frame (into a new array) with the current values,
+        unaffected by later set() calls, or None when the adjustment is the identity.
+        """
+        params = self._params
+        if params is None:
+            return None
+        alpha, beta = params
+        return lambda frame: cv2.convertScaleAbs(frame, alpha=alpha, beta=beta)
@@ -0,0 +1,145 @@
+# widgets/frame_mailbox.py
+
+import threading
+import time
+
+
+class LatestFrameMailbox():
+    """
+    A single-slot, "latest frame wins" hand-off between a producer thread
+    (the camera capture loop) and a consumer thread (the inference worker).
+
+    put() never blocks: if the previous frame was not taken yet it is simply
+    replaced and counted as dropped. take() blocks until a frame newer than
+    the last one handed out is available, so the consumer always works on
+    the freshest frame.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._frame = None
+        self._seq = 0
+        self._timestamp = 0.0
+        self._taken_seq = 0
+        self._closed = False
+
+        self.dropped_frames = 0
+
+    def put(self, frame, seq:int, timestamp:float=None):
+        """
+        Stores a frame in the slot, replacing any frame that was not taken yet.
+
+        Args:
+            frame (numpy.ndarray): The frame to hand over.
+            seq (int): Monotonic sequence number of the frame.
+            timestamp (float, optional): Capture time (time.perf_counter()). Defaults to now.
+        """
+        with self._cond:
+            if self._frame is not None and self._seq > self._taken_seq:
+                self.dropped_frames += 1
+            self._frame = frame
+            self._seq = seq
+            self._timestamp = time.perf_counter() if timestamp is None else timestamp
+            self._cond.notify()
+
+    def take(self, timeout:float=None):
+        """
+        Waits for a frame that has not been handed out yet.
+
+        Args:
+            timeout (float, optional): Seconds to wait. None waits until a frame arrives or close() is called.
+
+        Returns:
+            tuple: (frame, seq, timestamp), or (None, 0, 0.0) on timeout or when the mailbox is closed.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._closed or self._seq > self._taken_seq, timeout):
+                return None, 0, 0.0
+            if self._closed:
+                return None, 0, 0.0
+
+            frame = self._frame
+            self._frame = None
+            self._taken_seq = self._seq
+            return frame, self._seq, self._timestamp
+
+    def close(self):
+        """Wakes up any waiting consumer; subsequent take() calls return immediately."""
+        with self._cond:
+            self._closed = True
+            self._frame = None
+            self._cond.notify_all()
+
+    def reset(self):
+        with self._cond:
+            self._closed = False
+            self._frame = None
+            self._seq = 0
+            self._taken_seq = 0
+            self.dropped_frames = 0
+
+
+class CoalescingFrameChannel():
+    """
+    Delivers frames from the capture thread to the GUI thread without letting
+    them queue up.
+
+    The producer post()s every frame; only the newest one is kept. post()
+    returns True only when the consumer has to be notified, i.e. when no
+    notification is outstanding yet, so at most one queued signal is ever in
+    flight no matter how far painting falls behind. Frames replaced before
+    the consumer took them are counted as dropped and passed to `on_drop`,
+    e.g. to return their buffers to a pool.
+    """
+
+    def __init__(self, on_drop=None):
+        self.on_drop = on_drop
+        self._lock = threading.Lock()
+        self._item = None
+        self._notify_pending = False
+
+        self.posted_frames = 0
+        self.delivered_frames = 0
+        self.dropped_frames = 0
+
+    def post(self, item) -> bool:
+        """
+        Stores `item` as the pending frame, replacing an undelivered one.
+
+        Returns:
+            bool: True if the consumer must be notified, False if a notification is already pending.
+        """
+        with self._lock:
+            dropped = self._item
+            if dropped is not None:
+                self.dropped_frames += 1
+            self._item = item
+            self.posted_frames += 1
+            notify = not self._notify_pending
+            self._notify_pending = True
+
+        if dropped is not None and self.on_drop:
+            self.on_drop(dropped)
+        return notify
+
+    def take(self):
+        """Returns the pending frame (or None) and re-arms notifications."""
+        with self._lock:
+            item = self._item
+            self._item = None
+            self._notify_pending = False
+            if item is not None:
+                self.delivered_frames += 1
+            return item
+
+    def reset(self):
+        with self._lock:
+            dropped = self._item
+            self._item = None
+            self._notify_pending = False
+            self.posted_frames = 0
+            self.delivered_frames = 0
+            self.dropped_frames = 0
+
+        if dropped is not None and self.on_drop:
+            self.on_drop(dropped)
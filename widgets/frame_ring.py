@@ -0,0 +1,131 @@
+# widgets/frame_ring.py
+
+import threading
+import time
+from collections import deque
+
+
+class FrameRingBuffer():
+    """
+    Keeps the last `capacity` raw camera frames with their capture time, and
+    records bursts.
+
+    The capture loop push()es every frame. Frames are stored by reference:
+    sources only read into a frame again once nothing references it (see
+    FrameRecycler) and the pipeline never modifies the camera frame in place,
+    so no copy is needed.
+
+    A burst started with start_burst() begins with the frames captured during
+    the last `pre_trigger_seconds` (from the ring) and then collects every new
+    frame until stop_burst(), at the native capture rate.
+
+    Both the ring and a burst are limited by frame count and by total bytes,
+    so a high camera resolution holds fewer frames instead of more memory
+    (a 1080p BGR frame is about 6 MB).
+    """
+
+    def __init__(self, capacity:int=30, max_burst_frames:int=300,
+                 max_bytes:int=128 * 2**20, max_burst_bytes:int=512 * 2**20):
+        """
+        Args:
+            capacity (int): Frames kept in the ring at most.
+            max_burst_frames (int): Frames recorded per burst at most.
+            max_bytes (int): Total size of the frames in the ring at most; the newest frame is always kept.
+            max_burst_bytes (int): Total size of the frames of a burst at most.
+        """
+        self.capacity = capacity
+        self.max_burst_frames = max_burst_frames
+        self.max_bytes = max_bytes
+        self.max_burst_bytes = max_burst_bytes
+        self._frames = deque()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._burst = None
+        self._burst_bytes = 0
+        self.burst_overflow = 0
+
+    @property
+    def bytes(self) -> int:
+        """Total size of the frames in the ring."""
+        return self._bytes
+
+    @property
+    def burst_active(self) -> bool:
+        return self._burst is not None
+
+    def push(self, frame, seq:int, timestamp:float=None):
+        """
+        Adds a frame.
+
+        Args:
+            frame (numpy.ndarray): The raw camera frame.
+            seq (int): Sequence number of the frame.
+            timestamp (float, optional): Capture wall-clock time (time.time()). Defaults to now.
+        """
+        entry = (frame, seq, time.time() if timestamp is None else timestamp)
+        with self._lock:
+            self._frames.append(entry)
+            self._bytes += frame.nbytes
+            while len(self._frames) > 1 and (len(self._frames) > self.capacity or self._bytes > self.max_bytes):
+                self._bytes -= self._frames.popleft()[0].nbytes
+
+            if self._burst is not None:
+                if len(self._burst) < self.max_burst_frames and self._burst_bytes + frame.nbytes <= self.max_burst_bytes:
+                    self._burst.append(entry)
+                    self._burst_bytes += frame.nbytes
+                else:
+                    self.burst_overflow += 1
+
+    def latest(self):
+        """Returns (frame, seq, timestamp) of the newest frame, or None."""
+        with self._lock:
+            return self._frames[-1] if self._frames else None
+
+    def frames_since(self, timestamp:float) -> list:
+        """Returns [(frame, seq, timestamp), ...] captured at or after `timestamp`, oldest first."""
+        with self._lock:
+            return [entry for entry in self._frames if entry[2] >= timestamp]
+
+    def start_burst(self, pre_trigger_seconds:float=0.5):
+        """Starts recording a burst that includes the frames of the last `pre_trigger_seconds`."""
+        with self._lock:
+            since = time.time() - pre_trigger_seconds
+            self._burst = [entry for entry in self._frames if entry[2] >= since][-self.max_burst_frames:]
+            self._burst_bytes = sum(entry[0].nbytes for entry in self._burst)
+            self.burst_overflow = 0
+
+    def stop_burst(self, max_fps:float=None) -> list:
+        """
+        Stops the burst.
+
+        Args:
+            max_fps (float, optional): Keep at most this many frames per second of the burst.
+                                       None keeps every frame.
+
+        Returns:
+            list: [(frame, seq, timestamp), ...] oldest first, empty if no burst was recording.
+        """
+        with self._lock:
+            frames = self._burst or []
+            self._burst = None
+            self._burst_bytes = 0
+
+        if self.burst_overflow:
+            print(f"Warning: Burst limited to {len(frames)} frames "
+                  f"({self.max_burst_frames} frames / {self.max_burst_bytes // 2**20} MB), {self.burst_overflow} frames not recorded.")
+        if not max_fps:
+            return frames
+
+        selected = []
+        interval = 1.0 / max_fps
+        for entry in frames:
+            if not selected or entry[2] - selected[-1][2] >= interval:
+                selected.append(entry)
+        return selected
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+            self._burst = None
+            self._burst_bytes = 0
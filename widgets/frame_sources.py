@@ -0,0 +1,302 @@
+# widgets/frame_sources.py
+
+import glob
+import os
+import re
+import time
+
+import cv2
+import numpy as np
+
+from widgets.frame_buffers import FrameRecycler
+
+
+PACING_REALTIME = "realtime"
+PACING_FAST = "fast"
+
+
+class FrameSource():
+    """
+    Where VideoStreamer gets its frames from.
+
+    Subclasses implement _open(), _read() and _release(). Offline sources
+    (files, folders, synthetic) support two pacings:
+      - PACING_REALTIME: frames are delivered at the source frame rate, like a camera.
+      - PACING_FAST:     frames are delivered as fast as the pipeline takes them.
+    """
+
+    def __init__(self, fps:float=30.0, pacing:str=PACING_REALTIME, loop:bool=True):
+        if pacing not in (PACING_REALTIME, PACING_FAST):
+            raise ValueError(f"Unknown pacing '{pacing}'.")
+
+        self.fps = fps
+        self.pacing = pacing
+        self.loop = loop
+        self.at_end = False
+        self._opened = False
+        self._next_deadline = None
+
+    @property
+    def name(self) -> str:
+        return self.__class__.__name__
+
+    def open(self):
+        """Opens the source. Raises IOError if it cannot be opened."""
+        self.at_end = False
+        self._next_deadline = None
+        self._open()
+        self._opened = True
+
+    def is_opened(self) -> bool:
+        return self._opened
+
+    def read(self):
+        """
+        Returns:
+            tuple: (ret, frame) like cv2.VideoCapture.read(). ret is False on failure
+                   or, with loop=False, at the end of the source (at_end is then True).
+        """
+        self._pace()
+        return self._read()
+
+    def release(self):
+        if self._opened:
+            self._release()
+            self._opened = False
+
+    def _pace(self):
+        if self.pacing != PACING_REALTIME or not self.fps:
+            return
+
+        interval = 1.0 / self.fps
+        now = time.perf_counter()
+        if self._next_deadline is None or now - self._next_deadline > interval:
+            # First frame, or we fell behind by more than a frame: restart the schedule
+            self._next_deadline = now
+        elif self._next_deadline > now:
+            time.sleep(self._next_deadline - now)
+        self._next_deadline += interval
+
+    def _open(self):
+        raise NotImplementedError
+
+    def _read(self):
+        raise NotImplementedError
+
+    def _release(self):
+        pass
+
+
+class CameraSource(FrameSource):
+    """
+    A live camera opened through cv2.VideoCapture. The camera paces itself.
+    Frames are read into earlier frames that nothing references anymore (see FrameRecycler).
+    """
+
+    def __init__(self, camera_index:int=0, width:int=640, height:int=480):
+        super().__init__(fps=None, pacing=PACING_FAST, loop=False)
+
+        self.camera_index = camera_index
+        self.frame_width = width
+        self.frame_height = height
+        self.cap = None
+        self.recycler = FrameRecycler()
+
+    @property
+    def name(self) -> str:
+        return f"camera {self.camera_index}"
+
+    def _open(self):
+        self.cap = cv2.VideoCapture(self.camera_index)
+        if not self.cap.isOpened():
+            raise IOError(f"Cannot open camera with index {self.camera_index}")
+
+        # Request MJPEG format for potentially higher performance
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        # Keep the driver queue short so we always read a recent frame
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
+
+    def is_opened(self) -> bool:
+        return self.cap is not None and self.cap.isOpened()
+
+    def _read(self):
+        ret, frame = self.cap.read(self.recycler.take())
+        if ret:
+            self.recycler.track(frame)
+        return ret, frame
+
+    def _release(self):
+        if self.cap and self.cap.isOpened():
+            self.cap.release()
+        self.recycler.clear()
+
+
+class VideoFileSource(FrameSource):
+    """
+    Replays a video file. fps defaults to the frame rate stored in the file.
+    Frames are decoded into earlier frames that nothing references anymore (see FrameRecycler).
+    """
+
+    def __init__(self, file_path:str, fps:float=None, pacing:str=PACING_REALTIME, loop:bool=True):
+        super().__init__(fps=fps, pacing=pacing, loop=loop)
+
+        self.file_path = file_path
+        self.cap = None
+        self.recycler = FrameRecycler()
+
+    @property
+    def name(self) -> str:
+        return f"video '{self.file_path}'"
+
+    def _open(self):
+        self.cap = cv2.VideoCapture(self.file_path)
+        if not self.cap.isOpened():
+            raise IOError(f"Cannot open video file '{self.file_path}'")
+        if not self.fps:
+            self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    def _read(self):
+        buffer = self.recycler.take()
+        ret, frame = self.cap.read(buffer)
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read(buffer)
+        if ret:
+            self.recycler.track(frame)
+        else:
+            self.at_end = True
+        return ret, frame
+
+    def _release(self):
+        if self.cap and self.cap.isOpened():
+            self.cap.release()
+        self.recycler.clear()
+
+
+class ImageFolderSource(FrameSource):
+    """
+    Replays still images, e.g. the shots of a project.
+
+    Args:
+        pattern (str): A folder (all .jpg/.jpeg/.png files in it) or a glob
+                       pattern such as 'projects/*/data/*.jpg'.
+    """
+
+    IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+    def __init__(self, pattern:str, fps:float=30.0, pacing:str=PACING_REALTIME, loop:bool=True):
+        super().__init__(fps=fps, pacing=pacing, loop=loop)
+
+        self.pattern = pattern
+        self.files = []
+        self._index = 0
+
+    @property
+    def name(self) -> str:
+        return f"images '{self.pattern}'"
+
+    def _open(self):
+        if os.path.isdir(self.pattern):
+            files = [os.path.join(self.pattern, f) for f in os.listdir(self.pattern)]
+        else:
+            files = glob.glob(self.pattern)
+        self.files = sorted(f for f in files if f.lower().endswith(self.IMAGE_EXTENSIONS))
+        if not self.files:
+            raise IOError(f"No images found for '{self.pattern}'")
+        self._index = 0
+
+    def _read(self):
+        while True:
+            if self._index >= len(self.files):
+                if not self.loop:
+                    self.at_end = True
+                    return False, None
+                self._index = 0
+
+            file_path = self.files[self._index]
+            self._index += 1
+            frame = cv2.imread(file_path, cv2.IMREAD_COLOR)
+            if frame is not None:
+                return True, frame
+            print(f"Warning: Cannot read image '{file_path}', skipping.")
+
+
+class SyntheticSource(FrameSource):
+    """
+    Generates frames of a given resolution: a static gradient background with a
+    moving square, so both change-sensitive and static paths get exercised.
+    """
+
+    def __init__(self, width:int=1280, height:int=720, fps:float=30.0, pacing:str=PACING_REALTIME, num_frames:int=None):
+        super().__init__(fps=fps, pacing=pacing, loop=num_frames is None)
+
+        self.frame_width = width
+        self.frame_height = height
+        self.num_frames = num_frames
+        self._background = None
+        self._count = 0
+        self.recycler = FrameRecycler()
+
+    @property
+    def name(self) -> str:
+        return f"synthetic {self.frame_width}x{self.frame_height}@{self.fps}"
+
+    def _open(self):
+        x = np.linspace(0, 255, self.frame_width, dtype=np.uint8)
+        y = np.linspace(0, 255, self.frame_height, dtype=np.uint8)
+        self._background = np.empty((self.frame_height, self.frame_width, 3), dtype=np.uint8)
+        self._background[:, :, 0] = x[np.newaxis, :]
+        self._background[:, :, 1] = y[:, np.newaxis]
+        self._background[:, :, 2] = 128
+        self._count = 0
+        self.recycler.clear()
+
+    def _read(self):
+        if self.num_frames is not None and self._count >= self.num_frames:
+            self.at_end = True
+            return False, None
+
+        # Like a camera: a frame downstream still references is never overwritten
+        frame = self.recycler.take()
+        if frame is None or frame.shape != self._background.shape:
+            frame = self._background.copy()
+        else:
+            np.copyto(frame, self._background)
+        self.recycler.track(frame)
+        size = max(8, min(self.frame_width, self.frame_height) // 8)
+        x = (self._count * 8) % max(1, self.frame_width - size)
+        y = (self.frame_height - size) // 2
+        frame[y:y + size, x:x + size] = 255
+        self._count += 1
+        return True, frame
+
+
+def create_frame_source(spec, width:int=640, height:int=480, pacing:str=PACING_REALTIME) -> FrameSource:
+    """
+    Builds a FrameSource from a short description.
+
+    Args:
+        spec: A camera index (int or digit string), 'synthetic' / 'synthetic:1280x720@30',
+              a video file, an image folder, or a glob pattern of images.
+        width (int), height (int): Requested camera resolution (cameras and default synthetic size).
+        pacing (str): PACING_REALTIME or PACING_FAST for offline sources.
+    """
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return CameraSource(int(spec), width, height)
+
+    match = re.fullmatch(r"synthetic(?::(\d+)x(\d+))?(?:@([\d.]+))?", spec)
+    if match:
+        w, h, fps = match.groups()
+        return SyntheticSource(
+            int(w) if w else width,
+            int(h) if h else height,
+            float(fps) if fps else 30.0,
+            pacing=pacing
+        )
+
+    if os.path.isfile(spec) and not spec.lower().endswith(ImageFolderSource.IMAGE_EXTENSIONS):
+        return VideoFileSource(spec, pacing=pacing)
+    return ImageFolderSource(spec, pacing=pacing)
@@ -0,0 +1,272 @@
+# widgets/image_writer.py
+
+import os
+import queue
+import threading
+
+import cv2
+
+from PySide6.QtCore import QObject, Signal, Slot, QBuffer, QByteArray, QIODevice
+from PySide6.QtGui import QImage
+
+
+class WriteJob():
+    """
+    A group of images submitted together with ImageWriterPool.submit_many(), e.g. a burst.
+
+    Counts what became of each image; `on_finished(job)` is called on the GUI
+    thread once every image was saved, failed or dropped.
+    """
+
+    def __init__(self, total:int, on_finished=None):
+        self.total = total
+        self.on_finished = on_finished
+        self.saved = 0
+        self.failed = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def count(self, outcome:str) -> bool:
+        """Records one image as 'saved', 'failed' or 'dropped'. Returns True for the last image of the job."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            return self.saved + self.failed + self.dropped == self.total
+
+
+class ImageWriterPool(QObject):
+    """
+    Encodes and writes captured images on background threads.
+
+    submit() only queues the image, so the GUI thread never waits for JPEG
+    encoding or disk I/O. Every file is written to a temporary file in the
+    target folder first and then renamed, so a file list never sees a
+    half-written image. When a file is in place, the optional `on_saved`
+    callback is called on the GUI thread with its path.
+
+    The queue is bounded: if the disk cannot keep up, submit() returns False
+    and the image is dropped instead of piling up frames in memory. Images
+    that are already in memory as a group (a burst) go through submit_many(),
+    which feeds the queue from a helper thread and waits for free space, so
+    a burst larger than the queue is written in full.
+    """
+    image_saved = Signal(str, object) # file path, on_saved callback
+    save_failed = Signal(str, str)    # file path, error message
+    job_finished = Signal(object)     # WriteJob
+
+    # How long submit_many() waits for a free queue slot before dropping an image
+    PUT_TIMEOUT = 30.0
+
+    # format -> (file extension, OpenCV quality flag, Qt format name)
+    FORMATS = {
+        "jpg": (".jpg", cv2.IMWRITE_JPEG_QUALITY, "JPG"),
+        "png": (".png", cv2.IMWRITE_PNG_COMPRESSION, "PNG"),
+        "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY, "WEBP"),
+    }
+
+    def __init__(self, image_format:str="jpg", quality:int=95, num_workers:int=2, max_queue:int=64, parent=None):
+        """
+        Args:
+            image_format (str): 'jpg', 'png' or 'webp'.
+            quality (int): 0-100 for JPEG/WebP. For PNG it is the zlib compression level (0-9).
+            num_workers (int): Number of encoder/writer threads.
+            max_queue (int): Images that may wait for a writer before submit() starts refusing.
+        """
+        super().__init__(parent)
+
+        self.image_format = None
+        self.quality = None
+        self.set_format(image_format, quality)
+
+        self.dropped_images = 0
+        self.failed_images = 0
+        self._counter_lock = threading.Lock() # the counters are updated by the writer and feeder threads
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._feeders = []
+        self._workers = []
+        for i in range(num_workers):
+            worker = threading.Thread(target=self._work, name=f"ImageWriter-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+        self.image_saved.connect(self._on_image_saved)
+        self.job_finished.connect(self._on_job_finished)
+
+    def set_format(self, image_format:str, quality:int=None):
+        """Sets the format (and quality) used for images submitted from now on."""
+        image_format = image_format.lower().lstrip(".")
+        image_format = "jpg" if image_format == "jpeg" else image_format
+        if image_format not in self.FORMATS:
+            raise ValueError(f"Unsupported image format '{image_format}'.")
+
+        self.image_format = image_format
+        if quality is None:
+            quality = 3 if image_format == "png" else 95
+        self.quality = quality
+
+    @property
+    def extension(self) -> str:
+        """File extension of the current format, e.g. '.jpg'."""
+        return self.FORMATS[self.image_format][0]
+
+    @property
+    def pending(self) -> int:
+        """Images queued but not written yet (approximate)."""
+        return self._queue.qsize()
+
+    def submit(self, image, file_path:str, on_saved=None, transform=None) -> bool:
+        """
+        Queues an image for writing.
+
+        Args:
+            image (numpy.ndarray | QImage): A BGR frame or a QImage. Must not be modified afterwards.
+            file_path (str): Target path; use `extension` to build it.
+            on_saved (callable, optional): Called on the GUI thread with the path once the file is in place.
+            transform (callable, optional): Applied to the image by the writer thread right before encoding,
+                                            e.g. a brightness/contrast adjustment. Must return a new image.
+
+        Returns:
+            bool: False if the queue is full or the pool is closed and the image was dropped.
+        """
+        if not self._workers:
+            return False
+        try:
+            self._queue.put_nowait((image, file_path, self.image_format, self.quality, on_saved, transform, None))
+        except queue.Full:
+            self._count_image("dropped_images")
+            print(f"Warning: Image writer queue is full, '{file_path}' dropped.")
+            return False
+        return True
+
+    def submit_many(self, items:list, on_saved=None, transform=None, on_finished=None) -> WriteJob:
+        """
+        Queues a group of images without dropping any while the writers keep up.
+
+        A helper thread puts the images into the queue, waiting for free space,
+        so the GUI thread does not block. An image is only dropped if no writer
+        takes one for PUT_TIMEOUT seconds or the pool is closed.
+
+        Args:
+            items (list): [(image, file_path), ...]; the images must not be modified afterwards.
+            on_saved (callable, optional): Called on the GUI thread with the path of each written file.
+            transform (callable, optional): Applied to each image right before encoding, see submit().
+            on_finished (callable, optional): Called on the GUI thread with the WriteJob once all images are done.
+
+        Returns:
+            WriteJob: The counters of the group.
+        """
+        job = WriteJob(len(items), on_finished)
+        if not items:
+            self._emit(self.job_finished, job)
+            return job
+
+        image_format, quality = self.image_format, self.quality
+        feeder = threading.Thread(target=self._feed, args=(items, image_format, quality, on_saved, transform, job),
+                                  name="ImageWriterFeeder", daemon=True)
+        self._feeders = [f for f in self._feeders if f.is_alive()] + [feeder]
+        feeder.start()
+        return job
+
+    def close(self, wait:bool=True):
+        """Stops the writer threads after the queued images (and groups still being queued) are written."""
+        if wait:
+            for feeder in self._feeders:
+                feeder.join()
+        workers, self._workers = self._workers, []
+        for _ in workers:
+            self._queue.put(None)
+        if wait:
+            for worker in workers:
+                worker.join()
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            image, file_path, image_format, quality, on_saved, transform, job = item
+            try:
+                if transform is not None:
+                    image = transform(image)
+                data = self.encode(image, image_format, quality)
+                self.write_atomic(file_path, data)
+            except Exception as e:
+                self._count_image("failed_images")
+                print(f"Error saving image '{file_path}': {e}")
+                self._emit(self.save_failed, file_path, str(e))
+                self._count(job, "failed")
+                continue
+            self._emit(self.image_saved, file_path, on_saved)
+            self._count(job, "saved")
+
+    def _feed(self, items:list, image_format:str, quality:int, on_saved, transform, job:WriteJob):
+        for image, file_path in items:
+            try:
+                if not self._workers:
+                    raise queue.Full()
+                self._queue.put((image, file_path, image_format, quality, on_saved, transform, job), timeout=self.PUT_TIMEOUT)
+            except queue.Full:
+                self._count_image("dropped_images")
+                print(f"Warning: No image writer took '{file_path}', dropped.")
+                self._count(job, "dropped")
+
+    def _count_image(self, counter:str):
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _count(self, job:WriteJob, outcome:str):
+        if job is not None and job.count(outcome):
+            self._emit(self.job_finished, job)
+
+    @Slot(object)
+    def _on_job_finished(self, job:WriteJob):
+        if job.on_finished:
+            job.on_finished(job)
+
+    @staticmethod
+    def _emit(signal, *args):
+        # The GUI may already be gone while the last queued images are flushed at exit
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            pass
+
+    @Slot(str, object)
+    def _on_image_saved(self, file_path:str, on_saved):
+        if on_saved:
+            on_saved(file_path)
+
+    @classmethod
+    def encode(cls, image, image_format:str, quality:int) -> bytes:
+        """Encodes a BGR frame or a QImage to the bytes of an image file."""
+        extension, quality_flag, qt_format = cls.FORMATS[image_format]
+        if isinstance(image, QImage):
+            data = QByteArray()
+            buffer = QBuffer(data)
+            buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+            # Qt takes 0-100 for every format; map the PNG compression level onto it
+            qt_quality = 100 - int(quality) * 11 if image_format == "png" else int(quality)
+            if not image.save(buffer, qt_format, qt_quality):
+                raise IOError(f"Cannot encode image as {image_format}")
+            return bytes(data)
+
+        ret, encoded = cv2.imencode(extension, image, [quality_flag, int(quality)])
+        if not ret:
+            raise IOError(f"Cannot encode image as {image_format}")
+        return encoded.tobytes()
+
+    @staticmethod
+    def write_atomic(file_path:str, data:bytes):
+        """Writes `data` to a temporary file next to `file_path` and renames it into place."""
+        # Hidden name in the same folder so the rename stays on one file system;
+        # open() instead of mkstemp() so the file gets the usual umask permissions
+        folder, name = os.path.split(os.path.abspath(file_path))
+        temp_path = os.path.join(folder, f".{name}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
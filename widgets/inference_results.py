@@ -0,0 +1,58 @@
+# widgets/inference_results.py
+
+class CompactResults():
+    """
+    A small, GUI-friendly summary of one YOLO inference.
+
+    Box coordinates are normalized to [0, 1] relative to the frame the model
+    ran on, so they can be drawn over a display image of any size without
+    knowing the inference resolution.
+
+    Attributes:
+        names (dict): Class index -> class name.
+        boxes (list): [(x1, y1, x2, y2, class_id, confidence), ...] for detection models.
+        top1 (int): Index of the top-1 class for classification models, else None.
+        top1conf (float): Confidence of the top-1 class (0-1), else None.
+        top5 (list): [(class_id, confidence), ...] of the five best classes, else [].
+    """
+
+    __slots__ = ("names", "boxes", "top1", "top1conf", "top5")
+
+    def __init__(self, names:dict, boxes:list=None, top1:int=None, top1conf:float=None, top5:list=None):
+        self.names = names
+        self.boxes = boxes or []
+        self.top1 = top1
+        self.top1conf = top1conf
+        self.top5 = top5 or []
+
+    @classmethod
+    def from_ultralytics(cls, results):
+        """Builds a CompactResults from the list returned by calling a YOLO model on one frame."""
+        result = results[0]
+        boxes = []
+        top1 = None
+        top1conf = None
+        top5 = []
+
+        if result.boxes is not None and len(result.boxes):
+            xyxyn = result.boxes.xyxyn.cpu().numpy()
+            class_ids = result.boxes.cls.cpu().numpy().astype(int)
+            confs = result.boxes.conf.cpu().numpy()
+            boxes = [
+                (float(x1), float(y1), float(x2), float(y2), int(c), float(conf))
+                for (x1, y1, x2, y2), c, conf in zip(xyxyn, class_ids, confs)
+            ]
+
+        if result.probs is not None:
+            top1 = int(result.probs.top1)
+            top1conf = float(result.probs.top1conf)
+            top5 = [(int(i), float(c)) for i, c in zip(result.probs.top5, result.probs.top5conf.tolist())]
+
+        return cls(dict(result.names), boxes, top1, top1conf, top5)
+
+    @property
+    def top1_name(self):
+        return self.names.get(self.top1) if self.top1 is not None else None
+
+    def class_name(self, class_id:int) -> str:
+        return self.names.get(class_id, str(class_id))
@@ -0,0 +1,131 @@
+# widgets/inference_scheduler.py
+
+import math
+import threading
+import time
+
+import psutil
+
+
+class AdaptiveInferenceScheduler():
+    """
+    Decides which captured frames are handed to the model.
+
+    Inference runs on every Nth frame, where N is chosen so that the average
+    inference time per displayed frame stays within `budget_ms`:
+
+        N = ceil(mean inference time / budget_ms)
+
+    On top of that N is raised while other processes keep the CPU busy and
+    lowered again once it has headroom, by at most the time-based N itself,
+    and `max_hz` caps the inference rate regardless of N. Frames that are not
+    inferred simply reuse the last results.
+
+    The CPU load excludes this process: counting the inference's own load
+    would raise N, lower the load, lower N again and oscillate.
+    """
+
+    def __init__(
+            self,
+            budget_ms:float=15.0,
+            max_hz:float=None,
+            max_stride:int=30,
+            cpu_high:float=85.0,
+            cpu_low:float=50.0,
+            smoothing:float=0.2
+        ):
+        self.budget_ms = budget_ms
+        self.max_hz = max_hz
+        self.max_stride = max_stride
+        self.cpu_high = cpu_high
+        self.cpu_low = cpu_low
+        self.smoothing = smoothing
+
+        self._process = psutil.Process()
+        self._cpu_count = psutil.cpu_count() or 1
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stride = 1
+            self._cpu_bias = 0
+            self._mean_inference_ms = None
+            self._last_scheduled_seq = None
+            self._last_scheduled_time = 0.0
+            self._cpu_percent = 0.0
+            self._cpu_checked_at = 0.0
+            self.scheduled_frames = 0
+            self.skipped_frames = 0
+
+    def should_infer(self, seq:int, now:float=None) -> bool:
+        """
+        Called by the capture loop for every frame.
+
+        Args:
+            seq (int): Sequence number of the captured frame.
+            now (float, optional): time.perf_counter() of the capture. Defaults to now.
+
+        Returns:
+            bool: True if the frame should be handed to the inference worker.
+        """
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            due = self._last_scheduled_seq is None or seq - self._last_scheduled_seq >= self.stride
+            if due and self.max_hz:
+                due = now - self._last_scheduled_time >= 1.0 / self.max_hz
+
+            if due:
+                self._last_scheduled_seq = seq
+                self._last_scheduled_time = now
+                self.scheduled_frames += 1
+            else:
+                self.skipped_frames += 1
+            return due
+
+    def report_inference(self, seconds:float):
+        """Called by the inference worker after each model call; recomputes the stride."""
+        elapsed_ms = seconds * 1000.0
+        with self._lock:
+            if self._mean_inference_ms is None:
+                self._mean_inference_ms = elapsed_ms
+            else:
+                self._mean_inference_ms += self.smoothing * (elapsed_ms - self._mean_inference_ms)
+
+            stride = math.ceil(self._mean_inference_ms / self.budget_ms) if self.budget_ms > 0 else 1
+            stride = max(1, stride)
+            self._update_cpu_bias(stride)
+            self.stride = min(self.max_stride, stride + self._cpu_bias)
+
+    def _update_cpu_bias(self, stride:int):
+        # cpu_percent() without an interval does not block; sample at most once a second
+        now = time.perf_counter()
+        if now - self._cpu_checked_at < 1.0:
+            return
+        self._cpu_checked_at = now
+        total = psutil.cpu_percent(interval=None)
+        # Process.cpu_percent() is relative to one core (up to 100% * cores)
+        own = self._process.cpu_percent(interval=None) / self._cpu_count
+        self._cpu_percent = max(0.0, total - own)
+
+        if self._cpu_percent > self.cpu_high:
+            self._cpu_bias += 1
+        elif self._cpu_percent < self.cpu_low and self._cpu_bias > 0:
+            self._cpu_bias -= 1
+        # Other load can at most double the stride; a shorter inference lowers the cap right away
+        self._cpu_bias = min(self._cpu_bias, stride)
+
+    def get_stats(self) -> dict:
+        """
+        Returns:
+            dict: current 'stride' (N), 'mean_inference_ms', 'cpu_percent' (other processes), and the
+                  'scheduled' / 'skipped' frame counts.
+        """
+        with self._lock:
+            return {
+                "stride": self.stride,
+                "mean_inference_ms": self._mean_inference_ms,
+                "cpu_percent": self._cpu_percent,
+                "scheduled": self.scheduled_frames,
+                "skipped": self.skipped_frames,
+            }
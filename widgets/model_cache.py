@@ -0,0 +1,104 @@
+# widgets/model_cache.py
+
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from ultralytics import YOLO
+
+from PySide6.QtCore import QThread, Signal
+
+
+class ModelCache():
+    """
+    LRU cache of loaded and warmed-up YOLO models.
+
+    Models are keyed by (absolute path, mtime), so retraining into the same
+    weights file loads the new weights instead of returning the old model.
+    """
+
+    def __init__(self, max_size:int=3):
+        self.max_size = max_size
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    @staticmethod
+    def make_key(model_path:str):
+        path = os.path.abspath(model_path)
+        return path, os.path.getmtime(path)
+
+    def get(self, model_path:str):
+        """Returns the cached model for `model_path`, or None if it is not loaded yet."""
+        key = self.make_key(model_path)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+            return model
+
+    def get_or_load(self, model_path:str):
+        """
+        Returns a ready-to-use model, loading and warming it up on the calling thread on a miss.
+        Concurrent calls for the same model share one load.
+        """
+        key = self.make_key(model_path)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                return model
+            event = self._loading.get(key)
+            owner = event is None
+            if owner:
+                event = self._loading[key] = threading.Event()
+
+        if not owner:
+            event.wait()
+            with self._lock:
+                model = self._models.get(key)
+            if model is None:
+                raise RuntimeError(f"Loading '{model_path}' failed in another thread.")
+            return model
+
+        try:
+            model = YOLO(key[0])
+            self.warm_up(model)
+            with self._lock:
+                self._models[key] = model
+                self._models.move_to_end(key)
+                while len(self._models) > self.max_size:
+                    self._models.popitem(last=False)
+            return model
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+            event.set()
+
+    @staticmethod
+    def warm_up(model):
+        """Runs one dummy inference so the first live frame does not pay for lazy initialization."""
+        imgsz = model.overrides.get("imgsz")
+        imgsz = imgsz if isinstance(imgsz, int) else 640
+        model(np.zeros((imgsz, imgsz, 3), dtype=np.uint8), verbose=False, imgsz=imgsz)
+
+
+class ModelLoader(QThread):
+    """Loads a model through a ModelCache off the GUI thread."""
+    model_loaded = Signal(str, object)
+    load_failed = Signal(str, str)
+
+    def __init__(self, cache:ModelCache, model_path:str, parent=None):
+        super().__init__(parent)
+
+        self.cache = cache
+        self.model_path = model_path
+
+    def run(self):
+        try:
+            model = self.cache.get_or_load(self.model_path)
+        except Exception as e:
+            self.load_failed.emit(self.model_path, str(e))
+            return
+        self.model_loaded.emit(self.model_path, model)
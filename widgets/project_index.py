@@ -0,0 +1,227 @@
+# widgets/project_index.py
+
+import json
+import os
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+
+
+class ProjectIndex(QObject):
+    """
+    In-memory listing of a project folder, kept current without rescanning.
+
+    On open the index loads its snapshot (<project>/.project_index.json). If
+    the modification time of the data folder still matches the snapshot, the
+    snapshot is used as is; otherwise the folder is scanned once and compared
+    with it. From then on a QFileSystemWatcher reports changes: the changed
+    folder is rescanned with os.scandir() (debounced, so a burst of shots
+    causes one rescan) and the differences are emitted as signals.
+
+    Listing call sites query the index (image_files(), label_files(),
+    subfolders()) instead of the disk.
+    """
+    files_added = Signal(list)      # names of files that appeared in the data folder
+    files_removed = Signal(list)    # names of files that disappeared from the data folder
+    files_modified = Signal(list)   # names of files whose size or mtime changed
+    folders_changed = Signal(str)   # 'dataset' or 'trained_models'
+
+    SNAPSHOT_FILE = ".project_index.json"
+    SNAPSHOT_VERSION = 1
+    SUBFOLDER_KINDS = ("dataset", "trained_models")
+    RESCAN_DELAY_MS = 200
+    SAVE_DELAY_MS = 2000
+
+    def __init__(self, project_dir:str, parent=None):
+        super().__init__(parent)
+
+        self.project_dir = project_dir
+        self.data_dir = os.path.join(project_dir, "data")
+        self.snapshot_path = os.path.join(project_dir, self.SNAPSHOT_FILE)
+
+        self._entries = {}       # file name -> [mtime_ns, size] for the files in data_dir
+        self._data_mtime = None
+        self._subfolders = {kind: [] for kind in self.SUBFOLDER_KINDS}
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._pending_dirs = set()
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(self.RESCAN_DELAY_MS)
+        self._rescan_timer.timeout.connect(self._rescan_pending)
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(self.SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.save_snapshot)
+
+        self.open()
+
+    # --- Queries ---
+
+    def files(self, suffixes:tuple=None) -> list:
+        """Sorted names of the files in the data folder, optionally only those ending in `suffixes`."""
+        if suffixes is None:
+            return sorted(self._entries)
+        return sorted(name for name in self._entries if name.lower().endswith(suffixes))
+
+    def image_files(self) -> list:
+        return self.files(IMAGE_EXTENSIONS)
+
+    def label_files(self) -> list:
+        """The detection label files (.txt) in the data folder."""
+        return self.files(('.txt',))
+
+    def annotated_images(self) -> set:
+        """The image files that have a detection label file with the same stem."""
+        label_stems = {os.path.splitext(name)[0] for name in self._entries if name.endswith('.txt')}
+        return {name for name in self.image_files() if os.path.splitext(name)[0] in label_stems}
+
+    def has_file(self, name:str) -> bool:
+        return name in self._entries
+
+    def subfolders(self, kind:str) -> list:
+        """Sorted subfolder names of <project>/dataset or <project>/trained_models."""
+        return list(self._subfolders.get(kind, []))
+
+    # --- Lifecycle ---
+
+    def open(self):
+        """Loads the snapshot, reconciles it with the disk and starts watching."""
+        snapshot = self._load_snapshot()
+        try:
+            data_mtime = os.stat(self.data_dir).st_mtime_ns
+        except OSError:
+            data_mtime = None
+
+        if snapshot and data_mtime is not None and snapshot.get("data_mtime") == data_mtime:
+            self._entries = {name: list(stat) for name, stat in snapshot.get("entries", {}).items()}
+            self._data_mtime = data_mtime
+        else:
+            self._entries = dict(snapshot.get("entries", {})) if snapshot else {}
+            self._rescan_data()
+
+        for kind in self.SUBFOLDER_KINDS:
+            self._rescan_subfolders(kind)
+        self._update_watches()
+
+    def close(self):
+        """Stops watching and writes the snapshot."""
+        self._rescan_timer.stop()
+        if self._pending_dirs:
+            self._rescan_pending()
+        watched = self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+        self.save_snapshot()
+
+    def refresh(self):
+        """Rescans everything now, e.g. after changes the watcher cannot see (network drives)."""
+        self._rescan_data()
+        for kind in self.SUBFOLDER_KINDS:
+            self._rescan_subfolders(kind)
+        self._update_watches()
+
+    def save_snapshot(self):
+        self._save_timer.stop()
+        snapshot = {
+            "version": self.SNAPSHOT_VERSION,
+            "data_mtime": self._data_mtime,
+            "entries": self._entries,
+        }
+        temp_path = self.snapshot_path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f)
+            os.replace(temp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"Error saving project index '{self.snapshot_path}': {e}")
+
+    # --- Internals ---
+
+    def _load_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Ignoring project index '{self.snapshot_path}': {e}")
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get("version") != self.SNAPSHOT_VERSION:
+            return None
+        return snapshot
+
+    def _update_watches(self):
+        # Watch the project folder too, so dataset/ and trained_models/ are picked up once they are created
+        paths = [self.project_dir, self.data_dir] + [os.path.join(self.project_dir, kind) for kind in self.SUBFOLDER_KINDS]
+        watched = set(self._watcher.directories())
+        missing = [path for path in paths if path not in watched and os.path.isdir(path)]
+        if missing:
+            self._watcher.addPaths(missing)
+
+    def _on_directory_changed(self, path:str):
+        self._pending_dirs.add(path)
+        self._rescan_timer.start()
+
+    def _rescan_pending(self):
+        pending, self._pending_dirs = self._pending_dirs, set()
+        for path in pending:
+            if path == self.data_dir:
+                self._rescan_data()
+            elif path == self.project_dir:
+                for kind in self.SUBFOLDER_KINDS:
+                    self._rescan_subfolders(kind)
+            else:
+                kind = os.path.basename(path)
+                if kind in self.SUBFOLDER_KINDS:
+                    self._rescan_subfolders(kind)
+        # Folders that were removed and created again must be watched again
+        self._update_watches()
+
+    def _rescan_data(self):
+        try:
+            data_mtime = os.stat(self.data_dir).st_mtime_ns
+            entries = {}
+            with os.scandir(self.data_dir) as it:
+                for entry in it:
+                    # Hidden files include the image writer's temporary files
+                    if entry.name.startswith(".") or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    entries[entry.name] = [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            data_mtime = None
+            entries = {}
+
+        old = self._entries
+        added = [name for name in entries if name not in old]
+        removed = [name for name in old if name not in entries]
+        modified = [name for name, stat in entries.items() if name in old and old[name] != stat]
+        self._entries = entries
+        self._data_mtime = data_mtime
+
+        if added:
+            self.files_added.emit(sorted(added))
+        if removed:
+            self.files_removed.emit(sorted(removed))
+        if modified:
+            self.files_modified.emit(sorted(modified))
+        if added or removed or modified:
+            self._save_timer.start()
+
+    def _rescan_subfolders(self, kind:str):
+        folder = os.path.join(self.project_dir, kind)
+        subfolders = []
+        if os.path.isdir(folder):
+            try:
+                with os.scandir(folder) as it:
+                    subfolders = sorted(entry.name for entry in it if entry.is_dir())
+            except OSError as e:
+                print(f"Error accessing folder '{folder}': {e}")
+
+        if subfolders != self._subfolders.get(kind):
+            self._subfolders[kind] = subfolders
+            self.folders_changed.emit(kind)
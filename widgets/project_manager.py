@@ -12,6 +12,10 @@ from widgets.project_manager_ui import Ui_FormProjectManager
 from widgets.create_project_dialog import CreateProjectDialog
 from widgets.annotation_manager import AnnotationWidget
 from widgets.video_stream_manager import VideoStreamer
+from widgets.image_writer import ImageWriterPool
+from widgets.file_table_model import FileTableModel, replace_with_file_view
+from widgets.project_index import ProjectIndex
+from widgets.annotation_repository import open_annotation_repository
 
 from image_classifer import image_classifier
 from object_detector import object_detector
@@ -37,6 +41,14 @@ class projectManagerWidget(QWidget):
         self.my_video = my_video
 
         self.project_data = None
+        self.project_index = None
+        self.annotation_repo = None
+        # Shots are encoded and written in the background, shared by all projects opened in this window;
+        # each project sets its own "image_format" / "image_quality", see set_image_format()
+        self.image_writer = ImageWriterPool(parent=self)
+        # The file tables are views on models that are updated in place, never rebuilt item by item
+        self.ui.tableViewFilesOD = replace_with_file_view(self.ui.tableWidgetFilesOD, FileTableModel(self))
+        self.ui.tableViewFilesIC = replace_with_file_view(self.ui.tableWidgetFilesIC, FileTableModel(self))
         self.ui.stackedWidgetProject.setCurrentIndex(0)
 
         self.ui.tabWidgetIC.setCurrentIndex(0)
@@ -44,6 +56,13 @@ class projectManagerWidget(QWidget):
         self.ui.pushButtonCreateProject.clicked.connect(self.open_create_project_dialog)
         self.ui.pushButtonOpenProject.clicked.connect(self.open_project_file)
 
+    def set_video_streamer(self, my_video: VideoStreamer):
+        """Hands a (re)started VideoStreamer to the widget and the active project."""
+        self.my_video = my_video
+        for project in (getattr(self, "object_detector", None), getattr(self, "image_classifier", None)):
+            if project:
+                project.my_video = my_video
+
     def open_create_project_dialog(self):
         dialog = CreateProjectDialog(self)
         if dialog.exec():
@@ -79,7 +98,42 @@ class projectManagerWidget(QWidget):
             project_type = self.project_data.get("type")
             self.set_proejct_screen(project_type)
 
+    def open_project_index(self):
+        """Replaces the index and the labels of the previous project with those of the current project."""
+        self.close_project_index()
+        project_dir = self.project_data.get("directory") if self.project_data else None
+        if project_dir:
+            self.project_index = ProjectIndex(project_dir, parent=self)
+            self.annotation_repo = open_annotation_repository(self.project_data, self.project_index, parent=self)
+
+    def close_project_index(self):
+        # The project page of the previous project still holds the repository; detach it first
+        for name in ("object_detector", "image_classifier"):
+            project = getattr(self, name, None)
+            if project:
+                project.close()
+                setattr(self, name, None)
+        if self.project_index:
+            self.project_index.close()
+            self.project_index.deleteLater()
+            self.project_index = None
+        if self.annotation_repo:
+            self.annotation_repo.close()
+            self.annotation_repo = None
+
+    def set_image_format(self):
+        """Writes shots in the project's "image_format" (default: jpg) and "image_quality"."""
+        image_format = self.project_data.get("image_format", "jpg") if self.project_data else "jpg"
+        quality = self.project_data.get("image_quality") if self.project_data else None
+        try:
+            self.image_writer.set_format(image_format, quality)
+        except ValueError as e:
+            print(f"{e} Saving shots as jpg.")
+            self.image_writer.set_format("jpg")
+
     def set_proejct_screen(self, project_type):
+        self.open_project_index()
+        self.set_image_format()
         if project_type == "Object Detection":
             self.ui.stackedWidgetProject.setCurrentIndex(1)
             self.object_detector = object_detector(
@@ -87,6 +141,9 @@ class projectManagerWidget(QWidget):
                 projec_data=self.project_data, 
                 my_annotator=self.my_annotator,
                 my_video=self.my_video,
+                image_writer=self.image_writer,
+                project_index=self.project_index,
+                annotation_repo=self.annotation_repo,
                 parent=self
             )
             self.object_detector.update_file_list()
@@ -97,6 +154,9 @@ class projectManagerWidget(QWidget):
                 projec_data=self.project_data, 
                 my_annotator=self.my_annotator,
                 my_video=self.my_video,
+                image_writer=self.image_writer,
+                project_index=self.project_index,
+                annotation_repo=self.annotation_repo,
                 parent=self
             )
             self.image_classifier.update_file_list()
@@ -0,0 +1,119 @@
+# widgets/shot_taker.py
+
+import os
+import time
+import datetime
+
+from PySide6.QtWidgets import QMessageBox
+
+
+class ShotTakerMixin():
+    """
+    Shot button handling shared by the project pages (image_classifier, object_detector).
+
+    Holding the shot button records a burst from the streamer's frame ring at
+    the camera rate, starting with the frames from just before the press; a
+    short click takes a single shot. Images go through the ImageWriterPool and
+    show up in the file list once they are written.
+
+    Images that cannot be written (writer queue full, disk error) are
+    reported in a message box, not only on the console.
+
+    The class using it provides `project_data`, `my_annotator`, `my_video`,
+    `image_writer`, `file_model` and `my_parent`, and calls init_shot_taking()
+    in __init__.
+    """
+
+    def init_shot_taking(self):
+        self.burst_hold_seconds = 0.2
+        self.burst_pre_trigger_seconds = 0.5
+        self.burst_max_fps = None # None: every camera frame
+        self._burst_started_at = None
+
+    def start_taking_shots(self):
+        self._burst_started_at = time.time()
+        if self.my_video and self.my_video.isRunning():
+            self.my_video.start_burst(self.burst_pre_trigger_seconds)
+
+    def stop_taking_shots(self):
+        started_at, self._burst_started_at = self._burst_started_at, None
+        if not (self.my_video and self.my_video.isRunning()):
+            self.take_shot()
+            return
+
+        frames = self.my_video.stop_burst(self.burst_max_fps)
+        if started_at is None or time.time() - started_at < self.burst_hold_seconds or not frames:
+            self.take_shot()
+        else:
+            self.save_frames(frames, self.my_video.frame_adjustment())
+
+    def get_data_dir(self):
+        """Returns the project's data folder, creating it if needed, or None."""
+        if not self.project_data:
+            return None
+
+        data_dir = f"{self.project_data.get('directory')}/data"
+        try:
+            os.makedirs(data_dir, exist_ok=True)
+        except OSError as e:
+            print(f"Error creating folder '{data_dir}': {e}")
+            return None
+        return data_dir
+
+    def take_shot(self):
+        if self.project_data and self.my_annotator:
+            data_dir = self.get_data_dir()
+            if data_dir:
+                # timestamp = int(time.time() * 1000)
+                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+                file_path = os.path.join(data_dir, f"shot_{timestamp}{self.image_writer.extension}")
+                # The live preview is scaled to the widget; save the full-resolution camera frame instead
+                frame = self.my_video.get_snapshot_frame() if self.my_video and self.my_video.isRunning() else None
+                if frame is None:
+                    frame = self.my_annotator.current_pixmap.toImage()
+                if not self.image_writer.submit(frame, file_path, on_saved=self.add_file_row):
+                    QMessageBox.warning(self.my_parent, "Take Shot",
+                                        "The shot was dropped because earlier images are still being written.")
+
+    def save_frames(self, frames:list, adjust=None):
+        """
+        Queues burst frames for writing, named after their capture time. The writer takes
+        them as fast as it can write them, so a burst larger than its queue is kept in full.
+
+        Args:
+            frames (list): [(frame, timestamp), ...] raw frames as returned by VideoStreamer.stop_burst().
+            adjust (callable, optional): Brightness/contrast applied by the writer to one frame at a time,
+                                         see VideoStreamer.frame_adjustment().
+        """
+        data_dir = self.get_data_dir()
+        if not data_dir:
+            return
+
+        items = []
+        for frame, timestamp in frames:
+            name = datetime.datetime.fromtimestamp(timestamp).strftime("%Y%m%d_%H%M%S_%f")[:-3]
+            items.append((frame, os.path.join(data_dir, f"shot_{name}{self.image_writer.extension}")))
+        overflow = self.my_video.burst_overflow if self.my_video else 0
+        self.image_writer.submit_many(items, on_saved=self.add_file_row, transform=adjust,
+                                      on_finished=lambda job: self.on_burst_written(job, overflow))
+        print(f"Burst of {len(items)} images queued for {data_dir}")
+
+    def on_burst_written(self, job, overflow:int=0):
+        """Reports a burst whose images were not all saved, or that hit the burst size limit."""
+        print(f"Burst written: {job.saved}/{job.total} images saved")
+        if job.saved == job.total and not overflow:
+            return
+
+        lines = [f"{job.saved} of {job.total} burst images were saved."]
+        if job.dropped:
+            lines.append(f"{job.dropped} images were dropped because the disk could not keep up.")
+        if job.failed:
+            lines.append(f"{job.failed} images could not be written (see the console).")
+        if overflow:
+            lines.append(f"The burst reached its size limit; {overflow} more frames were not recorded.")
+        QMessageBox.warning(self.my_parent, "Burst", "\n".join(lines))
+
+    def add_file_row(self, file_path:str):
+        """Adds one saved file to the file list instead of rescanning the folder."""
+        print(f"Image saved to {file_path}")
+        self.file_model.add_files([os.path.basename(file_path)])
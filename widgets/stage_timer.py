@@ -0,0 +1,115 @@
+# widgets/stage_timer.py
+
+import threading
+import time
+from collections import deque
+
+
+class RollingHistogram():
+    """Keeps the last `size` samples (in milliseconds) and answers percentile queries."""
+
+    def __init__(self, size:int=300):
+        self._samples = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, value_ms:float):
+        self._samples.append(value_ms)
+        self.count += 1
+
+    def clear(self):
+        self._samples.clear()
+        self.count = 0
+
+    def summary(self) -> dict:
+        """
+        Returns:
+            dict: 'count' (all-time samples), 'mean', 'p50', 'p95', 'p99' and 'max' over
+                  the rolling window, in milliseconds. Empty dict if there are no samples.
+        """
+        samples = sorted(self._samples)
+        if not samples:
+            return {}
+
+        last = len(samples) - 1
+        return {
+            "count": self.count,
+            "mean": sum(samples) / len(samples),
+            "p50": samples[round(last * 0.50)],
+            "p95": samples[round(last * 0.95)],
+            "p99": samples[round(last * 0.99)],
+            "max": samples[last],
+        }
+
+
+class PipelineTimer():
+    """
+    Per-stage latency measurement for the live pipeline.
+
+    Usage in a loop:
+        t = timer.start()
+        ...capture...
+        t = timer.lap("capture", t)
+        ...resize...
+        t = timer.lap("resize", t)
+
+    When the timer is disabled start() returns None and lap() returns
+    immediately, so the instrumentation costs one attribute check per stage.
+    """
+
+    STAGES = (
+        "capture", "resize", "contrast", "rgb_convert", "overlay",
+        "inference_prep", "inference", "signal_hop", "end_to_end",
+    )
+
+    def __init__(self, enabled:bool=False, window:int=300):
+        self.enabled = enabled
+        self._window = window
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def start(self):
+        """Returns a start timestamp, or None when the timer is disabled."""
+        return time.perf_counter() if self.enabled else None
+
+    def lap(self, stage:str, started):
+        """Records the time since `started` for `stage` and returns a new start timestamp."""
+        if started is None or not self.enabled:
+            return None
+        now = time.perf_counter()
+        self.record(stage, (now - started) * 1000.0)
+        return now
+
+    def record(self, stage:str, value_ms:float):
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, RollingHistogram(self._window))
+        histogram.add(value_ms)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Returns:
+            dict: {stage: summary} for every stage that has samples, in pipeline order.
+                  See RollingHistogram.summary() for the summary keys.
+        """
+        with self._lock:
+            histograms = dict(self._histograms)
+
+        order = {stage: i for i, stage in enumerate(self.STAGES)}
+        stats = {}
+        for stage in sorted(histograms, key=lambda s: order.get(s, len(order))):
+            summary = histograms[stage].summary()
+            if summary:
+                stats[stage] = summary
+        return stats
+
+    def format_stats(self) -> str:
+        """Returns the stats as fixed-width text lines, e.g. for an on-screen HUD."""
+        lines = [f"{'stage':<15}{'p50':>7}{'p95':>7}{'p99':>7} ms"]
+        for stage, summary in self.get_stats().items():
+            lines.append(f"{stage:<15}{summary['p50']:7.1f}{summary['p95']:7.1f}{summary['p99']:7.1f}")
+        return "\n".join(lines)
@@ -1,26 +1,79 @@
 # functionLib/video_stream_manager.py
 
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2
 
-from ultralytics import YOLO
 
-from PySide6.QtCore import QThread, Signal, Slot, QTimer
+from PySide6.QtCore import Qt, QThread, Signal, Slot, QTimer
 from PySide6.QtGui import QImage, QPixmap
 from PySide6.QtWidgets import QWidget, QApplication
 
 from widgets.video_stream_manager_ui import Ui_FormCameraControl
+from widgets.frame_mailbox import LatestFrameMailbox, CoalescingFrameChannel
+from widgets.frame_buffers import FrameBufferPool, reuse_buffer
+from widgets.frame_ring import FrameRingBuffer
+from widgets.frame_geometry import ProcessingGeometry
+from widgets.frame_lut import BrightnessContrastLUT
+from widgets.stage_timer import PipelineTimer
+from widgets.inference_scheduler import AdaptiveInferenceScheduler
+from widgets.change_gate import ChangeGate
+from widgets.model_cache import ModelCache, ModelLoader
+from widgets.frame_sources import FrameSource, CameraSource, PACING_FAST
+from widgets.inference_results import CompactResults
 from PySide6.QtCore import QSettings
 
+class CameraProbeWorker(QThread):
+    """
+    Probes camera indices concurrently in a thread pool, off the GUI thread.
+    Indices in `skip_indices` (e.g. the camera currently streaming) are reported
+    as available without being opened again.
+    """
+    cameras_found = Signal(object) # Emits dict {index: name}
+
+    def __init__(self, max_index=10, max_workers=4, skip_indices=(), parent=None):
+        super().__init__(parent)
+
+        self.max_index = max_index
+        self.max_workers = max_workers
+        self.skip_indices = set(skip_indices)
+
+    def run(self):
+        indices = [i for i in range(self.max_index) if i not in self.skip_indices]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            opened = dict(zip(indices, pool.map(self.probe_camera, indices)))
+        opened.update({i: True for i in self.skip_indices})
+
+        available_cameras = {i: f"Camera {i}" for i in sorted(opened) if opened[i]}
+        self.cameras_found.emit(available_cameras)
+
+    @staticmethod
+    def probe_camera(index:int) -> bool:
+        cap = cv2.VideoCapture(index)
+        try:
+            return cap.isOpened()
+        finally:
+            cap.release()
+
 class VideoControlWidget(QWidget):
     alpha_beta_changed = Signal(float, int)
     switch_camera_button_clicked = Signal(int)
     resolution_changed = Signal(int, int)
+    camera_list_updated = Signal(object) # Emits dict {index: name} after a background probe
+
+    CAMERA_SETTINGS_KEY = "Camera/last_known_devices"
 
     def __init__(self, parent=None):
         super().__init__(parent)
 
         self.ui = Ui_FormCameraControl()
         self.ui.setupUi(self)
+
+        self._camera_probe = None
+        self._active_camera_index = None
         
         self.ui.lineEditAlpha.setText(str(float(self.ui.horizontalSliderAlpha.value()/10)))
         self.ui.lineEditBeta.setText(str(self.ui.horizontalSliderBeta.value()))
@@ -51,21 +104,64 @@ class VideoControlWidget(QWidget):
         self.resolution_changed.emit(w, h)
 
     def populate_camera_list(self):
-        """Detects available cameras and populates the combo box."""
+        """
+        Shows the last known cameras immediately and refreshes the list in the background.
+        camera_list_updated is emitted once the probe has finished.
+        """
+        self._set_camera_items(self.load_cached_cameras())
+        # Probe once the owner had a chance to start streaming from the cached camera
+        QTimer.singleShot(0, self.refresh_camera_list)
+
+    def refresh_camera_list(self):
+        """Starts a background probe of the camera indices unless one is already running."""
+        if self._camera_probe and self._camera_probe.isRunning():
+            return
+
+        skip = () if self._active_camera_index is None else (self._active_camera_index,)
+        self._camera_probe = CameraProbeWorker(skip_indices=skip, parent=self)
+        self._camera_probe.cameras_found.connect(self.on_cameras_found)
+        self._camera_probe.start()
+
+    def stop_camera_probe(self):
+        if self._camera_probe and self._camera_probe.isRunning():
+            self._camera_probe.wait()
+
+    def set_active_camera_index(self, camera_index):
+        """Marks the camera that is currently streaming so the probe does not reopen it."""
+        self._active_camera_index = camera_index
+
+    @Slot(object)
+    def on_cameras_found(self, available_cameras:dict):
+        self._set_camera_items(available_cameras)
+        self.save_cached_cameras(available_cameras)
+        self.camera_list_updated.emit(available_cameras)
+
+    def _set_camera_items(self, available_cameras:dict):
+        """Fills the combo box, keeping the current selection if it is still available."""
+        current_index = self.ui.comboBoxCameras.currentData()
+        self.ui.comboBoxCameras.blockSignals(True)
         self.ui.comboBoxCameras.clear()
-        available_cameras = self.get_available_cameras()
         for index, name in available_cameras.items():
             self.ui.comboBoxCameras.addItem(f"{name} ({index})", userData=index)
+        if current_index is not None:
+            row = self.ui.comboBoxCameras.findData(current_index)
+            if row >= 0:
+                self.ui.comboBoxCameras.setCurrentIndex(row)
+        self.ui.comboBoxCameras.blockSignals(False)
+
+    def load_cached_cameras(self) -> dict:
+        """Returns the camera list found by the previous probe, or an empty dict."""
+        settings = QSettings("Ohmy", "ImClass")
+        try:
+            cached = json.loads(settings.value(self.CAMERA_SETTINGS_KEY, "{}"))
+            return {int(index): name for index, name in cached.items()}
+        except (TypeError, ValueError, AttributeError) as e:
+            print(f"Ignoring invalid cached camera list: {e}")
+            return {}
 
-    def get_available_cameras(self):
-        """Returns a dictionary of available camera indices and their names."""
-        available_cameras = {}
-        for i in range(10):  # Check up to 10 camera indices
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                available_cameras[i] = f"Camera {i}"
-                cap.release()
-        return available_cameras
+    def save_cached_cameras(self, available_cameras:dict):
+        settings = QSettings("Ohmy", "ImClass")
+        settings.setValue(self.CAMERA_SETTINGS_KEY, json.dumps({str(i): n for i, n in available_cameras.items()}))
 
     def on_switch_camera_clicked(self):
         camera_index = self.ui.comboBoxCameras.currentData()
@@ -116,118 +212,493 @@ class VideoControlWidget(QWidget):
 
         return current_settings
 
+class InferenceWorker(QThread):
+    """
+    Runs the YOLO model on the newest frame handed over by a VideoStreamer,
+    so that a slow model never throttles the camera capture loop.
+    """
+
+    def __init__(self, streamer, parent=None):
+        super().__init__(parent)
+
+        self.streamer = streamer
+        self._running = True
+
+    def run(self):
+        self._running = True
+        mailbox = self.streamer.frame_mailbox
+        timer = self.streamer.pipeline_timer
+        contrast_buffer = None
+        while self._running:
+            frame, seq, _ = mailbox.take(timeout=0.1)
+            if frame is None:
+                continue
+
+            model = self.streamer.this_model
+            if not self.streamer.is_detecting or model is None:
+                continue
+
+            t = timer.start()
+            # Resize straight from the camera frame to the model input size
+            inference_frame = self.streamer.geometry.to_inference(frame)
+            # Adjust in place when the frame is our own resize buffer, never the camera frame
+            lut = self.streamer.brightness_lut
+            if inference_frame is frame and not lut.is_identity:
+                contrast_buffer = reuse_buffer(contrast_buffer, frame)
+                inference_frame = lut.apply(frame, dst=contrast_buffer)
+            else:
+                inference_frame = lut.apply(inference_frame, dst=inference_frame)
+            t = timer.lap("inference_prep", t)
+
+            # Static scene: the previous results still describe this frame
+            gate = self.streamer.change_gate
+            if gate.is_unchanged(inference_frame):
+                self.streamer.reuse_results(seq)
+                continue
+
+            try:
+                started = time.perf_counter()
+                results = model(inference_frame, verbose=False, imgsz=self.streamer.geometry.imgsz)
+                self.streamer.inference_scheduler.report_inference(time.perf_counter() - started)
+                # Only the compact summary leaves this thread; the GUI draws it as an overlay
+                results = CompactResults.from_ultralytics(results)
+                timer.lap("inference", t)
+            except Exception as e:
+                # Not a camera failure: keep streaming and try again on the next frame
+                print(f"Inference error: {e}")
+                continue
+
+            gate.mark_inferred(inference_frame)
+            self.streamer.store_results(results, seq)
+
+    def stop(self):
+        self._running = False
+        self.streamer.frame_mailbox.close()
+        self.wait()
+
 class VideoStreamer(QThread):
     """
     A QThread to continuously capture frames from a camera and emit them.
+
+    Capture and inference are decoupled: this thread reads and displays frames
+    at the camera rate and posts each frame into a single-slot mailbox, while
+    an InferenceWorker runs the model on whatever frame is newest. The latest
+    results are sent as CompactResults with every displayed frame until fresher
+    ones arrive; the AnnotationWidget draws them as vector overlays, so no
+    annotated copy of the frame is ever rendered here.
+
+    Displayed frames are already scaled to the preview widget size (see
+    set_display_size), so the GUI thread can show them without rescaling.
+    The full-resolution camera frame is kept aside for snapshots, see
+    get_snapshot_frame(), and the last frames are kept in a ring buffer for
+    bursts with pre-trigger frames, see start_burst()/stop_burst().
+
+    Frames reach the GUI through a CoalescingFrameChannel: if painting falls
+    behind, undelivered frames are replaced by newer ones instead of piling
+    up in the event queue, and frame_ready is emitted on the GUI thread for
+    the newest frame only. set_max_display_fps() caps the refresh rate.
+
+    The loop does not allocate per frame: resizing writes into the geometry's
+    buffers and the RGB conversion into a buffer from buffer_pool. The QImage
+    sent with frame_ready wraps that buffer without a copy and is only valid
+    while the frame_ready slots run; the buffer goes back to the pool right
+    after delivery (or when the frame is dropped), so slots that keep the
+    image must copy it, as QPixmap.fromImage() does.
     """
-    frame_ready = Signal(QImage, QImage, object, bool)
+    frame_ready = Signal(QImage, QImage, object, bool, object) # image, detection image (unused, None), CompactResults, is_still_image, frame_info
     error_occurred = Signal(str)
+    model_ready = Signal(str)       # model path, emitted once the model is swapped in
+    model_failed = Signal(str, str) # model path, error message
+    _frame_posted = Signal()        # internal: a frame is waiting in display_channel
+
+    # Shared by all streamers so a restarted stream does not reload its model
+    model_cache = ModelCache()
 
     this_alph = 1.0
     this_beta = 0
 
-    def __init__(self, camera_index=0, width=640, height=480, parent=None):
+    def __init__(self, camera_index=0, width=640, height=480, display_size=None, source:FrameSource=None, parent=None):
         super().__init__(parent)
         
         self.camera_index = camera_index
         self.frame_width = width
         self.frame_height = height
         self._running = True
-        self.cap = None
+        # The camera is the default source; video files, image folders and synthetic frames can replace it
+        self.source = source if source is not None else CameraSource(camera_index, width, height)
         self.this_model = None
         self.is_detecting = False
 
+        self.geometry = ProcessingGeometry(display_size=display_size)
+        self.brightness_lut = BrightnessContrastLUT(self.this_alph, self.this_beta)
+        self.pipeline_timer = PipelineTimer()
+        self.inference_scheduler = AdaptiveInferenceScheduler()
+        self.change_gate = ChangeGate()
+        self._model_loaders = []
+        self._requested_model_path = None
+
+        self.frame_mailbox = LatestFrameMailbox()
+        self._latest_frame = None # full-resolution camera frame, never modified in place
+        self.frame_ring = FrameRingBuffer()
+
+        self.buffer_pool = FrameBufferPool()
+        self.display_channel = CoalescingFrameChannel(on_drop=self._release_display_item)
+        self.max_display_fps = None
+        self._last_delivery = 0.0
+        self._delivery_timer = QTimer(self)
+        self._delivery_timer.setSingleShot(True)
+        self._delivery_timer.timeout.connect(self._deliver_pending_frame)
+        # Queued explicitly: run() posts from the capture thread, delivery happens on the GUI thread
+        self._frame_posted.connect(self._deliver_pending_frame, Qt.ConnectionType.QueuedConnection)
+        self._results_lock = threading.Lock()
+        self._latest_results = None
+        self._latest_results_seq = 0
+
+        self.captured_frames = 0
+        self.inferred_frames = 0
+        self.stale_frames = 0
+
     def set_resolution(self, width, height):
         self.frame_width = width
         self.frame_height = height
+        if isinstance(self.source, CameraSource):
+            self.source.frame_width = width
+            self.source.frame_height = height
         if self.isRunning():
             self.stop()
             self.start()
 
+    @Slot(int, int)
+    def set_display_size(self, width:int, height:int):
+        """
+        Sets the preview widget size; frames are delivered scaled to fit it from the next frame on.
+        Safe to call from the GUI thread while the stream is running.
+        """
+        self.geometry.set_display_bounds(width, height)
+
+    def set_max_display_fps(self, fps:float=None):
+        """Caps how often frame_ready is emitted; None or 0 delivers every frame the GUI can keep up with."""
+        self.max_display_fps = fps or None
+
+    @Slot()
+    def _deliver_pending_frame(self):
+        # GUI thread: emit frame_ready for the newest pending frame, at most max_display_fps times per second
+        if self.max_display_fps:
+            wait = self._last_delivery + 1.0 / self.max_display_fps - time.perf_counter()
+            if wait > 0:
+                # Leave the frame pending; frames posted meanwhile replace it without another notification
+                if not self._delivery_timer.isActive():
+                    self._delivery_timer.start(max(1, int(wait * 1000 + 0.5)))
+                return
+
+        item = self.display_channel.take()
+        if item is None:
+            return
+        self._last_delivery = time.perf_counter()
+        qt_image, qt_dimage, results, frame_info, _buffer = item
+        try:
+            self.frame_ready.emit(qt_image, qt_dimage, results, False, frame_info)
+        finally:
+            self._release_display_item(item)
+
+    def _release_display_item(self, item):
+        # The last element of a display_channel item is the pooled buffer behind its QImage
+        self.buffer_pool.release(item[-1])
+
+    def start_burst(self, pre_trigger_seconds:float=0.5):
+        """Starts recording full-resolution frames, beginning `pre_trigger_seconds` before now."""
+        self.frame_ring.start_burst(pre_trigger_seconds)
+
+    def stop_burst(self, max_fps:float=None) -> list:
+        """
+        Stops the burst started with start_burst().
+
+        Args:
+            max_fps (float, optional): Keep at most this many frames per second; None keeps the native camera rate.
+
+        Returns:
+            list: [(frame, timestamp), ...] raw full-resolution BGR frames and their capture wall-clock
+                  time (time.time()). The frames must not be modified in place. Brightness/contrast is
+                  not applied; apply frame_adjustment() to one frame at a time as it is written, so the
+                  burst is not held in memory twice.
+        """
+        return [(frame, timestamp) for frame, _, timestamp in self.frame_ring.stop_burst(max_fps)]
+
+    @property
+    def burst_overflow(self) -> int:
+        """Frames the last burst did not record because it reached its frame or byte limit."""
+        return self.frame_ring.burst_overflow
+
+    def frame_adjustment(self):
+        """
+        Returns the current brightness/contrast as a function frame -> adjusted copy, or None
+        when it changes nothing. Later slider changes do not affect the returned function.
+        """
+        return self.brightness_lut.frozen()
+
+    def get_snapshot_frame(self):
+        """
+        Returns the most recent camera frame at full resolution (BGR) with the current
+        brightness/contrast applied, or None if no frame was captured yet.
+        The returned array must not be modified in place.
+        """
+        frame = self._latest_frame
+        if frame is None:
+            return None
+        return self.brightness_lut.apply(frame)
+
+    @Slot(float, int)
+    def set_alpha_beta(self, alpha:float, beta:int):
+        """Sets contrast (alpha) and brightness (beta); the lookup table is rebuilt only here."""
+        self.this_alph = alpha
+        self.this_beta = beta
+        self.brightness_lut.set(alpha, beta)
+
+    def store_results(self, results, seq:int):
+        """Called by the InferenceWorker when it finished inference on frame `seq`."""
+        with self._results_lock:
+            if seq >= self._latest_results_seq:
+                self._latest_results = results
+                self._latest_results_seq = seq
+            self.inferred_frames += 1
+
+    def reuse_results(self, seq:int):
+        """Called by the InferenceWorker when frame `seq` was unchanged; the latest results now describe it."""
+        with self._results_lock:
+            if self._latest_results is not None and seq > self._latest_results_seq:
+                self._latest_results_seq = seq
+
+    def set_change_threshold(self, pixel_threshold:int=None, area_threshold:float=None, enabled:bool=None):
+        """
+        Configures the change gate that skips inference on unchanged frames.
+
+        Args:
+            pixel_threshold (int, optional): Gray-level difference for a pixel to count as changed.
+            area_threshold (float, optional): Fraction of changed pixels for a frame to count as changed.
+            enabled (bool, optional): Turns the gate on or off.
+        """
+        if pixel_threshold is not None:
+            self.change_gate.pixel_threshold = pixel_threshold
+        if area_threshold is not None:
+            self.change_gate.area_threshold = area_threshold
+        if enabled is not None:
+            self.change_gate.enabled = enabled
+        self.change_gate.invalidate()
+
+    def get_latest_results(self):
+        """Returns (results, seq) of the most recent inference, or (None, 0)."""
+        with self._results_lock:
+            return self._latest_results, self._latest_results_seq
+
+    def clear_results(self):
+        with self._results_lock:
+            self._latest_results = None
+            self._latest_results_seq = 0
+
+    def set_inference_rate(self, budget_ms:float=None, max_hz:float=None):
+        """
+        Configures the adaptive inference scheduler.
+
+        Args:
+            budget_ms (float, optional): Average inference time allowed per captured frame.
+            max_hz (float, optional): Upper bound on inferences per second; 0 removes the cap.
+        """
+        if budget_ms is not None:
+            self.inference_scheduler.budget_ms = budget_ms
+        if max_hz is not None:
+            self.inference_scheduler.max_hz = max_hz or None
+
+    def set_profiling(self, enabled:bool):
+        """Turns the per-stage latency measurement on or off; turning it on starts from empty histograms."""
+        if enabled and not self.pipeline_timer.enabled:
+            self.pipeline_timer.reset()
+        self.pipeline_timer.enabled = enabled
+
+    def get_latency_stats(self) -> dict:
+        """
+        Returns the rolling per-stage latency summary, see PipelineTimer.get_stats().
+        'signal_hop' and 'end_to_end' (capture to paint) are recorded by the AnnotationWidget
+        the frames are delivered to.
+        """
+        return self.pipeline_timer.get_stats()
+
+    def get_frame_counters(self) -> dict:
+        """
+        Returns the capture/inference counters of the running stream.
+
+        Returns:
+            dict: 'captured' frames read from the camera, 'inferred' frames the model ran on,
+                  'dropped' frames replaced in the mailbox before the model could take them,
+                  'display_dropped' frames replaced before the GUI picked them up,
+                  'buffers' the display buffer pool state (overflow_allocations should stay 0),
+                  'capture_buffers' how often the source read into a recycled frame (None if it cannot),
+                  'stale' frames displayed with results computed on an older frame,
+                  'scheduler' the adaptive inference scheduler state (stride N, timing, CPU load),
+                  'gate' how many frames the change gate checked and skipped as unchanged.
+        """
+        recycler = getattr(self.source, "recycler", None)
+        return {
+            "captured": self.captured_frames,
+            "inferred": self.inferred_frames,
+            "dropped": self.frame_mailbox.dropped_frames,
+            "display_dropped": self.display_channel.dropped_frames,
+            "buffers": self.buffer_pool.get_stats(),
+            "capture_buffers": recycler.get_stats() if recycler else None,
+            "stale": self.stale_frames,
+            "scheduler": self.inference_scheduler.get_stats(),
+            "gate": self.change_gate.get_stats(),
+        }
+
     def run(self):
         self._running = True
+        self.frame_mailbox.reset()
+        self.display_channel.reset()
+        self.clear_results()
+        self._latest_frame = None
+        self.frame_ring.clear()
+        self.captured_frames = 0
+        self.inferred_frames = 0
+        self.stale_frames = 0
+        self.inference_scheduler.reset()
+        self.change_gate.reset()
+
+        inference_worker = InferenceWorker(self)
+        source = self.source
+        # Replaying "as fast as possible" must not be throttled by the loop itself
+        throttle = isinstance(source, CameraSource) or source.pacing != PACING_FAST
         try:
-            self.cap = cv2.VideoCapture(self.camera_index)
-            if not self.cap.isOpened():
-                raise IOError(f"Cannot open camera with index {self.camera_index}")
+            source.open()
 
-            # Request MJPEG format for potentially higher performance
-            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+            inference_worker.start()
 
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_width)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
-            # print(f"width = {self.frame_width}, height = {self.frame_height}")
-
-            while self._running and self.cap.isOpened():
-                ret, frame = self.cap.read()
+            timer = self.pipeline_timer
+            contrast_buffer = None
+            while self._running and source.is_opened():
+                t = timer.start()
+                ret, frame = source.read()
                 if ret:
-                    # Resize frame for processing to reduce computational load
-                    processing_frame = cv2.resize(frame, (1280, 720), interpolation=cv2.INTER_AREA)
-
-                    # Adjust brightness and contrast on the smaller frame
-                    processing_frame = self.adjust_brightness_contrast_frame(processing_frame, self.this_alph, self.this_beta)
+                    t = timer.lap("capture", t)
+                    t_captured = t
+                    self.captured_frames += 1
+                    seq = self.captured_frames
+                    # Sources never overwrite a frame that is still referenced, so keeping a reference is enough
+                    self._latest_frame = frame
+                    self.frame_ring.push(frame, seq)
+
+                    # Resize once, straight from the camera frame to the display target
+                    processing_frame = self.geometry.to_display(frame)
+                    t = timer.lap("resize", t)
+
+                    # Adjust brightness and contrast on the display frame (skipped for alpha=1, beta=0).
+                    # In place in the resize buffer; the camera frame itself is never modified.
+                    if processing_frame is frame and not self.brightness_lut.is_identity:
+                        contrast_buffer = reuse_buffer(contrast_buffer, frame)
+                        processing_frame = self.brightness_lut.apply(frame, dst=contrast_buffer)
+                    else:
+                        processing_frame = self.brightness_lut.apply(processing_frame, dst=processing_frame)
+                    t = timer.lap("contrast", t)
                     
-                    dframe = None
                     results = None
                     qt_image = None
                     qt_dimage = None
+                    frame_info = None
 
-                    # Convert the original high-res frame for display
-                    display_rgb_image = cv2.cvtColor(processing_frame, cv2.COLOR_BGR2RGB)
+                    # Convert the display frame to RGB into a pooled buffer and wrap it without copying
+                    display_rgb_image = self.buffer_pool.acquire(processing_frame.shape, processing_frame.dtype)
+                    cv2.cvtColor(processing_frame, cv2.COLOR_BGR2RGB, dst=display_rgb_image)
                     h, w, ch = display_rgb_image.shape
-                    bytes_per_line = ch * w
+                    bytes_per_line = display_rgb_image.strides[0]
                     qt_image = QImage(display_rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
+                    t = timer.lap("rgb_convert", t)
 
                     if self.is_detecting:
-                        # Perform detection on the smaller, processed frame
-                        results = self.this_model(processing_frame, verbose=False, imgsz=640)
-                        # Plot results on the smaller frame
-                        dframe = results[0].plot()
-                        # Convert the detected frame for display
-                        dframe_rgb_image = cv2.cvtColor(dframe, cv2.COLOR_BGR2RGB)
-                        h, w, ch = dframe_rgb_image.shape
-                        bytes_per_line = ch * w
-                        qt_dimage = QImage(dframe_rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-
-                    self.frame_ready.emit(qt_image, qt_dimage, results, False)
+                        # Hand every Nth camera frame to the inference worker; it only ever sees the newest one.
+                        # Frames in between reuse the last results.
+                        if self.inference_scheduler.should_infer(seq):
+                            self.frame_mailbox.put(frame, seq)
+
+                        # The latest available results go along with the current frame
+                        results, results_seq = self.get_latest_results()
+                        if results is not None and results_seq < seq:
+                            self.stale_frames += 1
+                    elif self._latest_results is not None:
+                        self.clear_results()
+
+                    if timer.enabled and t_captured is not None:
+                        frame_info = {"seq": seq, "t_capture": t_captured, "t_emit": time.perf_counter(), "timer": timer}
+
+                    # The QImage wraps display_rgb_image's memory; the buffer stays out of the pool until delivered or dropped
+                    if self.display_channel.post((qt_image, qt_dimage, results, frame_info, display_rgb_image)):
+                        self._frame_posted.emit()
                 else:
-                    self.error_occurred.emit(f"Failed to read frame from camera {self.camera_index}")
+                    if source.at_end:
+                        print(f"End of {source.name}.")
+                    else:
+                        self.error_occurred.emit(f"Failed to read frame from {source.name}")
                     break # Exit loop on read failure
-                self.msleep(1)
+                if throttle:
+                    self.msleep(1)
         except Exception as e:
             self.error_occurred.emit(f"Camera stream error: {e}")
         finally:
-            if self.cap and self.cap.isOpened():
-                self.cap.release()
-                print(f"Camera {self.camera_index} released.")
+            if inference_worker.isRunning():
+                inference_worker.stop()
+            if source.is_opened():
+                source.release()
+                print(f"{source.name.capitalize()} released.")
             self._running = False
 
     def stop(self):
         self._running = False
         self.wait() # Wait for the thread to finish gracefully
+        for loader in self._model_loaders:
+            loader.wait()
 
-    def set_model(self, model_path:str):
-        self.this_model = YOLO(model_path)
-
-    def adjust_brightness_contrast_frame(self, frame, alpha:float=1.0, beta:int=0):
+    def set_model(self, model_path:str, enable_detection:bool=False):
         """
-        Adjusts the brightness and contrast of a single image frame.
+        Loads a model in the background and swaps it in once it is loaded and warmed up.
 
-        Args:
-            frame (numpy.ndarray): The input image frame (e.g., from cv2.VideoCapture.read()).
-            alpha (float): Contrast control (1.0 for no change, >1.0 for increased, <1.0 for decreased).
-                        Typical range: 0.0 to 3.0.
-            beta (int): Brightness control (0 for no change, >0 for increased, <0 for decreased).
-                        Typical range: -127 to 127 (for 8-bit images).
+        The stream keeps running with the previous model (or without one) in the
+        meantime. Models come from a shared LRU cache, so toggling back to a
+        recently used model swaps it in immediately.
 
-        Returns:
-            numpy.ndarray: The adjusted image frame.
+        Args:
+            model_path (str): Path to the YOLO weights.
+            enable_detection (bool): Turn is_detecting on when the model is swapped in.
         """
-        if frame is None:
-            raise ValueError("Input frame cannot be None.")
+        self._requested_model_path = model_path
+        try:
+            model = self.model_cache.get(model_path)
+        except OSError as e:
+            self.model_failed.emit(model_path, str(e))
+            return
 
-        # Apply the transformation: new_image = alpha * original_image + beta
-        # cv2.convertScaleAbs handles pixel value clamping (0-255) automatically
-        adjusted_frame = cv2.convertScaleAbs(frame, alpha=alpha, beta=beta)
+        if model is not None:
+            self._swap_model(model_path, model, enable_detection)
+            return
 
-        return adjusted_frame         
\ No newline at end of file
+        loader = ModelLoader(self.model_cache, model_path, parent=self)
+        loader.model_loaded.connect(lambda path, model: self._swap_model(path, model, enable_detection))
+        loader.load_failed.connect(self._on_model_load_failed)
+        loader.finished.connect(lambda: self._model_loaders.remove(loader))
+        self._model_loaders.append(loader)
+        loader.start()
+
+    def _swap_model(self, model_path:str, model, enable_detection:bool):
+        # Runs on the GUI thread; the worker picks up the new reference on its next frame
+        if model_path != self._requested_model_path:
+            return # A newer request superseded this one; the model stays cached
+
+        imgsz = model.overrides.get("imgsz")
+        if isinstance(imgsz, int):
+            self.geometry.set_imgsz(imgsz)
+        self.this_model = model
+        self.change_gate.invalidate()
+        if enable_detection:
+            self.is_detecting = True
+        print(f"Model ready: {model_path}")
+        self.model_ready.emit(model_path)
+
+    def _on_model_load_failed(self, model_path:str, message:str):
+        print(f"Error loading model '{model_path}': {message}")
+        self.model_failed.emit(model_path, message)
@@ -0,0 +1,104 @@
+# widgets/yolo_labels.py
+
+import os
+import threading
+
+from widgets.annotation_repository import read_class_list
+
+
+class YoloLabelConverter():
+    """
+    Writes detection labels in YOLO format in a single pass.
+
+    Project labels are "<class name> <left> <top> <w> <h>" (relative to the image
+    size); YOLO wants "<class id> <center x> <center y> <w> <h>". Each source is
+    read once and the final label is written straight to its destination.
+
+    The class map is built once per converter. Lines that cannot be converted
+    (malformed, or a class that is not in the class list) are left out of the
+    output and counted; report() summarizes them for the whole build.
+    Safe to use from several threads.
+    """
+    MAX_REPORTED_LINES = 10
+
+    def __init__(self, classes:list):
+        self.classes = list(classes)
+        self.class_map = {class_name: i for i, class_name in enumerate(self.classes)}
+        self.files = 0
+        self.boxes = 0
+        self.malformed = []        # (file name, line)
+        self.unknown_classes = {}  # class name -> number of boxes
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_class_list(cls, file_path:str):
+        """A converter for the classes in a class list file (classes.lst)."""
+        return cls(read_class_list(file_path))
+
+    def convert_file(self, source_path:str, destination_path:str) -> int:
+        """
+        Converts the label file at `source_path` into `destination_path`.
+
+        Returns:
+            int: The number of boxes written.
+        """
+        boxes = []
+        malformed = []
+        with open(source_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.split()
+                if not parts:
+                    continue
+                try:
+                    if len(parts) != 5:
+                        raise ValueError()
+                    boxes.append((parts[0], *map(float, parts[1:])))
+                except ValueError:
+                    malformed.append(line.strip())
+        return self._write(boxes, destination_path, os.path.basename(source_path), malformed)
+
+    def convert_boxes(self, boxes:list, destination_path:str) -> int:
+        """
+        Writes `boxes` ([(class name, left, top, w, h)], e.g. from an AnnotationRepository)
+        as a YOLO label file.
+
+        Returns:
+            int: The number of boxes written.
+        """
+        return self._write(boxes, destination_path, os.path.basename(destination_path))
+
+    def report(self) -> str:
+        """One summary of all files converted so far."""
+        with self._lock:
+            lines = [f"Labels converted: {self.files} files, {self.boxes} boxes."]
+            if self.unknown_classes:
+                skipped = sum(self.unknown_classes.values())
+                classes = ", ".join(f"'{name}' ({count})" for name, count in sorted(self.unknown_classes.items()))
+                lines.append(f"{skipped} boxes skipped, class not in the class list: {classes}")
+            if self.malformed:
+                lines.append(f"{len(self.malformed)} malformed lines skipped:")
+                lines += [f"  {file_name}: '{line}'" for file_name, line in self.malformed[:self.MAX_REPORTED_LINES]]
+                if len(self.malformed) > self.MAX_REPORTED_LINES:
+                    lines.append(f"  ... and {len(self.malformed) - self.MAX_REPORTED_LINES} more")
+        return "\n".join(lines)
+
+    def _write(self, boxes:list, destination_path:str, file_name:str, malformed:list=None) -> int:
+        out = []
+        unknown = {}
+        for class_name, left, top, w, h in boxes:
+            class_id = self.class_map.get(class_name)
+            if class_id is None:
+                unknown[class_name] = unknown.get(class_name, 0) + 1
+                continue
+            out.append(f"{class_id} {left + w / 2:.6f} {top + h / 2:.6f} {w:.6f} {h:.6f}\n")
+
+        with open(destination_path, 'w', encoding='utf-8') as f:
+            f.writelines(out)
+
+        with self._lock:
+            self.files += 1
+            self.boxes += len(out)
+            for class_name, count in unknown.items():
+                self.unknown_classes[class_name] = self.unknown_classes.get(class_name, 0) + count
+            self.malformed += [(file_name, line) for line in malformed or ()]
+        return len(out)